@@ -1,6 +1,9 @@
-from .analyzer.analyzer import analyze
-from .transformer.transformer import transform
-from .generator.generator import generate
+from .analyzer.analyzer import analyze, prescan
+from .transformer.transformer import (
+    build_global_info, select_module_files, transform, transform_streaming)
+from .generator.generator import generate, generate_streaming
 from . import config
 from .utils import check_os
 from . import support
+from . import manifest
+from . import profiler
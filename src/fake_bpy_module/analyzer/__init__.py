@@ -1,5 +1,7 @@
 from . import analyzer
 from . import directives
+from . import fast_parser
 from . import nodes
+from . import parsing_session
 from . import readers
 from . import roles
@@ -1,22 +1,77 @@
 import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 from typing import List
 from docutils import nodes
-from docutils.core import publish_doctree
+from docutils.utils import SystemMessage
 
 from . import directives
 from . import readers
 from . import roles
 from .nodes import SourceFilenameNode
+from .parsing_session import ParsingSession
+from .prescan import make_skeleton
+from .. import config
+from .. import utils
+from ..profiler import profile_stage
+from ..cache import DocumentCache, get_parsing_salts
 from ..utils import output_log, LOG_LEVEL_DEBUG
 
 REGEX_SUB_LINE_SPACES = re.compile(r"\s+")
 
+# Analyzer owned by each worker process of the process pool.
+_WORKER_ANALYZER: 'BaseAnalyzer' = None
+
+
+class _WorkerSystemMessage(Exception):
+    # SystemMessage can not be pickled, so this exception is used to send it
+    # from the worker process back to the parent process.
+    pass
+
+
+def _init_worker(target: str, target_version: str, cache_dir: str,
+                 fast_parser: bool, log_level: int):
+    # pylint: disable=W0603
+    global _WORKER_ANALYZER
+
+    # Worker processes may not inherit the configuration from the parent
+    # process (ex. "spawn" start method), so restore the required one.
+    config.set_target(target)
+    config.set_target_version(target_version)
+    config.set_cache_dir(cache_dir)
+    config.set_fast_parser(fast_parser)
+    utils.LOG_LEVEL = log_level
+
+    # Directives and roles are registered only once per worker.
+    _WORKER_ANALYZER = BaseAnalyzer()
+
+
+def _analyze_by_file_in_worker(filename: str) -> nodes.document:
+    try:
+        return _WORKER_ANALYZER._analyze_by_file(filename)    # pylint: disable=W0212
+    except SystemMessage as e:
+        raise _WorkerSystemMessage(str(e), e.level) from None
+
 
 def analyze(rst_files: List[str]) -> List[nodes.document]:
     rst_files = [f.replace("\\", "/") for f in rst_files]
     analyzer = BaseAnalyzer()
-    documents = analyzer.analyze(rst_files)
+    documents: List[nodes.document] = []
+    with profile_stage("analyzer", "analyze", documents):
+        documents.extend(analyzer.analyze(rst_files))
+
+    return documents
+
+
+def prescan(rst_files: List[str]) -> List[nodes.document]:
+    # The prescanned documents have only the modules and the names of the
+    # classes, functions and data, which are enough to build the global
+    # information. (See transformer.build_global_info)
+    rst_files = [f.replace("\\", "/") for f in rst_files]
+    analyzer = BaseAnalyzer()
+    documents: List[nodes.document] = []
+    with profile_stage("analyzer", "prescan", documents):
+        documents.extend(analyzer.prescan(rst_files))
 
     return documents
 
@@ -27,29 +82,81 @@ class BaseAnalyzer:
         roles.register_roles()
 
         self.mod_documents: List[nodes.document] = []
+        self._parsing_session: ParsingSession = ParsingSession(
+            readers.BpyRstDocsReader(), config.get_fast_parser())
+        # Built at the first time when the file is prescanned.
+        self._prescan_session: ParsingSession = None
+
+        self._cache: DocumentCache = None
+        if config.get_cache_dir() is not None:
+            self._cache = DocumentCache(
+                config.get_cache_dir(), "analyzer", get_parsing_salts())
 
     def _analyze_by_file(self, filename: str) -> nodes.document:
         output_log(LOG_LEVEL_DEBUG, f"Analyze file: {filename}")
         with open(filename, "r", encoding="utf-8") as f:
             contents = f.read()
 
-        settings_overrides = {
-            "exit_status_level": 2,
-            "halt_level": 2,
-            "line_length_limit": 20000,
-        }
-        document: nodes.document = publish_doctree(
-            contents, settings_overrides=settings_overrides,
-            reader=readers.BpyRstDocsReader())
+        cache_key: str = None
+        if self._cache is not None:
+            cache_key = self._cache.make_key(contents)
+            document = self._cache.load(cache_key)
+            if document is not None:
+                document.insert(0, SourceFilenameNode(text=os.path.basename(filename)))
+                return document
+
+        document: nodes.document = self._parsing_session.parse(contents)
+
+        if self._cache is not None:
+            self._cache.store(cache_key, document)
 
         document.insert(0, SourceFilenameNode(text=os.path.basename(filename)))
 
         return document
 
+    def _analyze_parallel(self, filenames: list, jobs: int) -> List[nodes.document]:
+        # Send the files to the workers in chunks to reduce the IPC overhead.
+        chunksize = max(1, len(filenames) // (jobs * 4))
+        with ProcessPoolExecutor(
+                max_workers=jobs, initializer=_init_worker,
+                initargs=(config.get_target(), config.get_target_version(),
+                          config.get_cache_dir(), config.get_fast_parser(),
+                          utils.LOG_LEVEL)) as executor:
+            # map() returns the results in the input order, so the order of
+            # documents is same as the serial analysis.
+            try:
+                documents = list(executor.map(
+                    _analyze_by_file_in_worker, filenames, chunksize=chunksize))
+            except _WorkerSystemMessage as e:
+                message, level = e.args
+                raise SystemMessage(nodes.Text(message), level) from None
+
+        return documents
+
     def analyze(self, filenames: list) -> List[nodes.document]:
+        jobs = config.get_jobs()
+        if jobs >= 2 and len(filenames) >= 2:
+            return self._analyze_parallel(filenames, min(jobs, len(filenames)))
+
         documents: List[nodes.document] = []
         for f in filenames:
             document = self._analyze_by_file(f)
             documents.append(document)
 
         return documents
+
+    def _prescan_by_file(self, filename: str) -> nodes.document:
+        output_log(LOG_LEVEL_DEBUG, f"Prescan file: {filename}")
+        with open(filename, "r", encoding="utf-8") as f:
+            contents = f.read()
+
+        if self._prescan_session is None:
+            self._prescan_session = ParsingSession(
+                readers.BpyRstDocsReader(), fast_parser=True)
+        document = self._prescan_session.parse(make_skeleton(contents))
+        document.insert(0, SourceFilenameNode(text=os.path.basename(filename)))
+
+        return document
+
+    def prescan(self, filenames: list) -> List[nodes.document]:
+        return [self._prescan_by_file(f) for f in filenames]
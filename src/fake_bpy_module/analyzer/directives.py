@@ -1,5 +1,8 @@
 import ast
+import functools
+import keyword
 import re
+from typing import Tuple
 from docutils.parsers import rst
 from docutils import nodes
 
@@ -34,19 +37,27 @@ from ..utils import (
 
 _ARG_REPLACE_1_REGEX = re.compile(r"<class '([a-zA-Z]+?)'>")
 _ARG_REPLACE_2_REGEX = re.compile(r"<built-in function ([a-zA-Z]+?)>")
-_ARG_REPLACE_3_REGEX = re.compile(r"\\")
 _ARG_LIST_FROM_FUNC_DEF_REGEX = re.compile(r"([a-zA-Z0-9_]+)\s*\((.*)\)")
 
 
-def parse_function_def(content) -> str:
-    content = _ARG_REPLACE_1_REGEX.sub("\\1", content)
-    content = _ARG_REPLACE_2_REGEX.sub("\\1", content)
-    content = _ARG_REPLACE_3_REGEX.sub("", content)
-    content.strip()
+def _split_function_def(content: str) -> Tuple[str, str]:
+    # Returns the function name and the parameter list.
+    if "<" in content:
+        content = _ARG_REPLACE_1_REGEX.sub("\\1", content)
+        content = _ARG_REPLACE_2_REGEX.sub("\\1", content)
+    content = content.replace("\\", "")
 
     m = _ARG_LIST_FROM_FUNC_DEF_REGEX.search(content)
-    name = m.group(1)
-    params = split_string_by_comma(m.group(2))
+    return m.group(1), m.group(2)
+
+
+def parse_function_def(content) -> str:
+    name, params = _split_function_def(content)
+    return f"def {name}({', '.join(_fix_function_params(params))}): pass"
+
+
+def _fix_function_params(params_str: str) -> list:
+    params = split_string_by_comma(params_str)
 
     # (test=DirectivesTest.test_invalid_function_arg_order)
     # Handle case:
@@ -84,9 +95,7 @@ def parse_function_def(content) -> str:
             else:
                 fixed_params.append(p)
 
-    content = f"def {name}({', '.join(fixed_params)}): pass"
-
-    return content
+    return fixed_params
 
 
 # pylint: disable=R0911
@@ -188,6 +197,32 @@ def build_function_node_from_def(fdef: str) -> FunctionNode:
     return func_node
 
 
+@functools.lru_cache(maxsize=4096)
+def _build_argument_list_template(params: str) -> ArgumentListNode:
+    # Many functions (ex. bpy.ops, bl_rna_get_subclass of bpy.types) have the
+    # same parameters, so the arguments parsed by ast are reused for them.
+    # The returned node must not be modified.
+    # The cache lives as long as the process, so the size is bounded to keep
+    # the memory usage of the analysis.
+    fdef = f"def f({', '.join(_fix_function_params(params))}): pass"
+    return build_function_node_from_def(fdef).element(ArgumentListNode)
+
+
+def build_function_node_from_signature(content: str) -> FunctionNode:
+    # Same as build_function_node_from_def(parse_function_def(content)).
+    name, params = _split_function_def(content)
+    if keyword.iskeyword(name) or not name.isidentifier():
+        raise SyntaxError(f"Invalid function name: {name}")
+
+    func_node = FunctionNode.create_template()
+    func_node.element(NameNode).add_text(name)
+    arg_list_node = func_node.element(ArgumentListNode)
+    for arg_node in _build_argument_list_template(params).children:
+        arg_list_node.append_child(arg_node.deepcopy())
+
+    return func_node
+
+
 def parse_data_type(fbody_node: nodes.field_body) -> DataTypeNode:
     if len(fbody_node.children) == 0:
         return DataTypeNode(text=fbody_node.astext())
@@ -377,7 +412,7 @@ class FunctionDirective(rst.Directive):
                 fdef_str += fdef
                 ma = self._FUNC_DEF_REGEX.search(fdef_str)
                 if ma:
-                    func_defs.append(parse_function_def(fdef_str))
+                    func_defs.append(fdef_str)
                 else:
                     # (test=DirectivesTest.test_invalid_function)
                     # Handle case:
@@ -389,7 +424,7 @@ class FunctionDirective(rst.Directive):
         func_nodes: list = []
         # pylint: disable=R1702
         for fdef in func_defs:
-            func_node = build_function_node_from_def(fdef)
+            func_node = build_function_node_from_signature(fdef)
 
             # Add attributes.
             func_node.attributes["function_type"] = self.name
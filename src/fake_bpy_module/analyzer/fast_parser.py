@@ -0,0 +1,396 @@
+import re
+from typing import List, Tuple
+
+from docutils import nodes
+from docutils.parsers.rst import DirectiveError, languages, states
+from docutils.parsers.rst import directives as rst_directives
+from docutils.parsers.rst.directives import admonitions
+from docutils.statemachine import string2lines
+from docutils.utils import SystemMessage, column_width
+
+from . import directives
+
+# Patterns to detect the construct of the line. They are same as the ones
+# docutils uses in the body of the document, and tested in the same order.
+_BODY_PATTERNS: List[Tuple[str, re.Pattern]] = [
+    (name, re.compile(states.Body.patterns[name]))
+    for name in states.Body.initial_transitions
+]
+_EXPLICIT_CONSTRUCTS: List[Tuple[str, re.Pattern]] = [
+    (method.__name__, pattern)
+    for method, pattern in states.Body.explicit.constructs
+]
+_FIELD_MARKER_REGEX = re.compile(states.Body.patterns["field_marker"])
+_LINE_REGEX = re.compile(states.Body.patterns["line"])
+_LITERAL_BLOCK_MARKER_REGEX = re.compile(r"(?<!\\)(\\\\)*::$")
+_OPTION_REGEX = re.compile(r":([a-z][a-z0-9-]*): *([^`*|_\\:\[]*)$")
+
+# Directives which don't use the docutils' state machine except
+# nested_parse().
+_BUILTIN_DIRECTIVE_CLASSES = (admonitions.Note, admonitions.Warning)
+
+
+class _UnsupportedSyntax(Exception):
+    pass
+
+
+def _get_indented(lines: List[str], start: int, first_indent: int = None,
+                  block_indent: int = None) -> Tuple[List[str], int, bool]:
+    # Same as docutils.statemachine.StringList.get_indented().
+    # Returns the indented block, the index of the next line of the block and
+    # whether the block ends with the blank line.
+    indent = block_indent
+    end = start
+    if block_indent is not None and first_indent is None:
+        first_indent = block_indent
+    if first_indent is not None:
+        end += 1
+    blank_finish = True
+    while end < len(lines):
+        line = lines[end]
+        if line and (line[0] != " " or (block_indent is not None
+                                        and line[:block_indent].strip())):
+            blank_finish = end > start and not lines[end - 1].strip()
+            break
+        stripped = line.lstrip()
+        if stripped and block_indent is None:
+            line_indent = len(line) - len(stripped)
+            if indent is None or line_indent < indent:
+                indent = line_indent
+        end += 1
+
+    block = lines[start:end]
+    if first_indent is not None and block:
+        block[0] = block[0][first_indent:]
+    if indent:
+        offset = 0 if first_indent is None else 1
+        block[offset:] = [line[indent:] for line in block[offset:]]
+
+    return block, end, blank_finish
+
+
+class FastParser:
+    # Parser for the subset of reStructuredText which is used in the
+    # documents generated by sphinx_doc_gen.py. The directives are run as
+    # same as docutils, so the parsed document is same as the one parsed by
+    # docutils. Raise _UnsupportedSyntax for the syntax which is not
+    # supported, and the caller falls back to docutils.
+    #
+    # This object is also passed to the directives as the state and the state
+    # machine, which provides the attributes used by the directives.
+    #
+    # The line numbers are not tracked, so the nodes don't have the "line"
+    # attribute which docutils sets. It is not used by the transformers and
+    # the generators.
+
+    def __init__(self):
+        self.document: nodes.document = None
+        self.reporter = None
+        self._memo = None
+        self._language = None
+        self._inliner = states.Inliner()
+        self._inliner_initialized = False
+        self._title_style: str = None
+
+    def parse(self, contents: str, document: nodes.document) -> bool:
+        # Returns False if the contents has the unsupported syntax.
+        # document may be modified even if False is returned.
+        settings = document.settings
+        if "\ufeff" in contents:
+            return False
+        lines = string2lines(contents, tab_width=settings.tab_width,
+                             convert_whitespace=True)
+        if any(len(line) > settings.line_length_limit for line in lines):
+            return False
+
+        if not self._inliner_initialized:
+            self._inliner.init_customizations(settings)
+            self._inliner_initialized = True
+        self.document = document
+        self.reporter = document.reporter
+        self._language = languages.get_language(
+            settings.language_code, document.reporter)
+        self._memo = states.Struct(
+            document=document, reporter=document.reporter,
+            language=self._language)
+        self._title_style = None
+        # The messages are reported again by docutils after the fallback.
+        stream = document.reporter.stream
+        document.reporter.stream = None
+        try:
+            self._parse_body(lines, document, match_titles=True)
+        except (_UnsupportedSyntax, SystemMessage, DirectiveError):
+            return False
+        finally:
+            document.reporter.stream = stream
+            self.document = None
+            self.reporter = None
+            self._memo = None
+
+        return True
+
+    # pylint: disable=W0613
+    def nested_parse(self, block, input_offset, node, match_titles=False):
+        if match_titles:
+            raise _UnsupportedSyntax("Nested section title")
+        self._parse_body(list(block), node)
+
+    def get_source_and_line(self, lineno=None):
+        return self.document["source"], lineno
+
+    def _parse_inline(self, text: str, parent: nodes.Element) -> List[nodes.Node]:
+        textnodes, messages = self._inliner.parse(text, 0, self._memo, parent)
+        if messages:
+            raise _UnsupportedSyntax("Inline markup with messages")
+        return textnodes
+
+    def _parse_body(self, lines: List[str], parent: nodes.Element,
+                    match_titles: bool = False):
+        i = 0
+        while i < len(lines):
+            line = lines[i]
+            if not line:
+                i += 1
+                continue
+            if line[0] == " ":
+                raise _UnsupportedSyntax("Block quote")
+
+            construct = next(name for name, pattern in _BODY_PATTERNS
+                             if pattern.match(line))
+            if construct == "explicit_markup":
+                i = self._parse_directive(lines, i, parent)
+            elif construct == "field_marker":
+                i = self._parse_field_list(lines, i, parent)
+            elif construct == "bullet":
+                i = self._parse_bullet_list(lines, i, parent)
+            elif construct == "text":
+                if (i + 1 < len(lines) and lines[i + 1]
+                        and _LINE_REGEX.match(lines[i + 1])):
+                    if not match_titles:
+                        raise _UnsupportedSyntax("Nested section title")
+                    parent = self._parse_section_title(lines, i)
+                    i += 2
+                else:
+                    i = self._parse_paragraph(lines, i, parent)
+            else:
+                raise _UnsupportedSyntax(f"Construct '{construct}'")
+
+    def _parse_section_title(self, lines: List[str], i: int) -> nodes.section:
+        # Only the sections which have the same underline style are
+        # supported. They are always the children of the document.
+        title = lines[i]
+        underline = lines[i + 1]
+        if column_width(title) > len(underline):
+            raise _UnsupportedSyntax("Section title")
+        if self._title_style is None:
+            self._title_style = underline[0]
+        elif self._title_style != underline[0]:
+            raise _UnsupportedSyntax("Subsection")
+
+        section = nodes.section()
+        self.document += section
+        textnodes = self._parse_inline(title, self.document)
+        title_node = nodes.title(title, "", *textnodes)
+        section["names"].append(nodes.fully_normalize_name(title_node.astext()))
+        section += title_node
+        self.document.note_implicit_target(section, section)
+
+        return section
+
+    def _parse_paragraph(self, lines: List[str], i: int,
+                         parent: nodes.Element) -> int:
+        end = i + 1
+        while end < len(lines) and lines[end]:
+            if lines[end][0] == " ":
+                raise _UnsupportedSyntax("Unexpected indentation")
+            end += 1
+        data = "\n".join(lines[i:end]).rstrip()
+        if _LITERAL_BLOCK_MARKER_REGEX.search(data):
+            raise _UnsupportedSyntax("Literal block")
+
+        textnodes = self._parse_inline(data, parent)
+        parent += nodes.paragraph(data, "", *textnodes)
+
+        return end
+
+    def _check_end_of_block(self, lines: List[str], end: int,
+                            blank_finish: bool, *continue_constructs: str):
+        # The block must be followed by the blank line or the construct which
+        # continues the block.
+        if blank_finish or end >= len(lines) or not lines[end]:
+            return
+        for name, pattern in _BODY_PATTERNS:
+            if pattern.match(lines[end]):
+                if name in continue_constructs:
+                    return
+                break
+        raise _UnsupportedSyntax("Block ends without a blank line")
+
+    def _parse_directive(self, lines: List[str], i: int,
+                         parent: nodes.Element) -> int:
+        line = lines[i]
+        match = None
+        for name, pattern in _EXPLICIT_CONSTRUCTS:
+            match = pattern.match(line)
+            if match:
+                if name != "directive":
+                    raise _UnsupportedSyntax(f"Explicit markup '{name}'")
+                break
+        if match is None:
+            raise _UnsupportedSyntax("Comment")
+
+        type_name = match.group(1)
+        directive_class, messages = rst_directives.directive(
+            type_name, self._language, self.document)
+        if directive_class is None or messages:
+            raise _UnsupportedSyntax(f"Directive '{type_name}'")
+        if (directive_class.__module__ != directives.__name__
+                and directive_class not in _BUILTIN_DIRECTIVE_CLASSES):
+            raise _UnsupportedSyntax(f"Directive '{type_name}'")
+
+        indented, end, blank_finish = _get_indented(
+            lines, i, first_indent=match.end())
+        arguments, options, content = self._parse_directive_block(
+            indented, directive_class)
+        directive = directive_class(
+            type_name, arguments, options, content, 0, 0, "\n".join(lines[i:end]),
+            self, self)
+        parent += directive.run()
+
+        self._check_end_of_block(lines, end, blank_finish, "explicit_markup")
+
+        return end
+
+    def _parse_directive_block(self, indented: List[str], directive_class):
+        # Same as docutils.parsers.rst.states.Body.parse_directive_block().
+        has_arguments = (directive_class.required_arguments
+                         or directive_class.optional_arguments)
+        option_spec = directive_class.option_spec
+        if indented and not indented[0].strip():
+            indented = indented[1:]
+        while indented and not indented[-1].strip():
+            indented = indented[:-1]
+
+        if indented and (has_arguments or option_spec):
+            for i, line in enumerate(indented):
+                if not line.strip():
+                    break
+            else:
+                i = len(indented)
+            arg_block = indented[:i]
+            content = indented[i + 1:]
+        else:
+            i = 0
+            arg_block = []
+            content = indented
+
+        options = {}
+        if option_spec:
+            options, arg_block = self._parse_directive_options(
+                option_spec, arg_block, directive_class)
+        if arg_block and not has_arguments:
+            content = arg_block + indented[i:]
+            arg_block = []
+        while content and not content[0].strip():
+            content = content[1:]
+
+        arguments = []
+        if has_arguments:
+            arguments = self._parse_directive_arguments(
+                directive_class, arg_block)
+        if content and not directive_class.has_content:
+            raise _UnsupportedSyntax("No content permitted")
+
+        return arguments, options, content
+
+    def _parse_directive_options(self, option_spec, arg_block: List[str],
+                                 directive_class):
+        for i, line in enumerate(arg_block):
+            if _FIELD_MARKER_REGEX.match(line):
+                break
+        else:
+            return {}, arg_block
+
+        # Only the single line options of our directives are supported.
+        if directive_class in _BUILTIN_DIRECTIVE_CLASSES:
+            raise _UnsupportedSyntax("Directive options")
+        options = {}
+        for line in arg_block[i:]:
+            match = _OPTION_REGEX.match(line)
+            if not match or match.group(1) not in option_spec:
+                raise _UnsupportedSyntax("Directive options")
+            name, value = match.group(1), match.group(2).strip() or None
+            try:
+                options[name] = option_spec[name](value)
+            except (KeyError, ValueError, TypeError) as e:
+                raise _UnsupportedSyntax("Directive options") from e
+
+        return options, arg_block[:i]
+
+    def _parse_directive_arguments(self, directive_class,
+                                   arg_block: List[str]) -> List[str]:
+        # Same as docutils.parsers.rst.states.Body.parse_directive_arguments().
+        required = directive_class.required_arguments
+        optional = directive_class.optional_arguments
+        arg_text = "\n".join(arg_block)
+        arguments = arg_text.split()
+        if len(arguments) < required:
+            raise _UnsupportedSyntax("Insufficient arguments")
+        if len(arguments) > required + optional:
+            if not directive_class.final_argument_whitespace:
+                raise _UnsupportedSyntax("Too many arguments")
+            arguments = arg_text.split(None, required + optional - 1)
+        return arguments
+
+    def _parse_field_list(self, lines: List[str], i: int,
+                          parent: nodes.Element) -> int:
+        field_list = nodes.field_list()
+        parent += field_list
+        while True:
+            match = _FIELD_MARKER_REGEX.match(lines[i])
+            name = match.group()[1:]
+            name = name[:name.rfind(":")]
+            indented, i, blank_finish = _get_indented(
+                lines, i, first_indent=match.end())
+            while indented and not indented[0]:
+                indented = indented[1:]
+
+            field = nodes.field()
+            field += nodes.field_name(name, "", *self._parse_inline(name, parent))
+            field_body = nodes.field_body("\n".join(indented))
+            field += field_body
+            if indented:
+                self._parse_body(indented, field_body)
+            field_list += field
+            parent = field_list
+
+            if i >= len(lines) or not _FIELD_MARKER_REGEX.match(lines[i]):
+                self._check_end_of_block(lines, i, blank_finish)
+                return i
+
+    def _parse_bullet_list(self, lines: List[str], i: int,
+                           parent: nodes.Element) -> int:
+        bullet = lines[i][0]
+        bullet_list = nodes.bullet_list()
+        parent += bullet_list
+        bullet_list["bullet"] = bullet
+        bullet_regex = _BODY_PATTERNS[0][1]
+        while True:
+            match = bullet_regex.match(lines[i])
+            if not lines[i][match.end():]:
+                raise _UnsupportedSyntax("Empty first line of list item")
+            indented, i, blank_finish = _get_indented(
+                lines, i, block_indent=match.end())
+            while indented and not indented[0]:
+                indented = indented[1:]
+
+            list_item = nodes.list_item("\n".join(indented))
+            if indented:
+                self._parse_body(indented, list_item)
+            bullet_list += list_item
+
+            if i >= len(lines) or not bullet_regex.match(lines[i]):
+                self._check_end_of_block(lines, i, blank_finish)
+                return i
+            if lines[i][0] != bullet:
+                raise _UnsupportedSyntax("Bullet list with different bullets")
@@ -1,15 +1,61 @@
 from typing import TypeVar, Type
 from docutils import nodes
 
-from .roles import ClassRef
-from ..utils import append_child
+from .roles import ClassRef, PythonAPIRef
+from ..utils import append_child, notify_child_changed, notify_child_replaced
 
 T = TypeVar("T", bound=nodes.Node)
 
+_LIST_ATTRIBUTES = frozenset(nodes.Element.list_attributes)
+
+
+def _deepcopy_element(node: nodes.Element) -> nodes.Element:
+    # Same as nodes.Element.deepcopy(), but the nodes defined in this package
+    # are copied without calling __init__() and setup_child() because they
+    # have no state other than below.
+    cls = node.__class__
+    new_node = cls.__new__(cls)
+    new_node.rawsource = node.rawsource
+    new_node.attributes = {
+        k: v[:] if k in _LIST_ATTRIBUTES else v
+        for k, v in node.attributes.items()
+    }
+    if "tagname" in node.__dict__:
+        new_node.tagname = node.tagname
+    document = node._document     # pylint: disable=W0212
+    new_node.document = document
+    new_node.source = node.source
+    new_node.line = node.line
+
+    children = []
+    for child in node.children:
+        if isinstance(child, _FAST_DEEPCOPY_CLASSES):
+            new_child = _deepcopy_element(child)
+        else:
+            new_child = child.deepcopy()
+        new_child.parent = new_node
+        if document:
+            new_child.document = document
+            if new_child.source is None:
+                new_child.source = document.current_source
+            if new_child.line is None:
+                new_child.line = document.current_line
+        children.append(new_child)
+    new_node.children = children
+
+    if isinstance(new_node, UniqueElementNode):
+        new_node.elements = {type(child): child for child in children}
+
+    return new_node
+
 
 class NodeBase(nodes.Element):
     def append_child(self, item: nodes.Node):
         self.insert(len(self.children), item)
+        notify_child_changed(item)
+
+    def deepcopy(self):
+        return _deepcopy_element(self)
 
 
 class UniqueElementNode(NodeBase):
@@ -23,17 +69,11 @@ class UniqueElementNode(NodeBase):
     def append_child(self, item: nodes.Node):
         super().insert(len(self.children), item)
         self.elements[type(item)] = item
+        notify_child_changed(item)
 
     def element(self, element_type: Type[T]) -> T:
         return self.elements[element_type]
 
-    def deepcopy(self):
-        new_obj = super().deepcopy()
-        new_obj.elements.clear()
-        for child in new_obj.children:
-            new_obj.elements[type(child)] = child
-        return new_obj
-
     def remove(self, item):
         raise ValueError("Don't call remove directly, and use replace instead.")
 
@@ -48,23 +88,35 @@ class UniqueElementNode(NodeBase):
         super().remove(old)
         super().insert(index, item)
         self.elements[node_type] = item
+        notify_child_replaced(old, item)
 
 
 class ListNode(NodeBase, nodes.Sequential):
     def empty(self) -> bool:
         return len(self.children) == 0
 
+    def remove(self, item):
+        super().remove(item)
+        notify_child_changed(self)
+
 
 class TextNode(nodes.TextElement):
     def add_text(self, text: str):
         self.insert(len(self.children), nodes.Text(text))
 
+    def deepcopy(self):
+        return _deepcopy_element(self)
+
 
 class AttributeListNode(ListNode):
     tagname = "attribute-list"
     child_text_separator = ""
 
 
+# Nodes which can be copied by _deepcopy_element().
+_FAST_DEEPCOPY_CLASSES = (NodeBase, TextNode, PythonAPIRef)
+
+
 class FunctionListNode(ListNode):
     tagname = "function-list"
     child_text_separator = ""
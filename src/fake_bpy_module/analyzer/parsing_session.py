@@ -0,0 +1,82 @@
+from docutils import io, nodes, utils
+from docutils.core import Publisher
+from docutils.parsers.rst import states
+from docutils.readers import Reader
+
+from .fast_parser import FastParser
+
+_SETTINGS_OVERRIDES = {
+    "exit_status_level": 2,
+    "halt_level": 2,
+    "line_length_limit": 20000,
+}
+
+
+class ParsingSession:
+    # Same as publish_doctree(), but the settings, reader, parser and writer
+    # are built once and reused for all contents. publish_doctree() builds
+    # them (including the option parser to build the settings) at every call,
+    # which costs as much as parsing the small .rst file.
+
+    def __init__(self, reader: Reader = None, fast_parser: bool = False):
+        self._publisher = Publisher(
+            reader=reader, source_class=io.StringInput,
+            destination_class=io.NullOutput)
+        self._publisher.set_components("standalone", "restructuredtext", "null")
+        self._publisher.process_programmatic_settings(
+            None, _SETTINGS_OVERRIDES, None)
+        self._publisher.set_destination(None, None)
+
+        self._fast_parser: FastParser = FastParser() if fast_parser else None
+
+    def parse(self, contents: str) -> nodes.document:
+        if self._fast_parser is not None:
+            document = self.parse_fast(contents)
+            if document is not None:
+                return document
+
+        self._publisher.set_source(contents, None)
+        self._publisher.publish()
+        document = self._publisher.document
+
+        # Don't keep the parsed document.
+        self._publisher.document = None
+        self._publisher.reader.document = None
+        self._publisher.writer.document = None
+        self._publisher.reader.parser.document = None
+        self._publisher.reader.parser.statemachine = None
+        # The nested state machines cached by docutils (shared by all parsers)
+        # refer to the last parsed document, which refers to the other
+        # documents through the nodes moved by the transformers. The state
+        # machines are kept to be reused, and their references are restored
+        # at the next run.
+        for state_machine in states.RSTState.nested_sm_cache:
+            state_machine.memo = state_machine.node = None
+            state_machine.document = state_machine.reporter = None
+            for state in state_machine.states.values():
+                state.memo = state.reporter = state.inliner = None
+                state.document = state.parent = None
+
+        return document
+
+    def parse_fast(self, contents: str) -> nodes.document:
+        # Parse the contents by FastParser instead of the docutils' parser.
+        # Returns None if the contents has the syntax FastParser doesn't
+        # support.
+        if self._fast_parser is None:
+            self._fast_parser = FastParser()
+
+        publisher = self._publisher
+        publisher.set_source(contents, None)
+        document = utils.new_document(
+            publisher.source.source_path, publisher.settings)
+        if not self._fast_parser.parse(contents, document):
+            return None
+
+        # Apply the same transforms as publish().
+        document.transformer.populate_from_components(
+            (publisher.source, publisher.reader, publisher.reader.parser,
+             publisher.writer, publisher.destination))
+        document.transformer.apply_transforms()
+
+        return document
@@ -0,0 +1,37 @@
+import re
+
+# Directives which make the module, class, function and data nodes.
+_ENTRY_DIRECTIVE_REGEX = re.compile(
+    r"\.\.[ ]+(module|currentmodule|class|function|method|classmethod|"
+    r"staticmethod|attribute|property|data)[ ]?::( +|$)", re.IGNORECASE)
+
+
+def _is_indented(line: str) -> bool:
+    return line[:1] in (" ", "\t") and line.strip() != ""
+
+
+def make_skeleton(contents: str) -> str:
+    # Remove the contents of the directives which make the module, class,
+    # function and data nodes. Their names are given by the arguments, and
+    # the contents don't change the structure of the document (ex. sections),
+    # so the skeleton has the same modules and the same top level classes,
+    # functions and data as the original document.
+    lines = contents.splitlines()
+    skeleton = []
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        skeleton.append(line)
+        i += 1
+        if not _ENTRY_DIRECTIVE_REGEX.match(line):
+            continue
+
+        # The arguments continue until the blank line.
+        while i < len(lines) and _is_indented(lines[i]):
+            skeleton.append(lines[i])
+            i += 1
+        while i < len(lines) and (_is_indented(lines[i]) or not lines[i].strip()):
+            i += 1
+        skeleton.append("")
+
+    return "\n".join(skeleton)
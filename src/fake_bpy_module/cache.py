@@ -0,0 +1,97 @@
+import functools
+import glob
+import hashlib
+import os
+import pickle
+import tempfile
+from typing import List
+from docutils import nodes
+from docutils.parsers.rst import directives, roles
+
+from . import config
+from .utils import output_log, LOG_LEVEL_DEBUG, LOG_LEVEL_WARN
+
+
+@functools.lru_cache(maxsize=None)
+def get_package_digest() -> str:
+    # fake_bpy_module has no version number at the generation time, so the
+    # digest of the package sources is used as the version instead.
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    hash_ = hashlib.sha256()
+    for filename in sorted(glob.glob(f"{package_dir}/**/*.py", recursive=True)):
+        hash_.update(os.path.relpath(filename, package_dir).replace("\\", "/").encode())
+        with open(filename, "rb") as f:
+            hash_.update(f.read())
+    return hash_.hexdigest()
+
+
+def get_registered_directives_and_roles() -> List[str]:
+    # pylint: disable=W0212
+    result = []
+    for name, directive in sorted(directives._directives.items()):
+        result.append(f"directive:{name}:{directive.__module__}.{directive.__qualname__}")
+    for name, role in sorted(roles._roles.items()):
+        node_class = getattr(role, "node_class", type(role))
+        result.append(f"role:{name}:{node_class.__module__}.{node_class.__qualname__}")
+    return result
+
+
+def get_parsing_salts() -> List[str]:
+    # The parsed document depends on the directives/roles, the target and the
+    # parser as well as the contents of the file. (ex. ModuleDirective
+    # renames the modules by the target version)
+    return ([get_package_digest(), config.get_target(),
+             str(config.get_target_version()), str(config.get_fast_parser())]
+            + get_registered_directives_and_roles())
+
+
+class DocumentCache:
+    def __init__(self, cache_dir: str, namespace: str, salts: List[str]):
+        self._cache_dir: str = f"{cache_dir}/{namespace}"
+        hash_ = hashlib.sha256()
+        for salt in salts:
+            hash_.update(salt.encode())
+            hash_.update(b"\0")
+        self._salt: str = hash_.hexdigest()
+
+        os.makedirs(self._cache_dir, exist_ok=True)
+
+    def make_key(self, contents: str) -> str:
+        hash_ = hashlib.sha256(self._salt.encode())
+        hash_.update(contents.encode())
+        return hash_.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return f"{self._cache_dir}/{key[:2]}/{key}.pickle"
+
+    def load(self, key: str) -> nodes.document:
+        path = self._path(key)
+        if not os.path.isfile(path):
+            return None
+
+        try:
+            with open(path, "rb") as f:
+                document = pickle.load(f)
+        except Exception:   # pylint: disable=W0703
+            output_log(LOG_LEVEL_WARN, f"Broken cache is ignored: {path}")
+            return None
+        output_log(LOG_LEVEL_DEBUG, f"Cache hit: {path}")
+
+        return document
+
+    def store(self, key: str, document: nodes.document):
+        path = self._path(key)
+        dir_path = os.path.dirname(path)
+        os.makedirs(dir_path, exist_ok=True)
+
+        # Write to the temporary file at first and then rename it, so the
+        # other processes which run in parallel never read the partial file.
+        fd, tmp_path = tempfile.mkstemp(dir=dir_path, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(document, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
@@ -1,4 +1,5 @@
 from threading import Lock
+from typing import List
 from .utils import check_os
 
 
@@ -10,6 +11,13 @@ class Configuration:
     target_version: str = None
     mod_version: str = None
     output_format: str = "pyi"
+    jobs: int = 1
+    cache_dir: str = None
+    incremental: bool = False
+    profile: bool = False
+    streaming: bool = False
+    fast_parser: bool = False
+    modules: List[str] = None
 
     # pylint: disable=W0201
     __inst = None
@@ -69,6 +77,41 @@ def set_output_format(output_format: str):
     inst.output_format = output_format
 
 
+def set_jobs(jobs: int):
+    inst = Configuration.get_instance()
+    inst.jobs = jobs
+
+
+def set_cache_dir(cache_dir: str):
+    inst = Configuration.get_instance()
+    inst.cache_dir = cache_dir
+
+
+def set_incremental(incremental: bool):
+    inst = Configuration.get_instance()
+    inst.incremental = incremental
+
+
+def set_profile(profile: bool):
+    inst = Configuration.get_instance()
+    inst.profile = profile
+
+
+def set_streaming(streaming: bool):
+    inst = Configuration.get_instance()
+    inst.streaming = streaming
+
+
+def set_fast_parser(fast_parser: bool):
+    inst = Configuration.get_instance()
+    inst.fast_parser = fast_parser
+
+
+def set_modules(modules: List[str]):
+    inst = Configuration.get_instance()
+    inst.modules = modules
+
+
 def get_output_dir() -> str:
     inst = Configuration.get_instance()
     return inst.output_dir
@@ -102,3 +145,38 @@ def get_mod_version() -> str:
 def get_output_format() -> str:
     inst = Configuration.get_instance()
     return inst.output_format
+
+
+def get_jobs() -> int:
+    inst = Configuration.get_instance()
+    return inst.jobs
+
+
+def get_cache_dir() -> str:
+    inst = Configuration.get_instance()
+    return inst.cache_dir
+
+
+def get_incremental() -> bool:
+    inst = Configuration.get_instance()
+    return inst.incremental
+
+
+def get_profile() -> bool:
+    inst = Configuration.get_instance()
+    return inst.profile
+
+
+def get_streaming() -> bool:
+    inst = Configuration.get_instance()
+    return inst.streaming
+
+
+def get_fast_parser() -> bool:
+    inst = Configuration.get_instance()
+    return inst.fast_parser
+
+
+def get_modules() -> List[str]:
+    inst = Configuration.get_instance()
+    return inst.modules
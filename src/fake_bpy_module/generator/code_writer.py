@@ -3,6 +3,16 @@ import subprocess
 from typing import List
 from yapf.yapflib.yapf_api import FormatCode
 
+# Number of files passed to one ruff process to keep the command line short.
+RUFF_BATCH_SIZE = 200
+
+
+def format_files_by_ruff(filenames: List[str]):
+    for i in range(0, len(filenames), RUFF_BATCH_SIZE):
+        subprocess.check_call(
+            ["ruff", "format", "--isolated", "--quiet", "--"]
+            + filenames[i:i + RUFF_BATCH_SIZE])
+
 
 class CodeWriterIndent:
     indent_stack: List[int] = [0]
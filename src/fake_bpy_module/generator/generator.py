@@ -1,5 +1,7 @@
+import os
 import pathlib
-from typing import List
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List
 
 from docutils import nodes
 
@@ -8,7 +10,10 @@ from ..analyzer.nodes import (
 )
 from ..utils import get_first_child
 from .. import config
+from .. import utils
+from ..profiler import profile_stage
 
+from .code_writer import format_files_by_ruff
 from .writers import (
     BaseWriter,
     PyCodeWriter,
@@ -16,29 +21,142 @@ from .writers import (
     JsonWriter,
 )
 
+# Writers owned by each worker process of the process pool.
+_WORKER_WRITERS: List[BaseWriter] = []
 
-def generate(documents: List[nodes.document]):
-    # Create module directories.
-    for doc in documents:
-        target_filename = get_first_child(doc, TargetFileNode).astext()
-        dir_path = config.get_output_dir() + "/" + target_filename[:target_filename.rfind("/")]
-        pathlib.Path(dir_path).mkdir(parents=True, exist_ok=True)
 
-        # Create py.typed file.
-        filename = f"{dir_path}/py.typed"
+def _create_writer(output_format: str) -> BaseWriter:
+    writer: BaseWriter = None
+    if output_format == "py":
+        writer = PyCodeWriter()
+    elif output_format == "pyi":
+        writer = PyInterfaceWriter()
+    elif output_format == "json":
+        writer = JsonWriter()
+    else:
+        raise ValueError(f"Invalid output format: {output_format}")
+
+    return writer
+
+
+def _write(writer: BaseWriter, document: nodes.document):
+    target_filename = get_first_child(document, TargetFileNode).astext()
+    style_format = config.get_style_format()
+    # Files are formatted at once after all files are written.
+    if style_format == "ruff-batch":
+        style_format = "none"
+    writer.write(f"{config.get_output_dir()}/{target_filename}",
+                 document, style_format)
+
+
+def _init_worker(output_dir: str, output_formats: List[str], style_format: str,
+                 log_level: int):
+    # pylint: disable=W0603
+    global _WORKER_WRITERS
+
+    # Worker processes may not inherit the configuration from the parent
+    # process (ex. "spawn" start method), so restore the required one.
+    config.set_output_dir(output_dir)
+    config.set_style_format(style_format)
+    utils.LOG_LEVEL = log_level
+
+    # CodeWriterIndent holds the indent level as the class variable, so the
+    # writer must not be shared between threads. Each worker process owns
+    # its writers instead.
+    _WORKER_WRITERS = [_create_writer(fmt) for fmt in output_formats]
+
+
+def _write_in_worker(document: nodes.document):
+    for writer in _WORKER_WRITERS:
+        _write(writer, document)
+
+
+def _generate_parallel(documents: List[nodes.document], output_formats: List[str],
+                       jobs: int):
+    chunksize = max(1, len(documents) // (jobs * 4))
+    with ProcessPoolExecutor(
+            max_workers=jobs, initializer=_init_worker,
+            initargs=(config.get_output_dir(), output_formats,
+                      config.get_style_format(), utils.LOG_LEVEL)) as executor:
+        # Consume the iterator to raise the exception from the workers.
+        for _ in executor.map(_write_in_worker, documents, chunksize=chunksize):
+            pass
+
+
+def _make_module_directory(document: nodes.document):
+    target_filename = get_first_child(document, TargetFileNode).astext()
+    dir_path = config.get_output_dir() + "/" + target_filename[:target_filename.rfind("/")]
+    pathlib.Path(dir_path).mkdir(parents=True, exist_ok=True)
+
+    # Create py.typed file.
+    filename = f"{dir_path}/py.typed"
+    if not os.path.isfile(filename):
         with open(filename, "w", encoding="utf-8", newline="\n") as file:
             file.write("")
 
-    # Generate modules.
-    generator: BaseWriter = None
-    if config.get_output_format() == "py":
-        generator = PyCodeWriter()
-    elif config.get_output_format() == "pyi":
-        generator = PyInterfaceWriter()
-    elif config.get_output_format() == "json":
-        generator = JsonWriter()
 
+def _get_files_to_format(document: nodes.document, output_formats: List[str]) -> List[str]:
+    target_filename = get_first_child(document, TargetFileNode).astext()
+    filenames = []
+    for fmt in output_formats:
+        if fmt in ("py", "pyi"):
+            filenames.append(f"{config.get_output_dir()}/{target_filename}.{fmt}")
+    return filenames
+
+
+def generate(documents: List[nodes.document], output_formats: List[str] = None):
+    # Write the same documents in all output formats, so that analyze and
+    # transform run only once.
+    if output_formats is None:
+        output_formats = [config.get_output_format()]
+
+    # Create module directories.
     for doc in documents:
-        target_filename = get_first_child(doc, TargetFileNode).astext()
-        generator.write(f"{config.get_output_dir()}/{target_filename}",
-                        doc, config.get_style_format())
+        _make_module_directory(doc)
+
+    # Generate modules.
+    # Formatting the code (ex. ruff) takes most of the time, so the files are
+    # written and formatted in parallel.
+    jobs = config.get_jobs()
+    if jobs >= 2 and len(documents) >= 2:
+        # The time spent in the worker processes is not separated by writers.
+        with profile_stage("generator", ",".join(output_formats), documents):
+            _generate_parallel(documents, output_formats, min(jobs, len(documents)))
+    else:
+        for fmt in output_formats:
+            writer = _create_writer(fmt)
+            with profile_stage("generator", fmt, documents):
+                for doc in documents:
+                    _write(writer, doc)
+
+    # Launching ruff per file is much slower than formatting the code, so
+    # all files are passed to ruff at once.
+    if config.get_style_format() == "ruff-batch":
+        filenames = []
+        for doc in documents:
+            filenames.extend(_get_files_to_format(doc, output_formats))
+        with profile_stage("generator", "ruff-batch"):
+            format_files_by_ruff(filenames)
+
+
+def generate_streaming(documents: Iterable[nodes.document], output_formats: List[str] = None):
+    # Each document is written in all output formats as soon as it is
+    # received, and is not referred after that. The documents are written
+    # in this process even if the jobs are specified.
+    if output_formats is None:
+        output_formats = [config.get_output_format()]
+
+    writers = [_create_writer(fmt) for fmt in output_formats]
+    filenames = []
+    # The time includes the transformers which are applied to each document
+    # when the documents come from transform_streaming().
+    with profile_stage("generator", "streaming"):
+        for doc in documents:
+            _make_module_directory(doc)
+            for writer in writers:
+                _write(writer, doc)
+            filenames.extend(_get_files_to_format(doc, output_formats))
+
+    if config.get_style_format() == "ruff-batch":
+        with profile_stage("generator", "ruff-batch"):
+            format_files_by_ruff(filenames)
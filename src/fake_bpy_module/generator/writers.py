@@ -181,6 +181,9 @@ class PyCodeWriterBase(BaseWriter):
 
         desc_node = func_node.element(DescriptionNode)
         if "deprecated" in func_node.attributes:
+            # Copy the node not to modify the document which may be written
+            # in the other output formats.
+            desc_node = desc_node.deepcopy()
             desc_node.insert(0, nodes.Text(func_node.attributes["deprecated"]))
 
         with CodeWriterIndent(1):
@@ -277,6 +280,9 @@ class PyCodeWriterBase(BaseWriter):
                 dtype_list_node = attr_node.element(DataTypeListNode)
                 desc_node = attr_node.element(DescriptionNode)
                 if "deprecated" in attr_node.attributes:
+                    # Copy the node not to modify the document which may be written
+                    # in the other output formats.
+                    desc_node = desc_node.deepcopy()
                     desc_node.insert(0, nodes.Text(attr_node.attributes["deprecated"]))
 
                 dtype_str = None
@@ -459,6 +465,9 @@ class PyCodeWriterBase(BaseWriter):
         dtype_list_node = data_node.element(DataTypeListNode)
         desc_node = data_node.element(DescriptionNode)
         if "deprecated" in data_node.attributes:
+            # Copy the node not to modify the document which may be written
+            # in the other output formats.
+            desc_node = desc_node.deepcopy()
             desc_node.insert(0, nodes.Text(data_node.attributes["deprecated"]))
 
         if not dtype_list_node.empty():
@@ -0,0 +1,105 @@
+import hashlib
+import json
+import os
+from typing import List, Dict
+from docutils import nodes
+
+from .analyzer.nodes import (
+    ModuleNode,
+    NameNode,
+    TargetFileNode,
+)
+from .cache import get_package_digest
+from .utils import get_first_child, output_log, LOG_LEVEL_INFO
+from . import config
+
+
+class GenerationManifest:
+    FORMAT_VERSION = 1
+
+    def __init__(self, filename: str, output_formats: List[str]):
+        self._filename: str = filename
+        self._output_formats: List[str] = output_formats
+        # Key: Target filename
+        self._old_targets: Dict[str, dict] = {}
+        self._new_targets: Dict[str, dict] = {}
+
+    @classmethod
+    def load(cls, cache_dir: str, output_dir: str,
+             output_formats: List[str]) -> 'GenerationManifest':
+        # Manifest is stored per output directory and output formats.
+        key = hashlib.sha256(
+            f"{os.path.abspath(output_dir)}:{','.join(output_formats)}".encode()).hexdigest()
+        manifest = cls(f"{cache_dir}/manifest/{key}.json", output_formats)
+
+        if os.path.isfile(manifest._filename):
+            with open(manifest._filename, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == cls.FORMAT_VERSION:
+                manifest._old_targets = data["targets"]
+
+        return manifest
+
+    def save(self):
+        os.makedirs(os.path.dirname(self._filename), exist_ok=True)
+        data = {
+            "version": self.FORMAT_VERSION,
+            "targets": self._new_targets,
+        }
+        tmp_filename = f"{self._filename}.tmp"
+        with open(tmp_filename, "w", encoding="utf-8", newline="\n") as f:
+            json.dump(data, f, indent=4, sort_keys=True)
+        os.replace(tmp_filename, self._filename)
+
+    def _is_output_exist(self, target_filename: str) -> bool:
+        for fmt in self._output_formats:
+            if not os.path.isfile(f"{config.get_output_dir()}/{target_filename}.{fmt}"):
+                return False
+        return True
+
+    def compute_global_digest(self, entry_points: list, package_structure) -> str:
+        hash_ = hashlib.sha256()
+        for salt in (get_package_digest(), config.get_target(),
+                     str(config.get_target_version()), str(config.get_mod_version()),
+                     config.get_style_format(), ",".join(self._output_formats)):
+            hash_.update(salt.encode())
+            hash_.update(b"\0")
+        hash_.update(json.dumps(package_structure.to_dict(), sort_keys=True).encode())
+        for entry in sorted(f"{e.type}:{e.fullname()}" for e in entry_points):
+            hash_.update(entry.encode())
+            hash_.update(b"\0")
+        return hash_.hexdigest()
+
+    def filter_changed_documents(
+            self, documents: List[nodes.document], global_digest: str,
+            input_files: Dict[str, List[str]],
+            mod_files: Dict[str, List[str]]) -> List[nodes.document]:
+        changed: List[nodes.document] = []
+        for document in documents:
+            target_filename = get_first_child(document, TargetFileNode).astext()
+            module_name = get_first_child(document, ModuleNode).element(NameNode).astext()
+
+            # All inputs contributing to this target are reflected in the
+            # combined document, and the inputs from the other targets are
+            # reflected in the global digest.
+            hash_ = hashlib.sha256(global_digest.encode())
+            hash_.update(document.pformat().encode())
+            entry = {
+                "digest": hash_.hexdigest(),
+                "rst_files": input_files.get(target_filename, []),
+                "mod_files": [os.path.basename(f) for f in mod_files.get(module_name, [])],
+            }
+            self._new_targets[target_filename] = entry
+
+            old_entry = self._old_targets.get(target_filename)
+            if (old_entry is not None
+                    and old_entry["digest"] == entry["digest"]
+                    and self._is_output_exist(target_filename)):
+                output_log(LOG_LEVEL_INFO, f"Skip unchanged target: {target_filename}")
+                continue
+            changed.append(document)
+
+        output_log(LOG_LEVEL_INFO,
+                   f"{len(changed)}/{len(documents)} target files will be generated")
+
+        return changed
@@ -0,0 +1,132 @@
+import contextlib
+import json
+import os
+import sys
+import time
+import tracemalloc
+from typing import Iterator, List
+from docutils import nodes
+
+from . import config
+
+try:
+    import resource
+except ImportError:     # Windows
+    resource = None
+
+# Records of the profiled stages in the executed order.
+_RECORDS: List[dict] = []
+# Tracing the memory by tracemalloc makes the stages several times slower,
+# so it can be disabled to measure the time accurately.
+_TRACE_MEMORY: bool = True
+
+
+def _count_nodes(documents: List[nodes.document]) -> int:
+    return sum(sum(1 for _ in doc.findall()) for doc in documents)
+
+
+def _get_max_rss() -> int:
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes on the other platforms.
+    if sys.platform == "darwin":
+        return max_rss
+    return max_rss * 1024
+
+
+def is_enabled() -> bool:
+    return config.get_profile()
+
+
+def get_records() -> List[dict]:
+    return _RECORDS
+
+
+def set_memory_tracing(enabled: bool):
+    # pylint: disable=W0603
+    global _TRACE_MEMORY
+    _TRACE_MEMORY = enabled
+
+
+def reset():
+    _RECORDS.clear()
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+@contextlib.contextmanager
+def profile_stage(category: str, name: str,
+                  documents: List[nodes.document] = None) -> Iterator[None]:
+    # The documents are counted at the end of the stage again, so the same
+    # list object must be passed for the stage which changes the documents.
+    if not is_enabled():
+        yield
+        return
+
+    if _TRACE_MEMORY:
+        if hasattr(tracemalloc, "reset_peak"):
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+        else:
+            # tracemalloc.reset_peak() is not available until Python 3.9,
+            # so the tracing is restarted to measure the peak of each stage.
+            if tracemalloc.is_tracing():
+                tracemalloc.stop()
+            tracemalloc.start()
+
+    record = {
+        "category": category,
+        "name": name,
+        "documents_before": 0,
+        "nodes_before": 0,
+    }
+    if documents is not None:
+        record["documents_before"] = len(documents)
+        record["nodes_before"] = _count_nodes(documents)
+
+    memory_before = 0
+    if _TRACE_MEMORY:
+        memory_before = tracemalloc.get_traced_memory()[0]
+        if hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()
+    wall_time_start = time.perf_counter()
+    cpu_time_start = time.process_time()
+
+    yield
+
+    record["wall_time"] = time.perf_counter() - wall_time_start
+    record["cpu_time"] = time.process_time() - cpu_time_start
+    record["memory_delta"] = None
+    record["memory_peak"] = None
+    if _TRACE_MEMORY:
+        memory_after, memory_peak = tracemalloc.get_traced_memory()
+        record["memory_delta"] = memory_after - memory_before
+        record["memory_peak"] = memory_peak - memory_before
+    record["max_rss"] = _get_max_rss()
+
+    record["documents_after"] = 0
+    record["nodes_after"] = 0
+    if documents is not None:
+        record["documents_after"] = len(documents)
+        record["nodes_after"] = _count_nodes(documents)
+
+    _RECORDS.append(record)
+
+
+def write_report(filename: str):
+    data = {
+        "target": config.get_target(),
+        "target_version": config.get_target_version(),
+        "jobs": config.get_jobs(),
+        "total_wall_time": sum(r["wall_time"] for r in _RECORDS),
+        "total_cpu_time": sum(r["cpu_time"] for r in _RECORDS),
+        "max_rss": _get_max_rss(),
+        "stages": _RECORDS,
+    }
+
+    dir_path = os.path.dirname(filename)
+    if dir_path != "":
+        os.makedirs(dir_path, exist_ok=True)
+    with open(filename, "w", encoding="utf-8", newline="\n") as f:
+        json.dump(data, f, indent=4)
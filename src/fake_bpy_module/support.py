@@ -8,7 +8,14 @@ SUPPORTED_TARGET: List[str] = [
 SUPPORTED_STYLE_FORMAT: List[str] = [
     "none",
     "yapf",
-    "ruff"
+    "ruff",
+    "ruff-batch"
+]
+
+SUPPORTED_OUTPUT_FORMAT: List[str] = [
+    "py",
+    "pyi",
+    "json"
 ]
 
 SUPPORTED_MOD_BLENDER_VERSION: List[str] = [
@@ -12,7 +12,8 @@ from ..analyzer.nodes import (
 from ..analyzer.roles import (
     ClassRef,
 )
-from ..utils import get_first_child, find_children
+from ..utils import get_first_child, find_children, replace_child
+from .document_index import get_document_index
 from .utils import get_base_name, get_module_name, build_module_structure
 
 
@@ -38,6 +39,15 @@ class CannonicalDataTypeRewriter(TransformerBase):
 
     def _get_generation_data_type(self, data_type: str,
                                   target_module: str) -> str:
+        cache = self._package_structure.resolution_cache("generation_data_type")
+        key = (data_type, target_module)
+        if key not in cache:
+            cache[key] = self._get_generation_data_type_internal(
+                data_type, target_module)
+        return cache[key]
+
+    def _get_generation_data_type_internal(self, data_type: str,
+                                           target_module: str) -> str:
         mod_names_full_1 = get_module_name(data_type, self._package_structure)
         mod_names_full_2 = target_module
 
@@ -108,37 +118,32 @@ class CannonicalDataTypeRewriter(TransformerBase):
             new_class_ref = ClassRef(text=new_class_name)
             return new_class_ref
 
-        def replace(from_node: nodes.Node, to_node: nodes.Node):
-            parent = from_node.parent
-            index = from_node.parent.index(from_node)
-            parent.remove(from_node)
-            parent.insert(index, to_node)
-
         module_node = get_first_child(document, ModuleNode)
         if module_node is None:
             return
         module_name = module_node.element(NameNode).astext()
 
+        index = get_document_index(document)
         class_nodes = find_children(document, ClassNode)
         for class_node in class_nodes:
-            class_refs = class_node.traverse(ClassRef)
+            class_refs = index.find(ClassRef, class_node)
             for class_ref in class_refs:
                 new_class_ref = rewrite(class_ref, module_name)
-                replace(class_ref, new_class_ref)
+                replace_child(class_ref, new_class_ref)
 
         func_nodes = find_children(document, FunctionNode)
         for func_node in func_nodes:
-            class_refs = func_node.traverse(ClassRef)
+            class_refs = index.find(ClassRef, func_node)
             for class_ref in class_refs:
                 new_class_ref = rewrite(class_ref, module_name)
-                replace(class_ref, new_class_ref)
+                replace_child(class_ref, new_class_ref)
 
         data_nodes = find_children(document, DataNode)
         for data_node in data_nodes:
-            class_refs = data_node.traverse(ClassRef)
+            class_refs = index.find(ClassRef, data_node)
             for class_ref in class_refs:
                 new_class_ref = rewrite(class_ref, module_name)
-                replace(class_ref, new_class_ref)
+                replace_child(class_ref, new_class_ref)
 
     @classmethod
     def name(cls) -> str:
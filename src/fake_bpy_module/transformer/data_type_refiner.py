@@ -1,6 +1,6 @@
 import re
 import typing
-from typing import List, Dict, Set, Tuple
+from typing import Callable, List, Dict, Set, Tuple
 from docutils import nodes
 
 from .transformer_base import TransformerBase
@@ -58,6 +58,9 @@ REGEX_MATCH_DATA_TYPE_DOT = re.compile(r"^`([a-zA-Z0-9_]+\.[a-zA-Z0-9_.]+)`$")
 REGEX_MATCH_DATA_TYPE_DOT_COMMA = re.compile(r"^`([a-zA-Z0-9_.]+)`(,)*$")
 REGEX_MATCH_DATA_TYPE_START_AND_END_WITH_PARENTHESES = re.compile(r"^\(([a-zA-Z0-9_.,` ]+)\)$")
 REGEX_MATCH_DATA_TYPE_NAME = re.compile(r"^[a-zA-Z0-9_.]+$")
+REGEX_MATCH_DATA_TYPE_LIST_OF_CALLABLE = re.compile(r"^list of callable\[`([0-9a-zA-Z.]+)`\]")  # noqa # pylint: disable=C0301
+REGEX_MATCH_DATA_TYPE_PARENTHESES_VALUE_ITEM = re.compile(r"^`([a-zA-Z.]+)`$")
+REGEX_MATCH_FIRST_TOKEN = re.compile(r"[A-Za-z]*")
 # pylint: enable=line-too-long
 
 _REGEX_DATA_TYPE_OPTION_STR = re.compile(r"\(([a-zA-Z, ]+?)\)$")
@@ -74,49 +77,576 @@ class EntryPoint:
         return f"{self.module}.{self.name}"
 
 
-class DataTypeRefiner(TransformerBase):
+def build_entry_points(documents: List[nodes.document]) -> List['EntryPoint']:
+    entry_points: List['EntryPoint'] = []
 
-    def __init__(self, documents: List[nodes.document], **kwargs):
-        super().__init__(documents, **kwargs)
-        self._entry_points = None
-        if "entry_points" in kwargs:
-            self._entry_points = kwargs["entry_points"]
+    for document in documents:
+        module_node = get_first_child(document, ModuleNode)
+        if module_node is None:
+            continue
 
-        self._entry_points_cache: Dict[str, Set] = {}
+        module_name = module_node.element(NameNode).astext()
 
-    def _build_entry_points(self, documents: List[nodes.document]) -> List['EntryPoint']:
-        entry_points: List['EntryPoint'] = []
+        class_nodes = find_children(document, ClassNode)
+        for class_node in class_nodes:
+            class_name = class_node.element(NameNode).astext()
+            entry = EntryPoint(module_name, class_name, "class")
+            entry_points.append(entry)
 
-        for document in documents:
-            module_node = get_first_child(document, ModuleNode)
-            if module_node is None:
-                continue
+        func_nodes = find_children(document, FunctionNode)
+        for func_node in func_nodes:
+            func_name = func_node.element(NameNode).astext()
+            entry = EntryPoint(module_name, func_name, "function")
+            entry_points.append(entry)
 
-            module_name = module_node.element(NameNode).astext()
+        data_nodes = find_children(document, DataNode)
+        for data_node in data_nodes:
+            data_name = data_node.element(NameNode).astext()
+            entry = EntryPoint(module_name, data_name, "constant")
+            entry_points.append(entry)
+
+    return entry_points
 
-            class_nodes = find_children(document, ClassNode)
-            for class_node in class_nodes:
-                class_name = class_node.element(NameNode).astext()
-                entry = EntryPoint(module_name, class_name, "class")
-                entry_points.append(entry)
 
-            func_nodes = find_children(document, FunctionNode)
-            for func_node in func_nodes:
-                func_name = func_node.element(NameNode).astext()
-                entry = EntryPoint(module_name, func_name, "function")
-                entry_points.append(entry)
+def build_full_names_by_relative_name(entry_points: List['EntryPoint']) -> Dict[str, str]:
+    uniq_full_names = {e.fullname() for e in entry_points}
+    uniq_module_names = {e.module for e in entry_points}
+
+    # Collect the full names which can be made by joining the module name
+    # and the relative name. (ex. bpy.types + Object, bpy + types.Object)
+    candidates: List[Tuple[str, str, str]] = []
+    for full_name in uniq_full_names:
+        pos = full_name.find(".")
+        while pos != -1:
+            if full_name[:pos] in uniq_module_names:
+                candidates.append((full_name[:pos], full_name[pos + 1:], full_name))
+            pos = full_name.find(".", pos + 1)
+
+    # When the relative name is found in the multiple modules, the module
+    # which comes first in the alphabetical order is used.
+    # Key: Relative name, Value: Full name
+    full_names_by_relative_name: Dict[str, str] = {}
+    for _, relative_name, full_name in sorted(candidates):
+        full_names_by_relative_name.setdefault(relative_name, full_name)
+
+    return full_names_by_relative_name
+
+
+# Each rule refines the data type string to the list of the data type strings
+# (the argument of make_data_type_node), or returns None if the rule does not
+# match.
+# pylint: disable=W0613
+
+
+def _rule_space(dtype_str: str, variable_kind: str, self_class: str,
+                parse: Callable[[str], str]) -> List[str]:
+    if REGEX_MATCH_DATA_TYPE_SPACE.match(dtype_str):
+        return ["typing.Any"]
+    return None
+
+
+def _rule_list_of_callable(dtype_str: str, variable_kind: str, self_class: str,
+                           parse: Callable[[str], str]) -> List[str]:
+    if m := REGEX_MATCH_DATA_TYPE_LIST_OF_CALLABLE.match(dtype_str):
+        if parse(m.group(1)):
+            return ["typing.List[typing.Callable[[`bpy.types.Scene`, None]]]"]
+    return None
+
+
+def _rule_same_type_with_self_class(dtype_str: str, variable_kind: str, self_class: str,
+                                    parse: Callable[[str], str]) -> List[str]:
+    if dtype_str == "Same type with self class":
+        if s := parse(self_class):
+            return [f"`{s}`"]
+    return None
+
+
+def _rule_any(dtype_str: str, variable_kind: str, self_class: str,
+              parse: Callable[[str], str]) -> List[str]:
+    if dtype_str in ("type", "object", "function"):
+        return ["typing.Any"]
+
+    if dtype_str.startswith("Depends on function prototype"):
+        return ["typing.Any"]
+
+    # [Pattern] `AnyType`
+    # [Test]
+    #   File: refiner_test.py
+    #   Function: test_get_refined_data_type_for_various_patterns
+    #   Pattern: `AnyType`
+    if dtype_str.startswith("`AnyType`"):
+        return ["typing.Any"]
+
+    if dtype_str in ("any", "Any type."):
+        return ["typing.Any"]
+    return None
+
+
+def _rule_vector(dtype_str: str, variable_kind: str, self_class: str,
+                 parse: Callable[[str], str]) -> List[str]:
+    # "[23][dD] [Vv]ector"
+    if dtype_str[1:].lower() == "d vector":
+        if s := parse("Vector"):
+            return [f"`{s}`"]
+    return None
+
+
+def _rule_matrix(dtype_str: str, variable_kind: str, self_class: str,
+                 parse: Callable[[str], str]) -> List[str]:
+    if dtype_str == "4x4 mathutils.Matrix":
+        if s := parse("Matrix"):
+            return [f"`{s}`"]
+    return None
+
+
+def _rule_enum(dtype_str: str, variable_kind: str, self_class: str,
+               parse: Callable[[str], str]) -> List[str]:
+    if REGEX_MATCH_DATA_TYPE_ENUM_IN_DEFAULT.match(dtype_str):
+        return ["str", "int"]
+    # Ex: enum in ['POINT', 'EDGE', 'FACE', 'CORNER', 'CURVE', 'INSTANCE']
+    if REGEX_MATCH_DATA_TYPE_ENUM_IN.match(dtype_str):
+        return ["str", "int"]
+
+    # Ex: enum set in {'KEYMAP_FALLBACK'}, (optional)
+    if REGEX_MATCH_DATA_TYPE_SET_IN.match(dtype_str):
+        return ["typing.Set[str]", "typing.Set[int]"]
+
+    # Ex: enum in :ref:`rna_enum_object_modifier_type_items`, (optional)
+    if dtype_str.startswith("enum in `rna"):
+        return ["str", "int"]
+    return None
+
+
+def _rule_enumerated_constant(dtype_str: str, variable_kind: str, self_class: str,
+                              parse: Callable[[str], str]) -> List[str]:
+    # Ex: Enumerated constant
+    if dtype_str == "Enumerated constant":
+        return ["typing.Set[str]", "typing.Set[int]"]
+    return None
+
+
+def _rule_boolean(dtype_str: str, variable_kind: str, self_class: str,
+                  parse: Callable[[str], str]) -> List[str]:
+    # Ex: boolean, default False
+    if REGEX_MATCH_DATA_TYPE_BOOLEAN_DEFAULT.match(dtype_str):
+        return ["bool"]
+    # Ex: boolean array of 3 items, (optional)
+    if REGEX_MATCH_DATA_TYPE_BOOLEAN_ARRAY_OF.match(dtype_str):
+        return ["typing.List[bool]"]
+
+    if dtype_str == "boolean":
+        return ["bool"]
+    return None
+
+
+def _rule_bool(dtype_str: str, variable_kind: str, self_class: str,
+               parse: Callable[[str], str]) -> List[str]:
+    if dtype_str == "bool":
+        return ["bool"]
+    return None
+
+
+def _rule_bytes(dtype_str: str, variable_kind: str, self_class: str,
+                parse: Callable[[str], str]) -> List[str]:
+    if dtype_str == "bytes":
+        return ["bytes"]
+    if dtype_str.startswith("byte sequence"):
+        return ["typing.Sequence[bytes]"]
+    return None
+
+
+def _rule_callable(dtype_str: str, variable_kind: str, self_class: str,
+                   parse: Callable[[str], str]) -> List[str]:
+    if dtype_str.lower().startswith("callable"):
+        return ["typing.Callable"]
+    return None
+
+
+def _rule_mathutils_values(dtype_str: str, variable_kind: str, self_class: str,
+                           parse: Callable[[str], str]) -> List[str]:
+    if m := REGEX_MATCH_DATA_TYPE_MATHUTILS_VALUES.match(dtype_str):
+        if variable_kind in ('FUNC_ARG', 'CONST', 'CLS_ATTR'):
+            if s := parse(m.group(1)):
+                return ["typing.Sequence[float]", f"`{s}`"]
+    return None
+
+
+def _rule_number_array_of(dtype_str: str, variable_kind: str, self_class: str,
+                          parse: Callable[[str], str]) -> List[str]:
+    # Ex: int array of 2 items in [-32768, 32767], default (0, 0)
+    if m := REGEX_MATCH_DATA_TYPE_NUMBER_ARRAY_OF.match(dtype_str):
+        if m.group(1) in ("int", "float"):
+            if variable_kind == 'FUNC_ARG':
+                return [f"typing.Iterable[{m.group(1)}]"]
+            return [f"`bpy.types.bpy_prop_array`[{m.group(1)}]"]
+    return None
+
+
+def _rule_mathutils_array_of(dtype_str: str, variable_kind: str, self_class: str,
+                             parse: Callable[[str], str]) -> List[str]:
+    # Ex: :`mathutils.Euler` rotation of 3 items in [-inf, inf],
+    #     default (0.0, 0.0, 0.0)
+    if m := REGEX_MATCH_DATA_TYPE_MATHUTILS_ARRAY_OF.match(dtype_str):
+        if s := parse(m.group(1)):
+            tuple_elms = ["float"] * int(m.group(3))
+            return [
+                "typing.List[float]",
+                f"typing.Tuple[{', '.join(tuple_elms)}]",
+                f"`{s}`"
+            ]
+    return None
+
+
+def _rule_float_triplet(dtype_str: str, variable_kind: str, self_class: str,
+                        parse: Callable[[str], str]) -> List[str]:
+    # Ex: float triplet
+    if dtype_str == "float triplet":
+        if s := parse("mathutils.Vector"):
+            return ["typing.Sequence[float]", f"`{s}`"]
+    return None
+
+
+def _rule_number(dtype_str: str, variable_kind: str, self_class: str,
+                 parse: Callable[[str], str]) -> List[str]:
+    # Ex: int in [-inf, inf], default 0, (readonly)
+    if m := REGEX_MATCH_DATA_TYPE_NUMBER_IN.match(dtype_str):
+        return [m.group(1)]
+    if dtype_str in ("int", "float"):
+        return [dtype_str]
+    if dtype_str in ("unsigned int", "int (boolean)"):
+        return ["int"]
+    if dtype_str == "int sequence":
+        return ["typing.Sequence[int]"]
+
+    # Ex: float multi-dimensional array of 3 * 3 items in [-inf, inf]
+    if m := REGEX_MATCH_DATA_TYPE_FLOAT_MULTI_DIMENSIONAL_ARRAY_OF.match(dtype_str):  # noqa # pylint: disable=C0301
+        tuple_elems = [
+            f"typing.Tuple[{', '.join(['float'] * int(m.group(1)))}]"
+        ] * int(m.group(2))
+        return [
+            "typing.List[typing.List[float]]",
+            f"typing.Tuple[{', '.join(tuple_elems)}]"
+        ]
+    return None
+
+
+def _rule_mathutils_matrix_of(dtype_str: str, variable_kind: str, self_class: str,
+                              parse: Callable[[str], str]) -> List[str]:
+    if m := REGEX_MATCH_DATA_TYPE_MATHUTILS_MATRIX_OF.match(dtype_str):
+        if s := parse("mathutils.Matrix"):
+            tuple_elems = [
+                f"typing.Tuple[{', '.join(['float'] * int(m.group(1)))}]"
+            ] * int(m.group(2))
+            return [
+                "typing.List[typing.List[float]]",
+                f"typing.Tuple[{', '.join(tuple_elems)}]",
+                f"`{s}`"
+            ]
+    return None
+
+
+def _rule_double(dtype_str: str, variable_kind: str, self_class: str,
+                 parse: Callable[[str], str]) -> List[str]:
+    if dtype_str == "double":
+        return ["float"]
+    if dtype_str.startswith("double (float)"):
+        return ["float"]
+    return None
+
+
+def _rule_string(dtype_str: str, variable_kind: str, self_class: str,
+                 parse: Callable[[str], str]) -> List[str]:
+    if REGEX_MATCH_DATA_TYPE_STRING.match(dtype_str):
+        return ["str"]
+    return None
+
+
+def _rule_integer(dtype_str: str, variable_kind: str, self_class: str,
+                  parse: Callable[[str], str]) -> List[str]:
+    if REGEX_MATCH_DATA_TYPE_INTEGER.match(dtype_str):
+        return ["int"]
+    return None
+
+
+def _rule_tuple(dtype_str: str, variable_kind: str, self_class: str,
+                parse: Callable[[str], str]) -> List[str]:
+    if dtype_str == "tuple":
+        return ["typing.Tuple"]
+    return None
+
+
+def _rule_sequence(dtype_str: str, variable_kind: str, self_class: str,
+                   parse: Callable[[str], str]) -> List[str]:
+    if dtype_str == "sequence":
+        return ["typing.Sequence"]
+    return None
+
+
+def _rule_bgl_buffer(dtype_str: str, variable_kind: str, self_class: str,
+                     parse: Callable[[str], str]) -> List[str]:
+    if dtype_str.startswith("`bgl.Buffer` "):
+        if s1 := parse("bgl.Buffer"):
+            return [f"`{s1}`"]
+    return None
+
+
+def _rule_value_bpy_prop_collection_of(dtype_str: str, variable_kind: str, self_class: str,
+                                       parse: Callable[[str], str]) -> List[str]:
+    if m := REGEX_MATCH_DATA_TYPE_VALUE_BPY_PROP_COLLECTION_OF.match(dtype_str):  # noqa # pylint: disable=C0301
+        s1 = parse(m.group(1))
+        s2 = parse(m.group(2))
+        if s1 and s2:
+            return [f"`{s1}`"]
+    return None
+
+
+def _rule_set_of_strings(dtype_str: str, variable_kind: str, self_class: str,
+                         parse: Callable[[str], str]) -> List[str]:
+    if dtype_str.startswith("set of strings"):
+        return ["typing.Set[str]"]
+    return None
+
+
+def _rule_sequence_of(dtype_str: str, variable_kind: str, self_class: str,
+                      parse: Callable[[str], str]) -> List[str]:
+    # [Pattern] sequence of string tuples or a function
+    # [Test]
+    #   File: refiner_test.py
+    #   Function: test_get_refined_data_type_for_various_patterns
+    #   Pattern: sequence of string tuples or a function
+    if dtype_str == "sequence of string tuples or a function":
+        return ["typing.Iterable[typing.Iterable[str]]", "typing.Callable"]
+    # Ex: sequence of bpy.types.Action
+    if m := REGEX_MATCH_DATA_TYPE_SEQUENCE_OF.match(dtype_str):
+        if s := parse(m.group(1)):
+            return [f"typing.Iterable[`{s}`]"]
+    return None
+
+
+def _rule_bpy_prop_collection_of(dtype_str: str, variable_kind: str, self_class: str,
+                                 parse: Callable[[str], str]) -> List[str]:
+    # Ex: `bpy_prop_collection` of `ThemeStripColor`,
+    #     (readonly, never None)
+    if m := REGEX_MATCH_DATA_TYPE_BPY_PROP_COLLECTION_OF.match(dtype_str):
+        if s := parse(m.group(1)):
+            return [f"`bpy.types.bpy_prop_collection`[`{s}`]"]
+    return None
+
+
+def _rule_list_of_value(dtype_str: str, variable_kind: str, self_class: str,
+                        parse: Callable[[str], str]) -> List[str]:
+    # Ex: List of FEdge objects
+    if m := REGEX_MATCH_DATA_TYPE_LIST_OF_VALUE_OBJECTS.match(dtype_str):
+        if s := parse(m.group(1)):
+            return [f"typing.List[`{s}`]"]
+    # Ex: list of FEdge
+    if m := REGEX_MATCH_DATA_TYPE_LIST_OF_VALUE.match(dtype_str):
+        if s := parse(m.group(1)):
+            return [f"typing.List[`{s}`]"]
+    return None
+
+
+def _rule_list_of_number_or_string(dtype_str: str, variable_kind: str, self_class: str,
+                                   parse: Callable[[str], str]) -> List[str]:
+    # Ex: list of ints
+    if m := REGEX_MATCH_DATA_TYPE_LIST_OF_NUMBER_OR_STRING.match(dtype_str):  # noqa # pylint: disable=C0301
+        return [f"typing.List[{m.group(2)}]"]
+    return None
+
+
+def _rule_list_of_parentheses_value(dtype_str: str, variable_kind: str, self_class: str,
+                                    parse: Callable[[str], str]) -> List[str]:
+    # Ex: list of (bmesh.types.BMVert)
+    if m := REGEX_MATCH_DATA_TYPE_LIST_OF_PARENTHESES_VALUE.match(dtype_str):  # noqa # pylint: disable=C0301
+        items = m.group(1).split(",")
+        dtypes = []
+        for item in items:
+            im = REGEX_MATCH_DATA_TYPE_PARENTHESES_VALUE_ITEM.match(item.strip())
+            if im:
+                if s := parse(im.group(1)):
+                    dtypes.append(f"typing.List[`{s}`]")
+        return dtypes
+    return None
+
+
+def _rule_bmelemseq_of_value(dtype_str: str, variable_kind: str, self_class: str,
+                             parse: Callable[[str], str]) -> List[str]:
+    # Ex: BMElemSeq of BMEdge
+    if m := REGEX_MATCH_DATA_TYPE_BMELEMSEQ_OF_VALUE.match(dtype_str):
+        if s := parse(m.group(1)):
+            return [f"typing.List[`{s}`]", "`bmesh.types.BMElemSeq`"]
+    return None
+
+
+def _rule_tuple_of_value(dtype_str: str, variable_kind: str, self_class: str,
+                         parse: Callable[[str], str]) -> List[str]:
+    # Ex: tuple of mathutils.Vector's
+    if m := REGEX_MATCH_DATA_TYPE_TUPLE_OF_VALUE.match(dtype_str):
+        if s := parse(m.group(1)):
+            return [f"typing.Tuple[`{s}`]"]
+    return None
+
+
+def _rule_start_and_end_with_parentheses(
+        dtype_str: str, variable_kind: str, self_class: str,
+        parse: Callable[[str], str]) -> List[str]:
+    # Ex: (Vector, Quaternion, Vector)
+    if m1 := REGEX_MATCH_DATA_TYPE_START_AND_END_WITH_PARENTHESES.match(dtype_str):
+        splited = m1.group(1).split(",")
+        dtypes = []
+        for sp in splited:
+            sp = sp.strip()
+            if m2 := REGEX_MATCH_DATA_TYPE_DOT_COMMA.match(sp):
+                if s := parse(m2.group(1)):
+                    dtypes.append(f"`{s}`")
+        if len(dtypes) != 0:
+            elem_str = ", ".join(dtypes)
+            return [f"typing.Tuple[{elem_str}]"]
+    return None
+
+
+def _rule_dict_with_string_keys(dtype_str: str, variable_kind: str, self_class: str,
+                                parse: Callable[[str], str]) -> List[str]:
+    if dtype_str == "dict with string keys":
+        return ["typing.Dict[str, typing.Any]"]
+    return None
+
+
+def _rule_iterable_object(dtype_str: str, variable_kind: str, self_class: str,
+                          parse: Callable[[str], str]) -> List[str]:
+    if dtype_str == "iterable object":
+        return ["typing.List"]
+    return None
+
+
+def _rule_list_or_dict_or_set_or_tuple(dtype_str: str, variable_kind: str, self_class: str,
+                                       parse: Callable[[str], str]) -> List[str]:
+    if m := REGEX_MATCH_DATA_TYPE_LIST_OR_DICT_OR_SET_OR_TUPLE.match(dtype_str):  # noqa # pylint: disable=C0301
+        return [f"{m.group(1)}"]
+    return None
+
+
+def _rule_struct(dtype_str: str, variable_kind: str, self_class: str,
+                 parse: Callable[[str], str]) -> List[str]:
+    # Ex: bpy.types.Struct subclass
+    if dtype_str == "`bpy.types.Struct` subclass":
+        if s := parse("bpy.types.Struct"):
+            return [f"`{s}`"]
+
+    if dtype_str == "`bpy_struct`":
+        if s := parse("bpy_struct"):
+            return [f"`{s}`"]
+    return None
+
+
+def _rule_class_ref(dtype_str: str, variable_kind: str, self_class: str,
+                    parse: Callable[[str], str]) -> List[str]:
+    # Ex: CLIP_OT_add_marker
+    if m := REGEX_MATCH_DATA_TYPE_OT.match(dtype_str):
+        idname = f"bpy.ops.{m.group(1).lower()}.{m.group(2)}"
+        if s := parse(idname):
+            return [f"`{s}`"]
+
+    if m := REGEX_MATCH_DATA_TYPE_DOT.match(dtype_str):
+        if s := parse(m.group(1)):
+            return [f"`{s}`"]
+
+    if m := REGEX_MATCH_DATA_TYPE_DOT_COMMA.match(dtype_str):
+        if s := parse(m.group(1)):
+            return [f"`{s}`"]
+    return None
+
+
+def _rule_name(dtype_str: str, variable_kind: str, self_class: str,
+               parse: Callable[[str], str]) -> List[str]:
+    if m := REGEX_MATCH_DATA_TYPE_NAME.match(dtype_str):
+        if s := parse(m.group(0)):
+            return [f"`{s}`"]
+    return None
+
+# pylint: enable=W0613
+
+
+# The rules are tested in this order. The first element is the first tokens
+# (see get_first_token) of the strings which the rule can match, or None if
+# the rule can match any strings.
+DATA_TYPE_RULES: List[Tuple[Tuple[str, ...], Callable]] = [
+    (None, _rule_space),
+    (("list",), _rule_list_of_callable),
+    (("same",), _rule_same_type_with_self_class),
+    (("type", "object", "function", "depends", "`", "any"), _rule_any),
+    (None, _rule_vector),
+    (("4",), _rule_matrix),
+    (("enum",), _rule_enum),
+    (("enumerated",), _rule_enumerated_constant),
+    (("boolean",), _rule_boolean),
+    (("bool",), _rule_bool),
+    (("bytes", "byte"), _rule_bytes),
+    (None, _rule_callable),
+    (("`",), _rule_mathutils_values),
+    (("int", "float"), _rule_number_array_of),
+    (("`",), _rule_mathutils_array_of),
+    (("float",), _rule_float_triplet),
+    (("int", "float", "unsigned"), _rule_number),
+    (("`",), _rule_mathutils_matrix_of),
+    (("double",), _rule_double),
+    (("str", "strings", "string"), _rule_string),
+    (("int", "integer", "", "."), _rule_integer),
+    (("tuple",), _rule_tuple),
+    (("sequence",), _rule_sequence),
+    (("`",), _rule_bgl_buffer),
+    (("`",), _rule_value_bpy_prop_collection_of),
+    (("set",), _rule_set_of_strings),
+    (("sequence",), _rule_sequence_of),
+    (("`",), _rule_bpy_prop_collection_of),
+    (("list",), _rule_list_of_value),
+    (("list", "sequence"), _rule_list_of_number_or_string),
+    (("list",), _rule_list_of_parentheses_value),
+    (("`",), _rule_bmelemseq_of_value),
+    (("tuple",), _rule_tuple_of_value),
+    (("(",), _rule_start_and_end_with_parentheses),
+    (("dict",), _rule_dict_with_string_keys),
+    (("iterable",), _rule_iterable_object),
+    (("`", "list", "dict", "set", "tuple"), _rule_list_or_dict_or_set_or_tuple),
+    (("`",), _rule_struct),
+    (("`",), _rule_class_ref),
+    (None, _rule_name),
+]
+
+# Key: First token, Value: Rules which can match the strings
+DATA_TYPE_RULE_INDEX: Dict[str, List[Callable]] = {}
+for _token in {t for keys, _ in DATA_TYPE_RULES if keys is not None for t in keys}:
+    DATA_TYPE_RULE_INDEX[_token] = [
+        rule for keys, rule in DATA_TYPE_RULES if keys is None or _token in keys]
+# Rules for the strings whose first token is not in the index.
+DATA_TYPE_RULES_FOR_ANY_TOKEN: List[Callable] = [
+    rule for keys, rule in DATA_TYPE_RULES if keys is None]
+
+
+def get_first_token(dtype_str: str) -> str:
+    # The leading alphabets in lower case, or the first character if the
+    # string does not start with an alphabet.
+    m = REGEX_MATCH_FIRST_TOKEN.match(dtype_str)
+    if m.group(0) != "":
+        return m.group(0).lower()
+    return dtype_str[:1]
 
-            data_nodes = find_children(document, DataNode)
-            for data_node in data_nodes:
-                data_name = data_node.element(NameNode).astext()
-                entry = EntryPoint(module_name, data_name, "constant")
-                entry_points.append(entry)
 
-        return entry_points
+class DataTypeRefiner(TransformerBase):
+
+    def __init__(self, documents: List[nodes.document], **kwargs):
+        super().__init__(documents, **kwargs)
+        self._entry_points = None
+        if "entry_points" in kwargs:
+            self._entry_points = kwargs["entry_points"]
+
+        self._entry_points_cache: Dict[str, typing.Any] = {}
+        # Key: (dtype_str, module_name, variable_kind, self_class)
+        self._refined_data_type_cache: Dict[tuple, List[str]] = {}
 
     def _parse_custom_data_type(
             self, string_to_parse: str, uniq_full_names: Set[str],
-            uniq_module_names: Set[str], module_name: str) -> str:
+            full_names_by_relative_name: Dict[str, str], module_name: str) -> str:
         dtype_str = string_to_parse
         if dtype_str in uniq_full_names:
             return dtype_str
@@ -124,342 +654,41 @@ class DataTypeRefiner(TransformerBase):
         if dtype_str in uniq_full_names:
             return dtype_str
 
-        for mod in list(uniq_module_names):
-            dtype_str = f"{mod}.{string_to_parse}"
-            if dtype_str in uniq_full_names:
-                return dtype_str
-
-        return None
+        return full_names_by_relative_name.get(string_to_parse)
 
     # pylint: disable=R0913
     def _get_refined_data_type_fast(
             self, dtype_str: str, uniq_full_names: Set[str],
-            uniq_module_names: Set[str], module_name: str,
+            full_names_by_relative_name: Dict[str, str], module_name: str,
             variable_kind: str,
             additional_info: Dict[str, typing.Any] = None) -> List['DataTypeNode']:
-        # pylint: disable=R0912,R0911,R0915
-        if REGEX_MATCH_DATA_TYPE_SPACE.match(dtype_str):
-            return [make_data_type_node("typing.Any")]
-
-        if m := re.match(r"list of callable\[`([0-9a-zA-Z.]+)`\]", dtype_str):
-            s = self._parse_custom_data_type(
-                m.group(1), uniq_full_names, uniq_module_names,
-                module_name)
-            if s:
-                return [
-                    make_data_type_node("typing.List[typing.Callable[[`bpy.types.Scene`, None]]]")
-                ]
-
-        if dtype_str == "Same type with self class":
-            s = self._parse_custom_data_type(
-                additional_info["self_class"], uniq_full_names,
-                uniq_module_names, module_name)
-            if s:
-                return [make_data_type_node(f"`{s}`")]
-
-        if dtype_str in ("type", "object", "function"):
-            return [make_data_type_node("typing.Any")]
-
-        if dtype_str.startswith("Depends on function prototype"):
-            return [make_data_type_node("typing.Any")]
-
-        # [Pattern] `AnyType`
-        # [Test]
-        #   File: refiner_test.py
-        #   Function: test_get_refined_data_type_for_various_patterns
-        #   Pattern: `AnyType`
-        if dtype_str.startswith("`AnyType`"):
-            return [make_data_type_node("typing.Any")]
-
-        if dtype_str in ("any", "Any type."):
-            return [make_data_type_node("typing.Any")]
-
-        # "[23][dD] [Vv]ector"
-        if dtype_str[1:].lower() == "d vector":
-            s = self._parse_custom_data_type(
-                "Vector", uniq_full_names, uniq_module_names, module_name)
-            if s:
-                return [make_data_type_node(f"`{s}`")]
-        if dtype_str == "4x4 mathutils.Matrix":
-            s = self._parse_custom_data_type(
-                "Matrix", uniq_full_names, uniq_module_names, module_name)
-            if s:
-                return [make_data_type_node(f"`{s}`")]
-
-        if REGEX_MATCH_DATA_TYPE_ENUM_IN_DEFAULT.match(dtype_str):
-            return [make_data_type_node("str"), make_data_type_node("int")]
-        # Ex: enum in ['POINT', 'EDGE', 'FACE', 'CORNER', 'CURVE', 'INSTANCE']
-        if REGEX_MATCH_DATA_TYPE_ENUM_IN.match(dtype_str):
-            return [make_data_type_node("str"), make_data_type_node("int")]
-
-        # Ex: enum set in {'KEYMAP_FALLBACK'}, (optional)
-        if REGEX_MATCH_DATA_TYPE_SET_IN.match(dtype_str):
-            return [make_data_type_node("typing.Set[str]"),
-                    make_data_type_node("typing.Set[int]")]
-
-        # Ex: enum in :ref:`rna_enum_object_modifier_type_items`, (optional)
-        if dtype_str.startswith("enum in `rna"):
-            return [make_data_type_node("str"), make_data_type_node("int")]
-
-        # Ex: Enumerated constant
-        if dtype_str == "Enumerated constant":
-            return [make_data_type_node("typing.Set[str]"),
-                    make_data_type_node("typing.Set[int]")]
-
-        # Ex: boolean, default False
-        if REGEX_MATCH_DATA_TYPE_BOOLEAN_DEFAULT.match(dtype_str):
-            return [make_data_type_node("bool")]
-        # Ex: boolean array of 3 items, (optional)
-        if REGEX_MATCH_DATA_TYPE_BOOLEAN_ARRAY_OF.match(dtype_str):
-            return [make_data_type_node("typing.List[bool]")]
-
-        if dtype_str == "boolean":
-            return [make_data_type_node("bool")]
-        if dtype_str == "bool":
-            return [make_data_type_node("bool")]
-
-        if dtype_str == "bytes":
-            return [make_data_type_node("bytes")]
-        if dtype_str.startswith("byte sequence"):
-            return [make_data_type_node("typing.Sequence[bytes]")]
-
-        if dtype_str.lower().startswith("callable"):
-            return [make_data_type_node("typing.Callable")]
-
-        if m := REGEX_MATCH_DATA_TYPE_MATHUTILS_VALUES.match(dtype_str):
-            if variable_kind in ('FUNC_ARG', 'CONST', 'CLS_ATTR'):
-                s = self._parse_custom_data_type(
-                    m.group(1), uniq_full_names, uniq_module_names,
+        self_class = None
+        if additional_info is not None:
+            self_class = additional_info.get("self_class")
+
+        # Same data type strings appear many times (ex. float in [-inf, inf],
+        # default 0.0), so the result is cached.
+        key = (dtype_str, module_name, variable_kind, self_class)
+        if key in self._refined_data_type_cache:
+            specs = self._refined_data_type_cache[key]
+        else:
+            def parse(string_to_parse: str) -> str:
+                return self._parse_custom_data_type(
+                    string_to_parse, uniq_full_names, full_names_by_relative_name,
                     module_name)
-                if s:
-                    return [make_data_type_node("typing.Sequence[float]"),
-                            make_data_type_node(f"`{s}`")]
-
-        # Ex: int array of 2 items in [-32768, 32767], default (0, 0)
-        if m := REGEX_MATCH_DATA_TYPE_NUMBER_ARRAY_OF.match(dtype_str):
-            if m.group(1) in ("int", "float"):
-                if variable_kind == 'FUNC_ARG':
-                    return [make_data_type_node(f"typing.Iterable[{m.group(1)}]")]
-                return [make_data_type_node(f"`bpy.types.bpy_prop_array`[{m.group(1)}]")]
-        # Ex: :`mathutils.Euler` rotation of 3 items in [-inf, inf],
-        #     default (0.0, 0.0, 0.0)
-        if m := REGEX_MATCH_DATA_TYPE_MATHUTILS_ARRAY_OF.match(dtype_str):
-            s = self._parse_custom_data_type(
-                m.group(1), uniq_full_names, uniq_module_names,
-                module_name)
-            if s:
-                tuple_elms = ["float"] * int(m.group(3))
-                return [
-                    make_data_type_node("typing.List[float]"),
-                    make_data_type_node(f"typing.Tuple[{', '.join(tuple_elms)}]"),
-                    make_data_type_node(f"`{s}`")
-                ]
-
-        # Ex: float triplet
-        if dtype_str == "float triplet":
-            s = self._parse_custom_data_type(
-                "mathutils.Vector", uniq_full_names, uniq_module_names,
-                module_name)
-            if s:
-                return [
-                    make_data_type_node("typing.Sequence[float]"),
-                    make_data_type_node(f"`{s}`")
-                ]
-        # Ex: int in [-inf, inf], default 0, (readonly)
-        if m := REGEX_MATCH_DATA_TYPE_NUMBER_IN.match(dtype_str):
-            return [make_data_type_node(m.group(1))]
-        if dtype_str in ("int", "float"):
-            return [make_data_type_node(dtype_str)]
-        if dtype_str in ("unsigned int", "int (boolean)"):
-            return [make_data_type_node("int")]
-        if dtype_str == "int sequence":
-            return [make_data_type_node("typing.Sequence[int]")]
-
-        # Ex: float multi-dimensional array of 3 * 3 items in [-inf, inf]
-        if m := REGEX_MATCH_DATA_TYPE_FLOAT_MULTI_DIMENSIONAL_ARRAY_OF.match(dtype_str):  # noqa # pylint: disable=C0301
-            tuple_elems = [
-                f"typing.Tuple[{', '.join(['float'] * int(m.group(1)))}]"
-            ] * int(m.group(2))
-            return [
-                make_data_type_node("typing.List[typing.List[float]]"),
-                make_data_type_node(f"typing.Tuple[{', '.join(tuple_elems)}]")
-            ]
-
-        if m := REGEX_MATCH_DATA_TYPE_MATHUTILS_MATRIX_OF.match(dtype_str):
-            s = self._parse_custom_data_type(
-                "mathutils.Matrix", uniq_full_names, uniq_module_names,
-                module_name)
-            if s:
-                tuple_elems = [
-                    f"typing.Tuple[{', '.join(['float'] * int(m.group(1)))}]"
-                ] * int(m.group(2))
-                return [
-                    make_data_type_node("typing.List[typing.List[float]]"),
-                    make_data_type_node(f"typing.Tuple[{', '.join(tuple_elems)}]"),
-                    make_data_type_node(f"`{s}`")
-                ]
-
-        if dtype_str == "double":
-            return [make_data_type_node("float")]
-        if dtype_str.startswith("double (float)"):
-            return [make_data_type_node("float")]
-
-        if REGEX_MATCH_DATA_TYPE_STRING.match(dtype_str):
-            return [make_data_type_node("str")]
-        if REGEX_MATCH_DATA_TYPE_INTEGER.match(dtype_str):
-            return [make_data_type_node("int")]
-        if dtype_str == "tuple":
-            return [make_data_type_node("typing.Tuple")]
-        if dtype_str == "sequence":
-            return [make_data_type_node("typing.Sequence")]
-
-        if dtype_str.startswith("`bgl.Buffer` "):
-            s1 = self._parse_custom_data_type(
-                "bgl.Buffer", uniq_full_names, uniq_module_names, module_name)
-            if s1:
-                return [make_data_type_node(f"`{s1}`")]
-
-        if m := REGEX_MATCH_DATA_TYPE_VALUE_BPY_PROP_COLLECTION_OF.match(dtype_str):  # noqa # pylint: disable=C0301
-            s1 = self._parse_custom_data_type(
-                m.group(1), uniq_full_names, uniq_module_names, module_name)
-            s2 = self._parse_custom_data_type(
-                m.group(2), uniq_full_names, uniq_module_names, module_name)
-            if s1 and s2:
-                return [make_data_type_node(f"`{s1}`")]
-
-        if dtype_str.startswith("set of strings"):
-            return [make_data_type_node("typing.Set[str]")]
-
-        # [Pattern] sequence of string tuples or a function
-        # [Test]
-        #   File: refiner_test.py
-        #   Function: test_get_refined_data_type_for_various_patterns
-        #   Pattern: sequence of string tuples or a function
-        if dtype_str == "sequence of string tuples or a function":
-            return [
-                make_data_type_node("typing.Iterable[typing.Iterable[str]]"),
-                make_data_type_node("typing.Callable")
-            ]
-        # Ex: sequence of bpy.types.Action
-        if m := REGEX_MATCH_DATA_TYPE_SEQUENCE_OF.match(dtype_str):
-            s = self._parse_custom_data_type(
-                m.group(1), uniq_full_names, uniq_module_names, module_name)
-            if s:
-                return [make_data_type_node(f"typing.Iterable[`{s}`]")]
-        # Ex: `bpy_prop_collection` of `ThemeStripColor`,
-        #     (readonly, never None)
-        if m := REGEX_MATCH_DATA_TYPE_BPY_PROP_COLLECTION_OF.match(dtype_str):
-            s = self._parse_custom_data_type(
-                m.group(1), uniq_full_names, uniq_module_names, module_name)
-            if s:
-                return [make_data_type_node(f"`bpy.types.bpy_prop_collection`[`{s}`]")]
-        # Ex: List of FEdge objects
-        if m := REGEX_MATCH_DATA_TYPE_LIST_OF_VALUE_OBJECTS.match(dtype_str):
-            s = self._parse_custom_data_type(
-                m.group(1), uniq_full_names, uniq_module_names, module_name)
-            if s:
-                return [make_data_type_node(f"typing.List[`{s}`]")]
-        # Ex: list of FEdge
-        if m := REGEX_MATCH_DATA_TYPE_LIST_OF_VALUE.match(dtype_str):
-            s = self._parse_custom_data_type(
-                m.group(1), uniq_full_names, uniq_module_names, module_name)
-            if s:
-                return [make_data_type_node(f"typing.List[`{s}`]")]
-        # Ex: list of ints
-        if m := REGEX_MATCH_DATA_TYPE_LIST_OF_NUMBER_OR_STRING.match(dtype_str):  # noqa # pylint: disable=C0301
-            return [make_data_type_node(f"typing.List[{m.group(2)}]")]
-        # Ex: list of (bmesh.types.BMVert)
-        if m := REGEX_MATCH_DATA_TYPE_LIST_OF_PARENTHESES_VALUE.match(dtype_str):  # noqa # pylint: disable=C0301
-            items = m.group(1).split(",")
-            dtypes = []
-            for item in items:
-                im = re.match(r"^`([a-zA-Z.]+)`$", item.strip())
-                if im:
-                    s = self._parse_custom_data_type(
-                        im.group(1), uniq_full_names, uniq_module_names,
-                        module_name)
-                    if s:
-                        dtypes.append(make_data_type_node(f"typing.List[`{s}`]"))
-            return dtypes
-        # Ex: BMElemSeq of BMEdge
-        if m := REGEX_MATCH_DATA_TYPE_BMELEMSEQ_OF_VALUE.match(dtype_str):
-            s = self._parse_custom_data_type(
-                m.group(1), uniq_full_names, uniq_module_names, module_name)
-            if s:
-                return [
-                    make_data_type_node(f"typing.List[`{s}`]"),
-                    make_data_type_node("`bmesh.types.BMElemSeq`")
-                ]
-        # Ex: tuple of mathutils.Vector's
-        if m := REGEX_MATCH_DATA_TYPE_TUPLE_OF_VALUE.match(dtype_str):
-            s = self._parse_custom_data_type(
-                m.group(1), uniq_full_names, uniq_module_names, module_name)
-            if s:
-                return [make_data_type_node(f"typing.Tuple[`{s}`]")]
 
-        # Ex: (Vector, Quaternion, Vector)
-        if m1 := REGEX_MATCH_DATA_TYPE_START_AND_END_WITH_PARENTHESES.match(dtype_str):
-            splited = m1.group(1).split(",")
-            dtypes = []
-            for sp in splited:
-                sp = sp.strip()
-                if m2 := REGEX_MATCH_DATA_TYPE_DOT_COMMA.match(sp):
-                    s = self._parse_custom_data_type(
-                        m2.group(1), uniq_full_names, uniq_module_names, module_name)
-                    if s:
-                        dtypes.append(f"`{s}`")
-            if len(dtypes) != 0:
-                elem_str = ", ".join(dtypes)
-                return [make_data_type_node(f"typing.Tuple[{elem_str}]")]
-
-        if dtype_str == "dict with string keys":
-            return [make_data_type_node("typing.Dict[str, typing.Any]")]
-        if dtype_str == "iterable object":
-            return [make_data_type_node("typing.List")]
-        if m := REGEX_MATCH_DATA_TYPE_LIST_OR_DICT_OR_SET_OR_TUPLE.match(dtype_str):  # noqa # pylint: disable=C0301
-            return [make_data_type_node(f"{m.group(1)}")]
-
-        # Ex: bpy.types.Struct subclass
-        if dtype_str == "`bpy.types.Struct` subclass":
-            s = self._parse_custom_data_type(
-                "bpy.types.Struct", uniq_full_names, uniq_module_names,
-                module_name)
-            if s:
-                return [make_data_type_node(f"`{s}`")]
+            specs = None
+            rules = DATA_TYPE_RULE_INDEX.get(
+                get_first_token(dtype_str), DATA_TYPE_RULES_FOR_ANY_TOKEN)
+            for rule in rules:
+                specs = rule(dtype_str, variable_kind, self_class, parse)
+                if specs is not None:
+                    break
+            self._refined_data_type_cache[key] = specs
 
-        if dtype_str == "`bpy_struct`":
-            s = self._parse_custom_data_type(
-                "bpy_struct", uniq_full_names, uniq_module_names, module_name)
-            if s:
-                return [make_data_type_node(f"`{s}`")]
-
-        # Ex: CLIP_OT_add_marker
-        if m := REGEX_MATCH_DATA_TYPE_OT.match(dtype_str):
-            idname = f"bpy.ops.{m.group(1).lower()}.{m.group(2)}"
-            s = self._parse_custom_data_type(
-                idname, uniq_full_names, uniq_module_names, module_name)
-            if s:
-                return [make_data_type_node(f"`{s}`")]
-
-        if m := REGEX_MATCH_DATA_TYPE_DOT.match(dtype_str):
-            s = self._parse_custom_data_type(
-                m.group(1), uniq_full_names, uniq_module_names, module_name)
-            if s:
-                return [make_data_type_node(f"`{s}`")]
-
-        if m := REGEX_MATCH_DATA_TYPE_DOT_COMMA.match(dtype_str):
-            s = self._parse_custom_data_type(
-                m.group(1), uniq_full_names, uniq_module_names, module_name)
-            if s:
-                return [make_data_type_node(f"`{s}`")]
-
-        if m := REGEX_MATCH_DATA_TYPE_NAME.match(dtype_str):
-            s = self._parse_custom_data_type(
-                m.group(0), uniq_full_names, uniq_module_names, module_name)
-            if s:
-                return [make_data_type_node(f"`{s}`")]
-
-        return None
+        if specs is None:
+            return None
+        return [make_data_type_node(spec) for spec in specs]
 
     def _get_data_type_options(self, dtype_str: str, module_name: str) -> Tuple[List[str], str]:
         if module_name.startswith("bpy."):
@@ -525,7 +754,7 @@ class DataTypeRefiner(TransformerBase):
         dtype_str = dtype_str.strip()
 
         uniq_full_names = self._entry_points_cache["uniq_full_names"]
-        uniq_module_names = self._entry_points_cache["uniq_module_names"]
+        full_names_by_relative_name = self._entry_points_cache["full_names_by_relative_name"]
 
         # Ex. (Quaternion, float) pair
         if m := REGEX_MATCH_DATA_TYPE_PAIR.match(dtype_str):
@@ -533,7 +762,7 @@ class DataTypeRefiner(TransformerBase):
             dtypes: List[DataTypeNode] = []
             for s in sp:
                 d = self._get_refined_data_type_fast(
-                    s.strip(), uniq_full_names, uniq_module_names,
+                    s.strip(), uniq_full_names, full_names_by_relative_name,
                     module_name, variable_kind, additional_info)
                 if d is not None:
                     dtypes.extend(d)
@@ -542,7 +771,7 @@ class DataTypeRefiner(TransformerBase):
                     f"typing.Tuple[{', '.join([d.astext() for d in dtypes])}]")]
 
         result = self._get_refined_data_type_fast(
-            dtype_str, uniq_full_names, uniq_module_names, module_name,
+            dtype_str, uniq_full_names, full_names_by_relative_name, module_name,
             variable_kind, additional_info)
         if result is not None:
             return result
@@ -559,7 +788,7 @@ class DataTypeRefiner(TransformerBase):
             for s in splist:
                 s = s.strip()
                 result = self._get_refined_data_type_fast(
-                    s, uniq_full_names, uniq_module_names, module_name,
+                    s, uniq_full_names, full_names_by_relative_name, module_name,
                     variable_kind, additional_info)
                 if result is not None:
                     dtypes.extend(result)
@@ -571,12 +800,12 @@ class DataTypeRefiner(TransformerBase):
             additional_info: Dict[str, typing.Any] = None) -> List[DataTypeNode]:
 
         uniq_full_names = self._entry_points_cache["uniq_full_names"]
-        uniq_module_names = self._entry_points_cache["uniq_module_names"]
+        full_names_by_relative_name = self._entry_points_cache["full_names_by_relative_name"]
 
         if description_str == "An instance of this object.":
             s = self._parse_custom_data_type(
                 additional_info["self_class"], uniq_full_names,
-                uniq_module_names, module_name)
+                full_names_by_relative_name, module_name)
             return [make_data_type_node(f"`{s}`")]
 
         return []
@@ -675,12 +904,15 @@ class DataTypeRefiner(TransformerBase):
 
     def apply(self, **kwargs):
         if self._entry_points is None:
-            self._entry_points = self._build_entry_points(self.documents)
-
-        self._entry_points_cache["uniq_full_names"] = {
-            e.fullname() for e in self._entry_points}
-        self._entry_points_cache["uniq_module_names"] = {
-            e.module for e in self._entry_points}
+            self._entry_points = build_entry_points(self.documents)
+
+        # The entry points are not changed after the first apply, so the
+        # caches are reused when this is applied to the documents one by one.
+        if not self._entry_points_cache:
+            self._entry_points_cache["uniq_full_names"] = {
+                e.fullname() for e in self._entry_points}
+            self._entry_points_cache["full_names_by_relative_name"] = \
+                build_full_names_by_relative_name(self._entry_points)
 
         for document in self.documents:
             self._refine(document)
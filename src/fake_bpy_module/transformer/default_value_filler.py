@@ -10,12 +10,13 @@ from ..analyzer.nodes import (
     DefaultValueNode,
 )
 from ..utils import find_children
+from .document_index import get_document_index
 
 
 class DefaultValueFiller(TransformerBase):
 
     def _fill(self, document: nodes.document):
-        func_nodes = document.findall(FunctionNode)
+        func_nodes = get_document_index(document).find(FunctionNode)
         for func_node in func_nodes:
             arg_list_node = func_node.element(ArgumentListNode)
             arg_nodes = find_children(arg_list_node, ArgumentNode)
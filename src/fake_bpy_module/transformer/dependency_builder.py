@@ -15,6 +15,7 @@ from ..analyzer.roles import (
     ClassRef,
 )
 from ..utils import get_first_child, find_children, append_child
+from .document_index import get_document_index
 from .utils import ModuleStructure, get_module_name, get_base_name, build_module_structure
 
 
@@ -54,8 +55,19 @@ class DependencyBuilder(TransformerBase):
 
     def _get_import_module_path(self, module_structure: ModuleStructure,
                                 data_type_1: str, data_type_2: str):
-        mod_names_full_1 = get_module_name(data_type_1, module_structure)
+        # The result depends only on the module of data_type_2.
         mod_names_full_2 = get_module_name(data_type_2, module_structure)
+        cache = module_structure.resolution_cache("import_module_path")
+        key = (data_type_1, mod_names_full_2)
+        if key not in cache:
+            cache[key] = self._get_import_module_path_internal(
+                module_structure, data_type_1, mod_names_full_2)
+        return cache[key]
+
+    def _get_import_module_path_internal(
+            self, module_structure: ModuleStructure, data_type_1: str,
+            mod_names_full_2: str):
+        mod_names_full_1 = get_module_name(data_type_1, module_structure)
         if mod_names_full_1 is None or mod_names_full_2 is None:
             return None
 
@@ -141,6 +153,7 @@ class DependencyBuilder(TransformerBase):
             self, document: nodes.document, package_structure: ModuleStructure):
 
         dependencies: List[Dependency] = []
+        index = get_document_index(document)
         module_node = get_first_child(document, ModuleNode)
         if module_node is None:
             return
@@ -149,7 +162,7 @@ class DependencyBuilder(TransformerBase):
         class_nodes = find_children(document, ClassNode)
         for class_node in class_nodes:
             class_name = class_node.element(NameNode).astext()
-            class_refs = class_node.traverse(ClassRef)
+            class_refs = index.find(ClassRef, class_node)
             for class_ref in class_refs:
                 self._add_dependency(
                     dependencies, package_structure, class_ref.to_string(),
@@ -158,7 +171,7 @@ class DependencyBuilder(TransformerBase):
         func_nodes = find_children(document, FunctionNode)
         for func_node in func_nodes:
             func_name = func_node.element(NameNode).astext()
-            class_refs = func_node.traverse(ClassRef)
+            class_refs = index.find(ClassRef, func_node)
             for class_ref in class_refs:
                 self._add_dependency(
                     dependencies, package_structure, class_ref.to_string(),
@@ -167,7 +180,7 @@ class DependencyBuilder(TransformerBase):
         data_nodes = find_children(document, DataNode)
         for data_node in data_nodes:
             data_name = data_node.element(NameNode).astext()
-            class_refs = data_node.traverse(ClassRef)
+            class_refs = index.find(ClassRef, data_node)
             for class_ref in class_refs:
                 self._add_dependency(
                     dependencies, package_structure, class_ref.to_string(),
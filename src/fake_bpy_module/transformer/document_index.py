@@ -0,0 +1,158 @@
+import contextlib
+from typing import Dict, Iterator, List, Tuple, Type, TypeVar
+from docutils import nodes
+
+from ..utils import DOCUMENT_INDEXES
+
+T = TypeVar("T", bound=nodes.Node)
+
+
+def _collect_elements(node: nodes.Element, result: List[nodes.Element]):
+    result.append(node)
+    for child in node.children:
+        if isinstance(child, nodes.Element):
+            _collect_elements(child, result)
+
+
+class _EntryElements:
+    __slots__ = ("entry", "elements", "elements_by_type", "positions")
+
+    def __init__(self, entry: nodes.Element):
+        # Hold the entry to avoid reusing its ID while it is cached.
+        self.entry: nodes.Element = entry
+        # All elements in the entry (includes entry itself) in the document
+        # order.
+        self.elements: List[nodes.Element] = []
+        _collect_elements(entry, self.elements)
+        self.elements_by_type: Dict[type, List[nodes.Element]] = {}
+        for element in self.elements:
+            self.elements_by_type.setdefault(type(element), []).append(element)
+        # Key: Type of the element, Value: (Key: ID of the element, Value:
+        # (Position in elements, Position in elements_by_type))
+        # This is built at the first replacement of the type.
+        self.positions: Dict[type, Dict[int, Tuple[int, int]]] = {}
+
+    def find(self, node_type: Type[T]) -> List[T]:
+        types = [t for t in self.elements_by_type if issubclass(t, node_type)]
+        if len(types) == 0:
+            return []
+        if len(types) == 1:
+            return self.elements_by_type[types[0]]
+        return [e for e in self.elements if isinstance(e, node_type)]
+
+    def _get_positions(self, node_type: type) -> Dict[int, Tuple[int, int]]:
+        positions = self.positions.get(node_type)
+        if positions is None:
+            positions = {}
+            i = -1
+            for j, element in enumerate(self.elements_by_type[node_type]):
+                # The elements of the same type are in the document order.
+                i = self.elements.index(element, i + 1)
+                positions[id(element)] = (i, j)
+            self.positions[node_type] = positions
+        return positions
+
+    def replace(self, from_node: nodes.Element, to_node: nodes.Element) -> bool:
+        # Only the node which has no child elements can be replaced in place
+        # by the same type of node.
+        if type(from_node) is not type(to_node):
+            return False
+        for node in (from_node, to_node):
+            if any(isinstance(c, nodes.Element) for c in node.children):
+                return False
+        if type(from_node) not in self.elements_by_type:
+            return False
+        positions = self._get_positions(type(from_node))
+        position = positions.get(id(from_node))
+        if position is None or self.elements[position[0]] is not from_node:
+            return False
+        del positions[id(from_node)]
+        self.elements[position[0]] = to_node
+        self.elements_by_type[type(to_node)][position[1]] = to_node
+        positions[id(to_node)] = position
+        return True
+
+
+class DocumentIndex:
+    # Index of the nodes in the document to avoid traversing the whole
+    # document by each transformer.
+    # The nodes are indexed by each top level node (entry), and the index of
+    # the entry is built when it is queried at first. The changes made by
+    # append_child(), replace_child() and the methods of the nodes
+    # (append_child(), replace_node() and remove()) are notified while the
+    # index is shared by share_document_indexes(). The changes made by the
+    # methods of docutils (ex. insert(), remove() and +=) are not notified,
+    # so they must not be used while the index is shared.
+
+    def __init__(self, document: nodes.document):
+        self.document: nodes.document = document
+        # Key: ID of the entry
+        self._entries: Dict[int, _EntryElements] = {}
+
+    def _get_entry_elements(self, entry: nodes.Element) -> _EntryElements:
+        elements = self._entries.get(id(entry))
+        if elements is None:
+            elements = _EntryElements(entry)
+            self._entries[id(entry)] = elements
+        return elements
+
+    def find(self, node_type: Type[T], entry: nodes.Element = None) -> List[T]:
+        # Same as entry.findall(node_type) (document.findall(node_type) if
+        # entry is None), but the returned list must not be modified.
+        if entry is not None:
+            if entry.parent is not self.document:
+                return list(entry.findall(node_type))
+            return self._get_entry_elements(entry).find(node_type)
+
+        result: List[T] = []
+        if isinstance(self.document, node_type):
+            result.append(self.document)
+        for child in self.document.children:
+            if isinstance(child, nodes.Element):
+                result.extend(self._get_entry_elements(child).find(node_type))
+        return result
+
+    def on_changed(self, entry: nodes.Element):
+        if entry is None:
+            return
+        self._entries.pop(id(entry), None)
+
+    def on_replaced(self, entry: nodes.Element, from_node: nodes.Node,
+                    to_node: nodes.Node):
+        if entry is None:
+            return
+        if entry is to_node:
+            self._entries.pop(id(from_node), None)
+            return
+        elements = self._entries.get(id(entry))
+        if elements is not None and not elements.replace(from_node, to_node):
+            self._entries.pop(id(entry))
+
+
+def get_document_index(document: nodes.document) -> DocumentIndex:
+    # The index is shared only while share_document_indexes() is active.
+    # Otherwise, the new index is returned.
+    if id(document) not in DOCUMENT_INDEXES:
+        return DocumentIndex(document)
+
+    index = DOCUMENT_INDEXES[id(document)]
+    if index is None:
+        index = DocumentIndex(document)
+        DOCUMENT_INDEXES[id(document)] = index
+    return index
+
+
+@contextlib.contextmanager
+def share_document_indexes(documents: List[nodes.document]) -> Iterator[None]:
+    # The index is built when it is needed at first, and maintained until
+    # the end of this context.
+    shared: List[Tuple[int, nodes.document]] = []
+    for document in documents:
+        if id(document) not in DOCUMENT_INDEXES:
+            DOCUMENT_INDEXES[id(document)] = None
+            shared.append((id(document), document))
+    try:
+        yield
+    finally:
+        for document_id, _ in shared:
+            DOCUMENT_INDEXES.pop(document_id, None)
@@ -1,9 +1,11 @@
-from typing import List
+from typing import Dict, List, Tuple, TypeVar
 from docutils import nodes
-from docutils.core import publish_doctree
 
 from .transformer_base import TransformerBase
 from .base_class_fixture import BaseClassFixture
+from .. import config
+from ..cache import DocumentCache, get_parsing_salts
+from ..analyzer.parsing_session import ParsingSession
 from ..analyzer.nodes import (
     ModuleNode,
     DataNode,
@@ -22,68 +24,59 @@ from ..analyzer.nodes import (
 )
 from ..utils import get_first_child, append_child, find_children
 
+NodeT = TypeVar("NodeT", FunctionNode, ClassNode)
+
 
 class ModApplier(TransformerBase):
 
     def get_mod_documents(self) -> List[nodes.document]:
         return self.mod_documents
 
-    def _mod_append_function(self, func_nodes: List[FunctionNode],
+    @staticmethod
+    def _build_name_index(nodes_: List[NodeT]) -> Dict[str, List[NodeT]]:
+        # Key: Name, Value: Nodes which have the name (in the document order)
+        index: Dict[str, List[NodeT]] = {}
+        for node in nodes_:
+            index.setdefault(node.element(NameNode).astext(), []).append(node)
+        return index
+
+    @staticmethod
+    def _mod_append_arguments_and_return(func_node: FunctionNode, mod_func_node: FunctionNode):
+        arg_list_node = func_node.element(ArgumentListNode)
+        mod_arg_list_node = mod_func_node.element(ArgumentListNode)
+        for mod_arg_node in find_children(mod_arg_list_node, ArgumentNode):
+            arg_list_node.append_child(mod_arg_node)
+
+        mod_return_node = mod_func_node.element(FunctionReturnNode)
+        return_node = func_node.element(FunctionReturnNode)
+        if not mod_return_node.empty() and return_node.empty():
+            func_node.replace_node(mod_return_node)
+
+    def _mod_append_function(self, func_index: Dict[str, List[FunctionNode]],
                              mod_func_nodes: List[FunctionNode]):
         for mod_func_node in mod_func_nodes:
-            mod_func_name_node = mod_func_node.element(NameNode)
-            mod_arg_list_node = mod_func_node.element(ArgumentListNode)
-            mod_arg_nodes = find_children(mod_arg_list_node, ArgumentNode)
-            mod_return_node = mod_func_node.element(FunctionReturnNode)
-            for func_node in func_nodes:
-                func_name_node = func_node.element(NameNode)
-                if func_name_node.astext() == mod_func_name_node.astext():
-
-                    arg_list_node = func_node.element(ArgumentListNode)
-                    for mod_arg_node in mod_arg_nodes:
-                        arg_list_node.append_child(mod_arg_node)
-
-                    return_node = func_node.element(FunctionReturnNode)
-                    if not mod_return_node.empty() and return_node.empty():
-                        func_node.replace_node(mod_return_node)
-                    break
-
-    # pylint: disable=R0914
-    def _mod_append_class(self, class_nodes: List[ClassNode], mod_class_nodes: List[ClassNode]):
-        for mod_class_node in mod_class_nodes:
-            mod_class_name_node = mod_class_node.element(NameNode)
-            mod_class_name = mod_class_name_node.astext()
+            func_nodes = func_index.get(mod_func_node.element(NameNode).astext())
+            if func_nodes:
+                # Only the first function which has the same name is modified.
+                self._mod_append_arguments_and_return(func_nodes[0], mod_func_node)
 
-            for class_node in class_nodes:
-                class_name_node = class_node.element(NameNode)
-                class_name = class_name_node.astext()
-                if class_name != mod_class_name:
-                    continue
+    def _mod_append_class(self, class_index: Dict[str, List[ClassNode]],
+                          mod_class_nodes: List[ClassNode]):
+        for mod_class_node in mod_class_nodes:
+            mod_class_name = mod_class_node.element(NameNode).astext()
 
+            for class_node in class_index.get(mod_class_name, []):
                 func_list_node = class_node.element(FunctionListNode)
                 mod_func_list_node = mod_class_node.element(FunctionListNode)
-                func_nodes = find_children(func_list_node, FunctionNode)
+                func_index = self._build_name_index(
+                    find_children(func_list_node, FunctionNode))
                 mod_func_nodes = find_children(mod_func_list_node, FunctionNode)
 
                 # Append functions.
                 for mod_func_node in mod_func_nodes:
-                    mod_func_name_node = mod_func_node.element(NameNode)
-                    mod_arg_list_node = mod_func_node.element(ArgumentListNode)
-                    mod_arg_nodes = find_children(mod_arg_list_node, ArgumentNode)
-                    mod_return_node = mod_func_node.element(FunctionReturnNode)
-                    for func_node in func_nodes:
-                        func_name_node = func_node.element(NameNode)
-                        if func_name_node.astext() != mod_func_name_node.astext():
-                            continue
-
-                        arg_list_node = func_node.element(ArgumentListNode)
-                        for mod_arg_node in mod_arg_nodes:
-                            arg_list_node.append_child(mod_arg_node)
-
-                        return_node = func_node.element(FunctionReturnNode)
-                        if not mod_return_node.empty() and return_node.empty():
-                            func_node.replace_node(mod_return_node)
-                        break
+                    func_nodes = func_index.get(mod_func_node.element(NameNode).astext())
+                    if func_nodes:
+                        self._mod_append_arguments_and_return(func_nodes[0], mod_func_node)
                     else:
                         func_list_node.append_child(mod_func_node)
 
@@ -104,14 +97,54 @@ class ModApplier(TransformerBase):
     def __init__(self, documents: List[nodes.document], **kwargs):
         super().__init__(documents, **kwargs)
         self.mod_files = kwargs["mod_files"]
+        # Copies of the mod documents are kept only when get_mod_documents()
+        # is used.
+        self.keep_mod_documents = kwargs.get("keep_mod_documents", True)
+        # Mod files which append to the module not in the documents are
+        # skipped instead of raising the error.
+        self.skip_missing_modules = kwargs.get("skip_missing_modules", False)
         self.mod_documents = []
 
+        # Mod documents after BaseClassFixture is applied are cached by the
+        # contents of the mod file.
+        self._cache: DocumentCache = None
+        if config.get_cache_dir() is not None:
+            self._cache = DocumentCache(
+                config.get_cache_dir(), "mod_applier", get_parsing_salts())
+
+        # Built at the first time when the mod file is parsed.
+        self._parsing_session: ParsingSession = None
+
+    def _load_mod_document(self, file: str) -> nodes.document:
+        with open(file, "r", encoding="utf-8") as f:
+            contents = f.read()
+
+        cache_key: str = None
+        if self._cache is not None:
+            cache_key = self._cache.make_key(contents)
+            mod_document = self._cache.load(cache_key)
+            if mod_document is not None:
+                return mod_document
+
+        if self._parsing_session is None:
+            self._parsing_session = ParsingSession()
+        mod_document: nodes.document = self._parsing_session.parse(contents)
+        fixture = BaseClassFixture([mod_document])
+        fixture.apply()
+
+        if self._cache is not None:
+            self._cache.store(cache_key, mod_document)
+
+        return mod_document
+
     @classmethod
     def name(cls) -> str:
         return "mod_applier"
 
     def apply(self, **kwargs):
         self.mod_documents = []
+        # Key: Module name, Value: Mod files applied to the module
+        self.outputs["mod_files"] = {}
 
         if self.mod_files is None:
             return
@@ -125,20 +158,21 @@ class ModApplier(TransformerBase):
             module_name_node = module_node.element(NameNode)
             module_name_to_document[module_name_node.astext()] = document
 
+        # Indexes of the functions and classes in the document by name.
+        # They are built at the first time when the module is appended.
+        # Key: Module name, Value: (Function index, Class index)
+        document_indexes: Dict[str, Tuple[Dict[str, List[FunctionNode]],
+                                          Dict[str, List[ClassNode]]]] = {}
+
         for file in self.mod_files:
-            with open(file, "r", encoding="utf-8") as f:
-                contents = f.read()
-
-            settings_overrides = {
-                "exit_status_level": 2,
-                "halt_level": 2,
-                "line_length_limit": 20000,
-            }
-            mod_document: nodes.document = publish_doctree(
-                contents, settings_overrides=settings_overrides)
-            fixture = BaseClassFixture([mod_document])
-            fixture.apply()
-            self.mod_documents.append(mod_document.deepcopy())
+            mod_document = self._load_mod_document(file)
+            if self.keep_mod_documents:
+                self.mod_documents.append(mod_document.deepcopy())
+
+            mod_module_node = get_first_child(mod_document, ModuleNode)
+            if mod_module_node is not None:
+                mod_module_name = mod_module_node.element(NameNode).astext()
+                self.outputs["mod_files"].setdefault(mod_module_name, []).append(file)
 
             mod_type_node = get_first_child(mod_document, ModTypeNode)
             if mod_type_node.astext() == "new":
@@ -157,6 +191,8 @@ class ModApplier(TransformerBase):
                     mod_class_nodes = find_children(mod_document, ClassNode)
                     for mod_class_node in mod_class_nodes:
                         append_child(document, mod_class_node.deepcopy())
+                    # Rebuild the indexes because new nodes are added.
+                    document_indexes.pop(mod_module_name, None)
                 else:   # If the module is not found, add whole document.
                     mod_type_nodes = mod_document.findall(ModTypeNode)
                     for mod_type_node in mod_type_nodes:
@@ -171,18 +207,21 @@ class ModApplier(TransformerBase):
                 mod_module_name = mod_module_name_node.astext()
                 if mod_module_name in module_name_to_document:
                     document = module_name_to_document[mod_module_name]
+                    if mod_module_name not in document_indexes:
+                        document_indexes[mod_module_name] = (
+                            self._build_name_index(find_children(document, FunctionNode)),
+                            self._build_name_index(find_children(document, ClassNode)))
+                    func_index, class_index = document_indexes[mod_module_name]
 
                     # For functions, support only appending arguments and return.
-                    func_nodes = find_children(document, FunctionNode)
                     mod_func_nodes = find_children(mod_document, FunctionNode)
-                    self._mod_append_function(func_nodes, mod_func_nodes)
+                    self._mod_append_function(func_index, mod_func_nodes)
 
                     # For classes, support appending functions, attributes, and base-classes.
                     # For methods, support appending arguments and return.
-                    class_nodes = find_children(document, ClassNode)
                     mod_class_nodes = find_children(mod_document, ClassNode)
-                    self._mod_append_class(class_nodes, mod_class_nodes)
-                else:
+                    self._mod_append_class(class_index, mod_class_nodes)
+                elif not self.skip_missing_modules:
                     raise ValueError(f"Modules to be appended are not found {mod_module_name}")
             else:
                 raise NotImplementedError(f"ModTypeNode does not support {mod_type_node.astext()}")
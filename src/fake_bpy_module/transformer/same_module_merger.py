@@ -1,13 +1,12 @@
 from typing import List
 from docutils import nodes
-from docutils.core import publish_doctree
 
 from .transformer_base import TransformerBase
 from ..analyzer.nodes import (
     ModuleNode,
     NameNode,
 )
-from ..utils import get_first_child, append_child
+from ..utils import get_first_child, append_child, new_document
 
 
 class SameModuleMerger(TransformerBase):
@@ -27,7 +26,7 @@ class SameModuleMerger(TransformerBase):
         # Combine document by the same module document.
         results: List[nodes.document] = []
         for module_name, docs in module_to_documents.items():
-            new_doc: nodes.document = publish_doctree("")
+            new_doc: nodes.document = new_document()
             for doc in docs:
                 for child in doc.children[:]:
                     if isinstance(child, ModuleNode):
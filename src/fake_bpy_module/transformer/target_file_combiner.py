@@ -1,17 +1,17 @@
 import re
 from typing import List, Dict
 from docutils import nodes
-from docutils.core import publish_doctree
 
 from .transformer_base import TransformerBase
 from ..analyzer.nodes import (
     ModuleNode,
     NameNode,
+    SourceFilenameNode,
     TargetFileNode,
     ChildModuleListNode,
     ChildModuleNode,
 )
-from ..utils import get_first_child, append_child
+from ..utils import get_first_child, append_child, new_document
 from .utils import ModuleStructure, build_module_structure
 
 
@@ -107,10 +107,13 @@ class TargetFileCombiner(TransformerBase):
             info.documents.append(document)
 
         # Combine document by the same targets.
+        # Input files which contribute to each target file are also recorded
+        # for the incremental generation.
         results: List[nodes.document] = []
+        input_files: Dict[str, List[str]] = {}
         for mod_name in gen_info.modules():
             info = gen_info.get(mod_name)
-            new_doc: nodes.document = publish_doctree("")
+            new_doc: nodes.document = new_document()
 
             append_child(new_doc, TargetFileNode(text=info.target_filename))
 
@@ -131,12 +134,16 @@ class TargetFileCombiner(TransformerBase):
                             found_module_node = True
                     else:
                         append_child(new_doc, child)
+            input_files[info.target_filename] = sorted({
+                n.astext() for n in new_doc.children
+                if isinstance(n, SourceFilenameNode)})
             if not found_module_node:
                 module_node = ModuleNode()
                 module_node.append_child(NameNode(text=mod_name))
                 append_child(new_doc, module_node)
 
             results.append(new_doc)
+        self.outputs["input_files"] = input_files
 
         return results
 
@@ -1,4 +1,5 @@
-from typing import List
+import gc
+from typing import Iterator, List, Tuple
 from docutils import nodes
 
 from .transformer_base import TransformerBase
@@ -9,9 +10,10 @@ from .bpy_ops_override_parameters_adder import BpyOpsOverrideParameterAdder
 from .bpy_types_class_base_class_rebaser import BpyTypesClassBaseClassRebaser
 from .cannonical_data_type_rewriter import CannonicalDataTypeRewriter
 from .code_document_refiner import CodeDocumentRefiner
-from .data_type_refiner import DataTypeRefiner
+from .data_type_refiner import DataTypeRefiner, EntryPoint, build_entry_points
 from .default_value_filler import DefaultValueFiller
 from .dependency_builder import DependencyBuilder
+from .document_index import share_document_indexes
 from .format_validator import FormatValidator
 from .mod_applier import ModApplier
 from .module_level_attribute_fixture import ModuleLevelAttributeFixture
@@ -20,10 +22,27 @@ from .rst_specific_node_cleaner import RstSpecificNodeCleaner
 from .same_module_merger import SameModuleMerger
 from .target_file_combiner import TargetFileCombiner
 from .first_title_remover import FirstTitleRemover
+from .utils import ModuleStructure, build_module_structure
+from .. import config
+from ..analyzer.nodes import ModuleNode, NameNode
+from ..manifest import GenerationManifest
+from ..profiler import profile_stage
+from ..utils import get_first_child, is_selected_module, output_log, LOG_LEVEL_WARN
 
 
-def transform(documents: List[nodes.document], mod_files: List[str]) -> List[nodes.document]:
-    t = Transformer([
+# Modules which must be analyzed together with the key module, because the
+# transformers move the contents between them.
+# (ex. BpyContextVariableConverter moves the data of bpy.context to the
+#  attributes of bpy.types.Context, and adds bpy.context to bpy)
+_REQUIRED_MODULES = {
+    "bpy.types": ["bpy", "bpy.context"],
+}
+
+
+def _create_global_transformer(mod_files: List[str],
+                               skip_missing_modules: bool) -> 'Transformer':
+    # Transformers which need all documents to be processed.
+    return Transformer([
         "module_name_fixture",
         "first_title_remover",
         "base_class_fixture",
@@ -41,6 +60,97 @@ def transform(documents: List[nodes.document], mod_files: List[str]) -> List[nod
 
         # Must after mod_applier
         "target_file_combiner",
+    ], {
+        "mod_applier": {
+            "mod_files": mod_files,
+            "keep_mod_documents": False,
+            "skip_missing_modules": skip_missing_modules,
+        }
+    })
+
+
+def select_module_files(rst_files: List[str], documents: List[nodes.document],
+                        modules: List[str]) -> List[str]:
+    # Select the files which declare the modules from the prescanned documents.
+    # The files of the required modules are also selected.
+    required_modules = []
+    for module, modules_to_add in _REQUIRED_MODULES.items():
+        if is_selected_module(module, modules):
+            required_modules.extend(modules_to_add)
+
+    selected_files = []
+    for filename, document in zip(rst_files, documents):
+        # Documents which are removed by ModuleNameFixture are not generated.
+        # The fixture is applied to the new list so that the caller's list is
+        # not changed. It may add the module to the document, but applying it
+        # again (ex. by build_global_info) does not change the document.
+        target = [document]
+        ModuleNameFixture(target).apply()
+        if not target:
+            continue
+        module_name = get_first_child(document, ModuleNode).element(NameNode).astext()
+        if is_selected_module(module_name, modules) or module_name in required_modules:
+            selected_files.append(filename)
+
+    if not selected_files:
+        output_log(LOG_LEVEL_WARN, f"No files declare the modules {', '.join(modules)}")
+
+    return selected_files
+
+
+def build_global_info(
+        documents: List[nodes.document],
+        mod_files: List[str]) -> Tuple[List[EntryPoint], ModuleStructure]:
+    # The global information depends only on the names of the modules,
+    # classes, functions and data, so it can be built from the prescanned
+    # documents (see analyzer.prescan) instead of the full documents.
+    documents = _create_global_transformer(mod_files, False).transform(documents)
+
+    return build_entry_points(documents), build_module_structure(documents)
+
+
+def _transform_global(
+        documents: List[nodes.document], mod_files: List[str],
+        manifest: GenerationManifest,
+        global_info: Tuple[List[EntryPoint], ModuleStructure]
+) -> Tuple[List[nodes.document], 'Transformer']:
+    modules = config.get_modules()
+    if modules is not None and global_info is None:
+        raise RuntimeError("Global information built from all files is "
+                           "required to transform the selected modules")
+
+    # Only the files of the selected modules are analyzed, so the mod files
+    # may append to the modules which are not analyzed.
+    t = _create_global_transformer(mod_files, modules is not None)
+    documents = t.transform(documents)
+
+    # The global information is built from all documents here, so the rest
+    # of transformers can be applied to the part of documents.
+    if global_info is None:
+        package_structure = build_module_structure(documents)
+        entry_points = build_entry_points(documents)
+    else:
+        entry_points, package_structure = global_info
+
+    # The documents of the modules which are not selected are used only by
+    # the transformers above.
+    if modules is not None:
+        documents = [
+            doc for doc in documents
+            if is_selected_module(
+                get_first_child(doc, ModuleNode).element(NameNode).astext(),
+                modules)]
+
+    if manifest is not None:
+        outputs = {tr.name(): tr.get_outputs() for tr in t.get_transformers()}
+        documents = manifest.filter_changed_documents(
+            documents,
+            manifest.compute_global_digest(entry_points, package_structure),
+            outputs[TargetFileCombiner.name()]["input_files"],
+            outputs[ModApplier.name()]["mod_files"])
+
+    # Transformers which can be applied to each document.
+    t = Transformer([
         "data_type_refiner",
 
         # Must after data_type_refiner
@@ -49,15 +159,40 @@ def transform(documents: List[nodes.document], mod_files: List[str]) -> List[nod
         "dependency_builder",
         "code_document_refiner",
     ], {
-        "mod_applier": {
-            "mod_files": mod_files
-        }
+        "data_type_refiner": {
+            "entry_points": entry_points,
+        },
+        "cannonical_data_type_rewriter": {
+            "package_structure": package_structure,
+        },
+        "dependency_builder": {
+            "package_structure": package_structure,
+        },
     })
+
+    return documents, t
+
+
+def transform(documents: List[nodes.document], mod_files: List[str],
+              manifest: GenerationManifest = None,
+              global_info: Tuple[List[EntryPoint], ModuleStructure] = None
+              ) -> List[nodes.document]:
+    documents, t = _transform_global(documents, mod_files, manifest, global_info)
     documents = t.transform(documents)
 
     return documents
 
 
+def transform_streaming(documents: List[nodes.document], mod_files: List[str],
+                        manifest: GenerationManifest = None,
+                        global_info: Tuple[List[EntryPoint], ModuleStructure] = None
+                        ) -> Iterator[nodes.document]:
+    # Only the documents which are not yielded yet are kept in memory, so the
+    # caller should release the yielded document before the next one.
+    documents, t = _transform_global(documents, mod_files, manifest, global_info)
+    return t.transform_each(documents)
+
+
 class Transformer:
     def __init__(self, transform_kinds: List[str], parameters: dict = None):
         self.transform_kinds: List[str] = transform_kinds
@@ -69,8 +204,8 @@ class Transformer:
     def get_transformers(self) -> List[TransformerBase]:
         return self.transformers
 
-    def transform(self, documents: List[nodes.document],
-                  parameters: dict = None):
+    def _create_transformer(self, kind: str,
+                            documents: List[nodes.document]) -> TransformerBase:
         transformer_specs = {
             BaseClassFixture.name(): {
                 "class": BaseClassFixture,
@@ -128,19 +263,62 @@ class Transformer:
             },
         }
 
+        spec = transformer_specs[kind]
+        init_params = {}
+        if kind in self.init_parameters:
+            init_params = self.init_parameters[kind]
+        transformer_class = spec["class"]
+
+        return transformer_class(documents, **init_params)
+
+    def transform(self, documents: List[nodes.document],
+                  parameters: dict = None):
         self.transformers = []
-        for kind in self.transform_kinds:
-            spec = transformer_specs[kind]
-            init_params = {}
-            if kind in self.init_parameters:
-                init_params = self.init_parameters[kind]
-            apply_params = {}
-            if parameters is not None:
-                if kind in parameters:
-                    apply_params = parameters[kind]
-            transformer_class = spec["class"]
-            transformer = transformer_class(documents, **init_params)
-            transformer.apply(**apply_params)
-            self.transformers.append(transformer)
+        with share_document_indexes(documents):
+            for kind in self.transform_kinds:
+                apply_params = {}
+                if parameters is not None:
+                    if kind in parameters:
+                        apply_params = parameters[kind]
+                with profile_stage("transformer", kind, documents):
+                    transformer = self._create_transformer(kind, documents)
+                    transformer.apply(**apply_params)
+                self.transformers.append(transformer)
 
         return documents
+
+    def transform_each(self, documents: List[nodes.document],
+                       parameters: dict = None) -> Iterator[nodes.document]:
+        # Transformers are created only once and applied to one document at a
+        # time. The document is removed from the list before it is yielded,
+        # so it can be released after the caller uses it.
+        target: List[nodes.document] = []
+        self.transformers = [self._create_transformer(kind, target)
+                             for kind in self.transform_kinds]
+
+        # The nodes of the released document refer to each other, so they are
+        # freed only by the full garbage collection. It runs when a quarter of
+        # the remaining nodes are released, so the total cost is a few times
+        # of the single collection.
+        documents.reverse()
+        num_nodes = [sum(1 for _ in doc.findall()) for doc in documents]
+        num_remaining_nodes = sum(num_nodes)
+        num_released_nodes = 0
+        while documents:
+            target.clear()
+            target.append(documents.pop())
+            with share_document_indexes(target):
+                for transformer in self.transformers:
+                    apply_params = {}
+                    if parameters is not None:
+                        if transformer.name() in parameters:
+                            apply_params = parameters[transformer.name()]
+                    transformer.apply(**apply_params)
+            yield target[0]
+
+            target.clear()
+            num_released_nodes += num_nodes[-1]
+            num_remaining_nodes -= num_nodes.pop()
+            if num_released_nodes * 4 >= num_remaining_nodes + num_released_nodes:
+                gc.collect()
+                num_released_nodes = 0
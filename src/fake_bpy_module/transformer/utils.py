@@ -1,4 +1,4 @@
-from typing import List
+from typing import Dict, List, Tuple
 from docutils import nodes
 
 from ..analyzer.nodes import (
@@ -12,6 +12,16 @@ class ModuleStructure:
     def __init__(self):
         self._name: str = None
         self._children: List['ModuleStructure'] = []
+        self._parent: 'ModuleStructure' = None
+
+        # Built lazily and invalidated when the structure is changed.
+        # Key: Module name relative to this structure (ex. module_1.submodule_1)
+        self._index: Dict[str, 'ModuleStructure'] = None
+        # Key: Data type, Value: Result of get_module_name
+        self._module_name_cache: Dict[str, str] = {}
+        # Key: Name of the resolution (ex. generation_data_type),
+        # Value: (Key: Data type and module, Value: Resolved result)
+        self._resolution_caches: Dict[str, Dict[Tuple[str, str], str]] = {}
 
     @property
     def name(self) -> str:
@@ -23,13 +33,57 @@ class ModuleStructure:
     @name.setter
     def name(self, value: str):
         self._name = value
+        if self._parent is not None:
+            self._parent.invalidate()
 
     def add_child(self, child: 'ModuleStructure'):
+        child._parent = self    # pylint: disable=W0212
         self._children.append(child)
+        self.invalidate()
 
     def children(self) -> List['ModuleStructure']:
         return self._children
 
+    def invalidate(self):
+        structure = self
+        while structure is not None:
+            structure._index = None     # pylint: disable=W0212
+            structure._module_name_cache = {}   # pylint: disable=W0212
+            structure._resolution_caches = {}   # pylint: disable=W0212
+            structure = structure._parent   # pylint: disable=W0212
+
+    def _build_index(self) -> Dict[str, 'ModuleStructure']:
+        index: Dict[str, 'ModuleStructure'] = {}
+
+        def build(prefix: str, structure: 'ModuleStructure'):
+            for child in structure.children():
+                name = child.name if prefix is None else f"{prefix}.{child.name}"
+                # Same as the linear search, the first child is used when
+                # there are children with the same name.
+                if name in index:
+                    continue
+                index[name] = child
+                build(name, child)
+
+        build(None, self)
+
+        return index
+
+    def find(self, module_name: str) -> 'ModuleStructure':
+        if self._index is None:
+            self._index = self._build_index()
+        return self._index.get(module_name)
+
+    def module_name_cache(self) -> Dict[str, str]:
+        return self._module_name_cache
+
+    def resolution_cache(self, name: str) -> Dict[Tuple[str, str], str]:
+        # The results which are resolved from the data type and the module
+        # with this structure are shared by the transformers.
+        if name not in self._resolution_caches:
+            self._resolution_caches[name] = {}
+        return self._resolution_caches[name]
+
     def to_dict(self) -> dict:
         def to_dict_internal(c: List[dict], psc: List['ModuleStructure']):
             for p in psc:
@@ -44,20 +98,6 @@ class ModuleStructure:
 
 
 def build_module_structure(documents: List[nodes.document]) -> 'ModuleStructure':
-    def build(mod_name: str, structure_: ModuleStructure):
-        sp = mod_name.split(".")
-        for i in structure_.children():
-            if i.name == sp[0]:
-                item = i
-                break
-        else:
-            item = ModuleStructure()
-            item.name = sp[0]
-            structure_.add_child(item)
-        if len(sp) >= 2:
-            s = ".".join(sp[1:])
-            build(s, item)
-
     # Collect modules.
     modules = []
     for document in documents:
@@ -69,8 +109,20 @@ def build_module_structure(documents: List[nodes.document]) -> 'ModuleStructure'
 
     # Build module structure.
     structure = ModuleStructure()
+    # Key: Module name (ex. module_1.submodule_1)
+    structures: Dict[str, ModuleStructure] = {}
     for m in modules:
-        build(m, structure)
+        parent = structure
+        sp = m.split(".")
+        for i, name in enumerate(sp):
+            mod_name = ".".join(sp[:i + 1])
+            item = structures.get(mod_name)
+            if item is None:
+                item = ModuleStructure()
+                item.name = name
+                parent.add_child(item)
+                structures[mod_name] = item
+            parent = item
     return structure
 
 
@@ -86,21 +138,14 @@ def get_module_name(data_type: str, module_structure: ModuleStructure) -> str:
     if data_type is None:
         return None
 
-    module_names = data_type.split(".")[:-1]
-
-    def search(
-            mod_names, structure: ModuleStructure, dtype: str,
-            is_first_level: bool = False):
-        if len(mod_names) == 0:
-            return dtype
-        for s in structure.children():
-            if s.name != mod_names[0]:
-                continue
-            if is_first_level:
-                return search(mod_names[1:], s, s.name)
-            return search(mod_names[1:], s, dtype + "." + s.name)
-        return ""
+    cache = module_structure.module_name_cache()
+    if data_type in cache:
+        return cache[data_type]
 
-    relative_type = search(module_names, module_structure, "", True)
+    module_name = data_type[:data_type.rfind(".")] if "." in data_type else ""
+    result = None
+    if module_name != "" and module_structure.find(module_name) is not None:
+        result = module_name
+    cache[data_type] = result
 
-    return relative_type if relative_type != "" else None
+    return result
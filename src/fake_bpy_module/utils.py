@@ -1,10 +1,13 @@
 import os
 import re
-from typing import List, TypeVar, Type
-from docutils import nodes
+from typing import Any, Dict, List, Optional, Tuple, TypeVar, Type
+from docutils import nodes, frontend
+from docutils.parsers.rst import Parser
+from docutils.utils import new_document as docutils_new_document
 
 
 _ARG_LIST_WITH_BRACE_REGEX = re.compile(r"^\[([a-zA-Z0-9_,]+)\]$")
+_BRACKET_OR_COMMA_REGEX = re.compile(r"[(){}\[\],]")
 
 T = TypeVar("T", bound=nodes.Node)
 
@@ -16,6 +19,18 @@ LOG_LEVEL_ERR = 4
 
 LOG_LEVEL = LOG_LEVEL_WARN
 
+# Settings of the empty document. This is built at the first call of
+# new_document() because building the settings is expensive.
+_DOCUMENT_SETTINGS: frontend.Values = None
+
+# Key: ID of the document, Value: Index of the document which is notified of
+# the changes by append_child(), replace_child() and the methods of the nodes
+# (See transformer/document_index.py).
+# The changes made by the methods of docutils (ex. insert(), remove() and +=)
+# are not notified, so the index becomes stale if they are used on the
+# document while the index is shared.
+DOCUMENT_INDEXES: Dict[int, Any] = {}
+
 
 def check_os():
     if os.name == "nt":
@@ -53,16 +68,67 @@ def get_first_child(node: nodes.Node, node_type: Type[T]) -> T:
     return None
 
 
+def is_selected_module(module_name: str, modules: List[str]) -> bool:
+    # The submodules of the selected module are also selected.
+    return any(module_name == m or module_name.startswith(f"{m}.")
+               for m in modules)
+
+
+def new_document() -> nodes.document:
+    # Cheaper than publish_doctree("") which parses an empty string with
+    # the whole docutils machinery.
+    # pylint: disable=W0603
+    global _DOCUMENT_SETTINGS
+    if _DOCUMENT_SETTINGS is None:
+        _DOCUMENT_SETTINGS = frontend.get_default_settings(Parser)
+    return docutils_new_document("<string>", _DOCUMENT_SETTINGS)
+
+
+def _find_document_index(node: nodes.Node) -> Tuple[Any, Optional[nodes.Node]]:
+    # Returns the index of the document which the node belongs to, and the
+    # top level node which contains the node.
+    entry = None
+    while node.parent is not None:
+        entry = node
+        node = node.parent
+    return DOCUMENT_INDEXES.get(id(node)), entry
+
+
+def notify_child_changed(node: nodes.Node):
+    if not DOCUMENT_INDEXES:
+        return
+    index, entry = _find_document_index(node)
+    if index is not None:
+        index.on_changed(entry)
+
+
+def notify_child_replaced(from_node: nodes.Node, to_node: nodes.Node):
+    if not DOCUMENT_INDEXES:
+        return
+    index, entry = _find_document_index(to_node)
+    if index is not None:
+        index.on_replaced(entry, from_node, to_node)
+
+
 def append_child(node: nodes.Node, item: nodes.Node) -> nodes.Node:
     node.insert(len(node.children), item)
+    notify_child_changed(item)
     return item
 
 
+def replace_child(from_node: nodes.Node, to_node: nodes.Node) -> nodes.Node:
+    parent = from_node.parent
+    index = parent.index(from_node)
+    parent.remove(from_node)
+    parent.insert(index, to_node)
+    notify_child_replaced(from_node, to_node)
+    return to_node
+
+
 # pylint: disable=R0912,R0915
 def split_string_by_comma(line: str) -> list:
     level = 0
     splited = []
-    current = ""
     line_to_parse = line
 
     # Handle case "arg1[, arg2]" -> "arg1, arg2"
@@ -81,7 +147,11 @@ def split_string_by_comma(line: str) -> list:
     if m:
         line_to_parse = f"{m.group(1)}"
 
-    for c in line_to_parse:
+    # Only the brackets and commas are visited, and the arguments are sliced
+    # from the line.
+    start = 0
+    for m in _BRACKET_OR_COMMA_REGEX.finditer(line_to_parse):
+        c = m.group()
         if c in ("(", "{", "["):
             level += 1
         elif c in (")", "}", "]"):
@@ -89,18 +159,16 @@ def split_string_by_comma(line: str) -> list:
             if level < 0:
                 raise ValueError(
                     f"Level must be >= 0 but {level} (Line: {line})")
-        if level == 0 and c == ",":
-            splited.append(current)
-            current = ""
-        else:
-            current += c
+        elif level == 0:
+            splited.append(line_to_parse[start:m.start()])
+            start = m.end()
 
     if level != 0:
         raise ValueError(
             f"Level must be == 0 but {level} (Line: {line})")
 
-    if current != "":
-        splited.append(current)
+    if start < len(line_to_parse):
+        splited.append(line_to_parse[start:])
 
     splited = [s.strip() for s in splited]
 
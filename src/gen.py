@@ -9,20 +9,56 @@ import fake_bpy_module as fbm
 
 INPUT_DIR: str = "."
 MOD_FILES_DIR: str = os.path.dirname(os.path.abspath(__file__))
+OUTPUT_FORMATS: List[str] = ["pyi"]
+PROFILE_REPORT_FILE: str = None
 
 
 def generate(target_files: List[str], mod_files: List[str]):
-    documents = fbm.analyze(target_files)
-    documents = fbm.transform(documents, mod_files)
-    fbm.generate(documents)
+    manifest = None
+    if fbm.config.get_incremental():
+        manifest = fbm.manifest.GenerationManifest.load(
+            fbm.config.get_cache_dir(), fbm.config.get_output_dir(),
+            OUTPUT_FORMATS)
+
+    global_info = None
+    if fbm.config.get_modules() is not None:
+        # Only the files of the selected modules are analyzed. The names in
+        # the other files are collected from the prescanned documents.
+        prescanned_documents = fbm.prescan(target_files)
+        target_files = fbm.select_module_files(
+            target_files, prescanned_documents, fbm.config.get_modules())
+        global_info = fbm.build_global_info(prescanned_documents, mod_files)
+        del prescanned_documents
+
+    if fbm.config.get_streaming():
+        # Do not hold the documents here, so that each document is released
+        # after it is written.
+        fbm.generate_streaming(
+            fbm.transform_streaming(fbm.analyze(target_files), mod_files,
+                                    manifest, global_info),
+            OUTPUT_FORMATS)
+    else:
+        documents = fbm.analyze(target_files)
+        documents = fbm.transform(documents, mod_files, manifest, global_info)
+        fbm.generate(documents, OUTPUT_FORMATS)
+
+    if manifest is not None:
+        manifest.save()
+
+    if PROFILE_REPORT_FILE is not None:
+        fbm.profiler.write_report(PROFILE_REPORT_FILE)
 
 
 def parse_options():
     # pylint: disable=W0603
     global INPUT_DIR  # pylint: disable=W0602
+    global OUTPUT_FORMATS  # pylint: disable=W0602
+    global PROFILE_REPORT_FILE  # pylint: disable=W0602
     usage = f"Usage: python {__file__} [-i <input_dir>] [-o <output_dir>] " \
             "[-T <target>] [-t <target_version>] [-d] [-f <style_format>] " \
-            "[-m <mod_version>]"
+            "[-m <mod_version>] [-j <jobs>] [-c <cache_dir>] [--incremental] " \
+            "[-F <output_formats>] [--profile-report <report_file>] [--streaming] " \
+            "[--fast-parser] [--modules <modules>]"
     parser = argparse.ArgumentParser(usage)
     parser.add_argument(
         "-i", dest="input_dir", type=str, help="Input directory"
@@ -32,7 +68,7 @@ def parse_options():
     )
     parser.add_argument(
         "-f", dest="style_format", type=str,
-        help="Style format (none, yapf, ruff)"
+        help="Style format (none, yapf, ruff, ruff-batch)"
     )
     parser.add_argument(
         "-m", dest="mod_version", type=str,
@@ -51,6 +87,39 @@ def parse_options():
         "-l", dest="output_log_level", type=str,
         help="Output log level (debug, info, notice, warn, err"
     )
+    parser.add_argument(
+        "-j", "--jobs", dest="jobs", type=int,
+        help="Number of processes to run in parallel"
+    )
+    parser.add_argument(
+        "-c", "--cache-dir", dest="cache_dir", type=str,
+        help="Cache directory to reuse the analysis results of .rst and mod files between runs"
+    )
+    parser.add_argument(
+        "--incremental", dest="incremental", action="store_true",
+        help="Generate only the files whose inputs are changed from the "
+             "previous run (Requires -c option)"
+    )
+    parser.add_argument(
+        "-F", "--output-formats", dest="output_formats", type=str,
+        help="Comma separated output formats (py, pyi, json)"
+    )
+    parser.add_argument(
+        "--profile-report", dest="profile_report", type=str,
+        help="Output the time and memory spent in each stage to the JSON file"
+    )
+    parser.add_argument(
+        "--streaming", dest="streaming", action="store_true",
+        help="Transform and write the modules one by one to reduce the memory usage"
+    )
+    parser.add_argument(
+        "--fast-parser", dest="fast_parser", action="store_true",
+        help="Parse the documents by the parser specialized for sphinx_doc_gen.py"
+    )
+    parser.add_argument(
+        "--modules", dest="modules", type=str,
+        help="Comma separated modules to generate (ex. mathutils,bmesh.types)"
+    )
     args = parser.parse_args()
     if args.input_dir:
         INPUT_DIR = args.input_dir
@@ -64,6 +133,15 @@ def parse_options():
             f"Not supported style format {args.style_format}. "
             f"(Supported Style Format: {fbm.support.SUPPORTED_STYLE_FORMAT})")
 
+    if args.output_formats:
+        output_formats = [f.strip() for f in args.output_formats.split(",")]
+        for fmt in output_formats:
+            if fmt not in fbm.support.SUPPORTED_OUTPUT_FORMAT:
+                raise RuntimeError(
+                    f"Not supported output format {fmt}. "
+                    f"(Supported Output Format: {fbm.support.SUPPORTED_OUTPUT_FORMAT})")
+        OUTPUT_FORMATS = sorted(set(output_formats), key=output_formats.index)
+
     if args.target in fbm.support.SUPPORTED_TARGET:
         fbm.config.set_target(args.target)
     else:
@@ -106,6 +184,39 @@ def parse_options():
                     f"(Supported Version: "
                     f"{fbm.support.SUPPORTED_MOD_UPBGE_VERSION})")
 
+    if args.jobs is not None:
+        if args.jobs >= 1:
+            fbm.config.set_jobs(args.jobs)
+        else:
+            raise RuntimeError(
+                f"Number of jobs must be 1 or more. (Jobs: {args.jobs})")
+
+    if args.cache_dir:
+        fbm.config.set_cache_dir(args.cache_dir)
+
+    if args.incremental:
+        if fbm.config.get_cache_dir() is None:
+            raise RuntimeError(
+                "Incremental generation requires the cache directory. "
+                "(Specify -c option)")
+        fbm.config.set_incremental(True)
+
+    if args.profile_report:
+        PROFILE_REPORT_FILE = args.profile_report
+        fbm.config.set_profile(True)
+
+    if args.streaming:
+        fbm.config.set_streaming(True)
+
+    if args.fast_parser:
+        fbm.config.set_fast_parser(True)
+
+    if args.modules:
+        if args.incremental:
+            raise RuntimeError(
+                "Incremental generation can not be used with --modules option.")
+        fbm.config.set_modules(args.modules.split(","))
+
     if args.output_log_level:
         ARG_TO_LOG_LEVEL = {
             "debug": fbm.utils.LOG_LEVEL_DEBUG,
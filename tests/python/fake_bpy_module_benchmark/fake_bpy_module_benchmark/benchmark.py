@@ -0,0 +1,111 @@
+import json
+import os
+from typing import Dict, List
+
+# pylint: disable=E0401
+from fake_bpy_module.analyzer.analyzer import analyze
+from fake_bpy_module.transformer.transformer import transform
+from fake_bpy_module.generator.generator import generate
+from fake_bpy_module import config
+from fake_bpy_module import profiler
+# pylint: enable=E0401
+
+# Stages which finish faster than this are too noisy to compare.
+MIN_WALL_TIME = 0.05
+# Stages which allocate less than this (bytes) are too small to compare.
+MIN_MEMORY_PEAK = 1024 * 1024
+
+
+def _run_stages(rst_files: List[str], mod_files: List[str],
+                output_formats: List[str], trace_memory: bool) -> List[dict]:
+    profiler.reset()
+    profiler.set_memory_tracing(trace_memory)
+    try:
+        documents = analyze(rst_files)
+        documents = transform(documents, mod_files)
+        generate(documents, output_formats)
+        return [dict(r) for r in profiler.get_records()]
+    finally:
+        profiler.set_memory_tracing(True)
+        profiler.reset()
+
+
+def run_pipeline(rst_files: List[str], mod_files: List[str], output_dir: str,
+                 output_formats: List[str], style_format: str) -> List[dict]:
+    config.set_output_dir(output_dir)
+    config.set_style_format(style_format)
+    config.set_target("blender")
+    config.set_target_version("latest")
+    config.set_mod_version("latest")
+    config.set_profile(True)
+
+    # The time is measured without tracing the memory, because tracemalloc
+    # makes the stages several times slower.
+    try:
+        records = _run_stages(rst_files, mod_files, output_formats, False)
+        memory_records = _run_stages(rst_files, mod_files, output_formats, True)
+    finally:
+        config.set_profile(False)
+
+    for record, memory_record in zip(records, memory_records):
+        assert record["name"] == memory_record["name"]
+        record["memory_delta"] = memory_record["memory_delta"]
+        record["memory_peak"] = memory_record["memory_peak"]
+
+    return records
+
+
+def summarize(records: List[dict], num_classes: int) -> Dict[str, dict]:
+    # Key: <category>:<name> (ex. transformer:data_type_refiner)
+    result: Dict[str, dict] = {}
+    for record in records:
+        key = f"{record['category']}:{record['name']}"
+        wall_time = record["wall_time"]
+        result[key] = {
+            "wall_time": wall_time,
+            "cpu_time": record["cpu_time"],
+            # Number of classes processed per second.
+            "throughput": num_classes / wall_time if wall_time > 0.0 else None,
+            "memory_peak": record["memory_peak"],
+            "nodes_after": record["nodes_after"],
+        }
+    return result
+
+
+def compare_with_baseline(results: Dict[str, Dict[str, dict]],
+                          baseline: Dict[str, Dict[str, dict]],
+                          tolerance: float) -> List[str]:
+    regressions = []
+    for size, stages in results.items():
+        if size not in baseline:
+            continue
+        for key, actual in stages.items():
+            expect = baseline[size].get(key)
+            if expect is None:
+                continue
+
+            if (expect["wall_time"] >= MIN_WALL_TIME
+                    and actual["wall_time"] >= MIN_WALL_TIME
+                    and actual["throughput"] < expect["throughput"] * (1.0 - tolerance)):
+                regressions.append(
+                    f"[{size} classes] {key}: throughput "
+                    f"{expect['throughput']:.1f} -> {actual['throughput']:.1f} classes/s")
+            if (actual["memory_peak"] >= MIN_MEMORY_PEAK
+                    and actual["memory_peak"] > expect["memory_peak"] * (1.0 + tolerance)):
+                regressions.append(
+                    f"[{size} classes] {key}: peak memory "
+                    f"{expect['memory_peak']} -> {actual['memory_peak']} bytes")
+    return regressions
+
+
+def load_baseline(filename: str) -> Dict[str, Dict[str, dict]]:
+    if not os.path.isfile(filename):
+        return {}
+    with open(filename, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_results(filename: str, results: Dict[str, Dict[str, dict]]):
+    with open(filename, "w", encoding="utf-8", newline="\n") as f:
+        json.dump(results, f, indent=4, sort_keys=True)
+        f.write("\n")
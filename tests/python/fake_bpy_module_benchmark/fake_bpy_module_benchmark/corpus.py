@@ -0,0 +1,298 @@
+import os
+import random
+from typing import Dict, List, Tuple
+
+# Data types found in the bpy.types documents of Blender.
+# Key: Data type, Value: Weight to be chosen.
+# "{class}" is replaced with the name of the other class in the corpus.
+ATTRIBUTE_DATA_TYPES: Dict[str, int] = {
+    "boolean, default False": 10,
+    "boolean array of 3 items, default (False, False, False)": 2,
+    "int in [-inf, inf], default 0": 6,
+    "int in [0, 32767], default 1, (readonly)": 3,
+    "int array of 2 items in [-32768, 32767], default (0, 0)": 2,
+    "float in [-inf, inf], default 0.0": 8,
+    "float in [0, 1], default 1.0, (readonly)": 3,
+    "float array of 3 items in [-inf, inf], default (0.0, 0.0, 0.0)": 4,
+    "float multi-dimensional array of 4 * 4 items in [-inf, inf], default ((0.0, 0.0, 0.0, 0.0), (0.0, 0.0, 0.0, 0.0), (0.0, 0.0, 0.0, 0.0), (0.0, 0.0, 0.0, 0.0))": 1,  # noqa # pylint: disable=C0301
+    "string, default \"\", (never None)": 6,
+    "enum in ['NONE', 'ADD', 'SUBTRACT', 'MULTIPLY'], default 'NONE'": 6,
+    "enum set in {'SELECT', 'HIDE'}, default {'SELECT'}": 2,
+    ":class:`{class}`": 4,
+    ":class:`{class}`, (readonly)": 4,
+    ":class:`{class}`, (readonly, never None)": 2,
+    ":class:`bpy_prop_collection` of :class:`{class}`, (readonly)": 3,
+}
+
+ARGUMENT_DATA_TYPES: Dict[str, int] = {
+    "boolean, (optional)": 4,
+    "int in [0, inf], (optional)": 3,
+    "float in [-inf, inf], (optional)": 3,
+    "string, (never None)": 3,
+    "enum in ['DEFAULT', 'FAST', 'SLOW'], (optional)": 2,
+    ":class:`{class}`, (optional)": 3,
+}
+
+RETURN_DATA_TYPES: Dict[str, int] = {
+    "boolean": 3,
+    "int in [-inf, inf]": 2,
+    "float array of 3 items in [-inf, inf]": 2,
+    ":class:`{class}`": 3,
+}
+
+# Data types found in the module level functions and data of Blender.
+MODULE_DATA_TYPES: Dict[str, int] = {
+    "int": 3,
+    "float": 2,
+    "str": 3,
+    "bool": 2,
+    "list of str": 1,
+    "dict": 1,
+    "tuple of 3 floats": 1,
+    ":class:`bpy.types.{class}`": 2,
+}
+
+
+class CorpusConfig:
+    # pylint: disable=R0902
+    def __init__(self):
+        self.seed: int = 0
+
+        # Classes in bpy.types. One file is generated for each class.
+        self.num_classes: int = 100
+        # (min, max) of the number of attributes/methods in each class.
+        self.attributes_per_class: Tuple[int, int] = (10, 10)
+        self.methods_per_class: Tuple[int, int] = (3, 3)
+        # Ratio of the classes which have an example code (literalinclude).
+        self.example_ratio: float = 0.0
+
+        # Modules other than bpy.types. (ex. module_0, module_0.submodule_0)
+        self.num_modules: int = 0
+        self.submodules_per_module: int = 0
+        # (min, max) of the number of functions/data/classes in each module.
+        self.functions_per_module: Tuple[int, int] = (5, 5)
+        self.data_per_module: Tuple[int, int] = (3, 3)
+        self.classes_per_module: Tuple[int, int] = (1, 1)
+
+        # Ratio of the bpy.types classes which are extended by the mod file.
+        self.mod_append_ratio: float = 0.0
+        # Number of the classes which are added by the mod file.
+        self.num_mod_new_classes: int = 0
+
+        self.attribute_data_types: Dict[str, int] = dict(ATTRIBUTE_DATA_TYPES)
+        self.argument_data_types: Dict[str, int] = dict(ARGUMENT_DATA_TYPES)
+        self.return_data_types: Dict[str, int] = dict(RETURN_DATA_TYPES)
+        self.module_data_types: Dict[str, int] = dict(MODULE_DATA_TYPES)
+
+
+class _CorpusWriter:
+    def __init__(self, corpus_config: CorpusConfig):
+        self.config = corpus_config
+        self.rand = random.Random(corpus_config.seed)
+        self.class_names = [f"Class{i}" for i in range(corpus_config.num_classes)]
+        if not self.class_names:
+            self.class_names = ["bpy_struct"]
+
+    def _count(self, range_: Tuple[int, int]) -> int:
+        return self.rand.randint(range_[0], range_[1])
+
+    def _data_type(self, candidates: Dict[str, int]) -> str:
+        dtype = self.rand.choices(list(candidates.keys()), list(candidates.values()))[0]
+        return dtype.replace("{class}", self.rand.choice(self.class_names))
+
+    def _attribute(self, lines: List[str], directive: str, name: str,
+                   candidates: Dict[str, int], indent: str):
+        lines.append(f"{indent}.. {directive}:: {name}")
+        lines.append("")
+        lines.append(f"{indent}   {name} description")
+        lines.append("")
+        lines.append(f"{indent}   :type: {self._data_type(candidates)}")
+        lines.append("")
+
+    def _function(self, lines: List[str], directive: str, name: str, indent: str):
+        if directive == "function":
+            arg_candidates = self.config.module_data_types
+            return_candidates = self.config.module_data_types
+        else:
+            arg_candidates = self.config.argument_data_types
+            return_candidates = self.config.return_data_types
+        lines.append(f"{indent}.. {directive}:: {name}(arg_1, arg_2=0)")
+        lines.append("")
+        lines.append(f"{indent}   {name} description")
+        lines.append("")
+        lines.append(f"{indent}   :arg arg_1: arg_1 description")
+        lines.append(f"{indent}   :type arg_1: {self._data_type(arg_candidates)}")
+        lines.append(f"{indent}   :arg arg_2: arg_2 description")
+        lines.append(f"{indent}   :type arg_2: {self._data_type(arg_candidates)}")
+        lines.append(f"{indent}   :return: return description")
+        lines.append(f"{indent}   :rtype: {self._data_type(return_candidates)}")
+        lines.append("")
+
+    def _class_body(self, lines: List[str], class_name: str):
+        lines.append(f"   {class_name} description")
+        lines.append("")
+        for i in range(self._count(self.config.attributes_per_class)):
+            self._attribute(lines, "attribute", f"attr_{i}",
+                            self.config.attribute_data_types, "   ")
+        for i in range(self._count(self.config.methods_per_class)):
+            self._function(lines, "method", f"method_{i}", "   ")
+
+    @staticmethod
+    def _write(filename: str, lines: List[str]):
+        with open(filename, "w", encoding="utf-8", newline="\n") as f:
+            f.write("\n".join(lines))
+
+    def write_bpy_struct(self, filename: str):
+        lines = [
+            "bpy_struct",
+            "==========",
+            "",
+            ".. module:: bpy.types",
+            "",
+            ".. class:: bpy_struct",
+            "",
+            "   built-in base class for all classes in bpy.types.",
+            "",
+            "   .. method:: as_pointer()",
+            "",
+            "      Returns the memory address which holds a pointer to Blender's internal data",
+            "",
+            "      :return: int (memory address).",
+            "      :rtype: int",
+            "",
+            ".. class:: Struct",
+            "",
+            "   RNA structure definition",
+            "",
+        ]
+        self._write(filename, lines)
+
+    def write_bpy_types_class(self, filename: str, class_name: str, base_class: str):
+        lines = []
+        title = f"{class_name}({base_class})"
+        lines.append(title)
+        lines.append("=" * len(title))
+        lines.append("")
+        if base_class == "bpy_struct":
+            lines.append("base class --- :class:`bpy_struct`")
+        else:
+            lines.append(f"base classes --- :class:`bpy_struct`, :class:`{base_class}`")
+        lines.append("")
+        lines.append(".. module:: bpy.types")
+        lines.append("")
+        if self.rand.random() < self.config.example_ratio:
+            lines.append(f".. literalinclude:: ../examples/bpy.types.{class_name}.py")
+            lines.append("   :lines: 9-")
+            lines.append("")
+        lines.append(f".. class:: {class_name}({base_class})")
+        lines.append("")
+        self._class_body(lines, class_name)
+        lines.append("   .. classmethod:: bl_rna_get_subclass(id, default=None)")
+        lines.append("")
+        lines.append("      :arg id: The RNA type identifier.")
+        lines.append("      :type id: string")
+        lines.append("      :return: The RNA type or default when not found.")
+        lines.append("      :rtype: :class:`bpy.types.Struct` subclass")
+        lines.append("")
+        self._write(filename, lines)
+
+    def write_module(self, filename: str, module_name: str):
+        lines = []
+        lines.append(module_name)
+        lines.append("=" * len(module_name))
+        lines.append("")
+        lines.append(f".. module:: {module_name}")
+        lines.append("")
+        lines.append(f"{module_name} description")
+        lines.append("")
+        for i in range(self._count(self.config.data_per_module)):
+            self._attribute(lines, "data", f"DATA_{i}", self.config.module_data_types, "")
+        for i in range(self._count(self.config.functions_per_module)):
+            self._function(lines, "function", f"function_{i}", "")
+        for i in range(self._count(self.config.classes_per_module)):
+            class_name = f"{module_name.split('.')[-1].capitalize()}Class{i}"
+            lines.append(f".. class:: {class_name}")
+            lines.append("")
+            self._class_body(lines, class_name)
+        self._write(filename, lines)
+
+    def write_append_mod(self, filename: str, class_names: List[str]):
+        lines = [".. mod-type:: append", "", ".. module:: bpy.types", ""]
+        for class_name in class_names:
+            lines.append(f".. class:: {class_name}")
+            lines.append("")
+            lines.append("   .. method:: __len__()")
+            lines.append("")
+            lines.append("      :rtype: int")
+            lines.append("")
+            lines.append("   .. attribute:: mod_attr")
+            lines.append("")
+            lines.append(f"      :type: {self._data_type(self.config.attribute_data_types)}")
+            lines.append("")
+        self._write(filename, lines)
+
+    def write_new_mod(self, filename: str, num_classes: int):
+        lines = [".. mod-type:: new", "", ".. module:: bpy.types", ""]
+        for i in range(num_classes):
+            lines.append(f".. class:: ModClass{i}")
+            lines.append("")
+            lines.append(f"   .. base-class:: {self.rand.choice(self.class_names)}")
+            lines.append("")
+            lines.append("   .. method:: foreach_get(attr, seq)")
+            lines.append("")
+            lines.append("   .. method:: __getitem__(key)")
+            lines.append("")
+            lines.append("      :type key: int")
+            lines.append(f"      :rtype: {self._data_type(self.config.return_data_types)}")
+            lines.append("")
+        self._write(filename, lines)
+
+
+def generate_corpus(output_dir: str,
+                    corpus_config: CorpusConfig) -> Tuple[List[str], List[str]]:
+    # Same corpus is generated for the same config, so the results can be
+    # compared between runs.
+    # .rst files are output to <output_dir>/sphinx-in and mod files are output
+    # to <output_dir>/mods.
+    writer = _CorpusWriter(corpus_config)
+    rst_dir = f"{output_dir}/sphinx-in"
+    mod_dir = f"{output_dir}/mods"
+    os.makedirs(rst_dir, exist_ok=True)
+    rst_files = []
+    mod_files = []
+
+    filename = f"{rst_dir}/bpy.types.bpy_struct.rst"
+    writer.write_bpy_struct(filename)
+    rst_files.append(filename)
+
+    for i in range(corpus_config.num_classes):
+        # Class hierarchy like ID -> Object, ID -> Mesh.
+        class_name = writer.class_names[i]
+        base_class = writer.class_names[writer.rand.randrange(i)] if i >= 1 else "bpy_struct"
+        filename = f"{rst_dir}/bpy.types.{class_name}.rst"
+        writer.write_bpy_types_class(filename, class_name, base_class)
+        rst_files.append(filename)
+
+    for i in range(corpus_config.num_modules):
+        module_names = [f"module_{i}"]
+        module_names.extend(f"module_{i}.submodule_{j}"
+                            for j in range(corpus_config.submodules_per_module))
+        for module_name in module_names:
+            filename = f"{rst_dir}/{module_name}.rst"
+            writer.write_module(filename, module_name)
+            rst_files.append(filename)
+
+    num_append_classes = int(corpus_config.num_classes * corpus_config.mod_append_ratio)
+    if num_append_classes > 0 or corpus_config.num_mod_new_classes > 0:
+        os.makedirs(mod_dir, exist_ok=True)
+    if num_append_classes > 0:
+        filename = f"{mod_dir}/bpy.types.append.mod.rst"
+        writer.write_append_mod(
+            filename, sorted(writer.rand.sample(writer.class_names, num_append_classes)))
+        mod_files.append(filename)
+    if corpus_config.num_mod_new_classes > 0:
+        filename = f"{mod_dir}/bpy.types.new.mod.rst"
+        writer.write_new_mod(filename, corpus_config.num_mod_new_classes)
+        mod_files.append(filename)
+
+    return rst_files, mod_files
@@ -0,0 +1,90 @@
+import os
+import sys
+import argparse
+
+
+def parse_range(value: str) -> tuple:
+    # "<min>-<max>" or "<num>"
+    sp = [int(v) for v in value.split("-")]
+    if len(sp) == 1:
+        return (sp[0], sp[0])
+    return (sp[0], sp[1])
+
+
+def parse_options(corpus_config) -> str:
+    usage = f"Usage: python {__file__} -o <output_dir> [-s <seed>] " \
+            "[--classes <num>] [--attributes <min>-<max>] " \
+            "[--methods <min>-<max>] [--example-ratio <ratio>] " \
+            "[--modules <num>] [--submodules <num>] " \
+            "[--functions <min>-<max>] [--data <min>-<max>] " \
+            "[--module-classes <min>-<max>] [--mod-append-ratio <ratio>] " \
+            "[--mod-new-classes <num>] [--weight <data_type>=<weight>]"
+    parser = argparse.ArgumentParser(usage)
+    parser.add_argument(
+        "-o", dest="output_dir", type=str, required=True, help="Output directory")
+    parser.add_argument("-s", dest="seed", type=int, help="Random seed")
+    parser.add_argument(
+        "--classes", dest="num_classes", type=int, help="Number of classes in bpy.types")
+    parser.add_argument(
+        "--attributes", dest="attributes_per_class", type=parse_range,
+        help="Number of attributes in each class")
+    parser.add_argument(
+        "--methods", dest="methods_per_class", type=parse_range,
+        help="Number of methods in each class")
+    parser.add_argument(
+        "--example-ratio", dest="example_ratio", type=float,
+        help="Ratio of the classes which have an example code")
+    parser.add_argument(
+        "--modules", dest="num_modules", type=int,
+        help="Number of modules other than bpy.types")
+    parser.add_argument(
+        "--submodules", dest="submodules_per_module", type=int,
+        help="Number of submodules in each module")
+    parser.add_argument(
+        "--functions", dest="functions_per_module", type=parse_range,
+        help="Number of functions in each module")
+    parser.add_argument(
+        "--data", dest="data_per_module", type=parse_range,
+        help="Number of data in each module")
+    parser.add_argument(
+        "--module-classes", dest="classes_per_module", type=parse_range,
+        help="Number of classes in each module")
+    parser.add_argument(
+        "--mod-append-ratio", dest="mod_append_ratio", type=float,
+        help="Ratio of the classes which are extended by the mod file")
+    parser.add_argument(
+        "--mod-new-classes", dest="num_mod_new_classes", type=int,
+        help="Number of the classes which are added by the mod file")
+    parser.add_argument(
+        "--weight", dest="weights", type=str, action="append", default=[],
+        help="Weight of the attribute data type (ex. 'boolean, default False=20'). "
+             "The data type which is not in the list is added.")
+
+    args = parser.parse_args()
+    for key in ("seed", "num_classes", "attributes_per_class", "methods_per_class",
+                "example_ratio", "num_modules", "submodules_per_module",
+                "functions_per_module", "data_per_module", "classes_per_module",
+                "mod_append_ratio", "num_mod_new_classes"):
+        value = getattr(args, key)
+        if value is not None:
+            setattr(corpus_config, key, value)
+    for weight in args.weights:
+        dtype, value = weight.rsplit("=", 1)
+        corpus_config.attribute_data_types[dtype] = int(value)
+
+    return args.output_dir
+
+
+def main():
+    sys.path.append(os.path.dirname(__file__))
+    from fake_bpy_module_benchmark import corpus     # pylint: disable=C0415
+
+    corpus_config = corpus.CorpusConfig()
+    output_dir = parse_options(corpus_config)
+    rst_files, mod_files = corpus.generate_corpus(output_dir, corpus_config)
+    print(f"Generated {len(rst_files)} .rst files and {len(mod_files)} mod files "
+          f"to {output_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+import os
+import sys
+import argparse
+import shutil
+import tempfile
+
+
+class FakeBpyModuleBenchmarkConfig:
+    def __init__(self):
+        self.modules_path = ""
+        self.sizes = [100, 1000]
+        self.baseline_file = f"{os.path.dirname(os.path.abspath(__file__))}/baseline.json"
+        self.update_baseline = False
+        self.tolerance = 0.3
+        self.output_file = None
+        self.output_formats = ["pyi"]
+        self.style_format = "none"
+
+
+def parse_options(config: FakeBpyModuleBenchmarkConfig):
+    usage = f"Usage: python {__file__} [-p <modules_path>] [-s <sizes>] " \
+            "[-b <baseline_file>] [-u] [-t <tolerance>] [-o <output_file>] " \
+            "[-F <output_formats>] [-f <style_format>]"
+    parser = argparse.ArgumentParser(usage)
+    parser.add_argument(
+        "-p", dest="modules_path", type=str, help="fake-module path")
+    parser.add_argument(
+        "-s", dest="sizes", type=str,
+        help="Comma separated number of classes in the corpus (ex. 100,1000,10000)")
+    parser.add_argument(
+        "-b", dest="baseline_file", type=str, help="Baseline file")
+    parser.add_argument(
+        "-u", dest="update_baseline", action="store_true",
+        help="Update the baseline file with the results")
+    parser.add_argument(
+        "-t", dest="tolerance", type=float,
+        help="Allowed ratio of the regression from the baseline (Default: 0.3)")
+    parser.add_argument(
+        "-o", dest="output_file", type=str, help="Output the results to the file")
+    parser.add_argument(
+        "-F", dest="output_formats", type=str,
+        help="Comma separated output formats (Default: pyi)")
+    parser.add_argument(
+        "-f", dest="style_format", type=str, help="Style format (Default: none)")
+
+    args = parser.parse_args()
+    if args.modules_path:
+        config.modules_path = args.modules_path
+    if args.sizes:
+        config.sizes = [int(s) for s in args.sizes.split(",")]
+    if args.baseline_file:
+        config.baseline_file = args.baseline_file
+    if args.update_baseline:
+        config.update_baseline = True
+    if args.tolerance is not None:
+        config.tolerance = args.tolerance
+    if args.output_file:
+        config.output_file = args.output_file
+    if args.output_formats:
+        config.output_formats = args.output_formats.split(",")
+    if args.style_format:
+        config.style_format = args.style_format
+
+
+def main():
+    config = FakeBpyModuleBenchmarkConfig()
+    parse_options(config)
+
+    path = os.path.abspath(config.modules_path)
+    sys.path.append(path)
+
+    sys.path.append(os.path.dirname(__file__))
+    # pylint: disable=C0415
+    from fake_bpy_module_benchmark import benchmark, corpus
+    from fake_bpy_module import utils   # pylint: disable=E0401
+
+    # Warnings from the synthetic corpus are not interesting.
+    utils.LOG_LEVEL = utils.LOG_LEVEL_ERR
+
+    results = {}
+    work_dir = tempfile.mkdtemp(prefix="fake_bpy_module_benchmark_")
+    try:
+        for size in config.sizes:
+            print(f"========== Benchmark: {size} classes ==========")
+            corpus_config = corpus.CorpusConfig()
+            corpus_config.num_classes = size
+            rst_files, mod_files = corpus.generate_corpus(
+                f"{work_dir}/{size}/input", corpus_config)
+            records = benchmark.run_pipeline(
+                rst_files, mod_files, f"{work_dir}/{size}/output",
+                config.output_formats, config.style_format)
+            results[str(size)] = benchmark.summarize(records, size)
+            for key, r in results[str(size)].items():
+                print(f"{key:50} {r['wall_time']:9.3f} s "
+                      f"{r['memory_peak'] / 1024 / 1024:9.1f} MiB")
+    finally:
+        shutil.rmtree(work_dir)
+
+    if config.output_file:
+        benchmark.save_results(config.output_file, results)
+
+    if config.update_baseline:
+        baseline = benchmark.load_baseline(config.baseline_file)
+        baseline.update(results)
+        benchmark.save_results(config.baseline_file, baseline)
+        print(f"Baseline is updated: {config.baseline_file}")
+        sys.exit(0)
+
+    baseline = benchmark.load_baseline(config.baseline_file)
+    regressions = benchmark.compare_with_baseline(results, baseline, config.tolerance)
+    for r in regressions:
+        print(f"Regression: {r}")
+    sys.exit(len(regressions) != 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,24 @@
+import gc
 import os
+import shutil
+import weakref
+from unittest import mock
 import docutils
+import docutils.core
 
 from fake_bpy_module.analyzer.analyzer import BaseAnalyzer  # pylint: disable=E0401
+from fake_bpy_module.analyzer.directives import (  # pylint: disable=E0401
+    build_function_node_from_def,
+    build_function_node_from_signature,
+    parse_function_def,
+)
+from fake_bpy_module.analyzer.nodes import (  # pylint: disable=E0401
+    ArgumentListNode,
+    DescriptionNode,
+    UniqueElementNode,
+)
+from fake_bpy_module.analyzer.parsing_session import ParsingSession  # pylint: disable=E0401
+from fake_bpy_module.analyzer.readers import BpyRstDocsReader  # pylint: disable=E0401
 from fake_bpy_module import config  # pylint: disable=E0401
 
 from . import common
@@ -19,9 +36,16 @@ class BaseAnalyzerTest(common.FakeBpyModuleTestBase):
 
         self.__setup_config()
 
+    def tearDown(self):
+        super().tearDown()
+
+        config.set_jobs(1)
+        config.set_cache_dir(None)
+
     def __setup_config(self):
         config.set_target("blender")
         config.set_target_version("2.80")
+        config.set_jobs(1)
 
     def compare_with_file_contents(self, actual: str, expect_file: str):
         with open(expect_file, "r", encoding="utf-8") as f:
@@ -282,3 +306,224 @@ class BaseAnalyzerTest(common.FakeBpyModuleTestBase):
         self.assertEqual(len(documents), len(rst_files))
         for doc, expect in zip(documents, expect_files):
             self.compare_with_file_contents(doc.pformat(), expect)
+
+    def test_parallel(self):
+        rst_files = [
+            "single_constant.rst",
+            "multiple_functions.rst",
+            "multiple_classes.rst",
+            "bpy_290_tweak.rst",
+        ]
+        expect_files = [
+            "single_constant.xml",
+            "multiple_functions.xml",
+            "multiple_classes.xml",
+            "bpy_290_tweak.xml",
+        ]
+        rst_files = [f"{self.data_dir}/input/{f}" for f in rst_files]
+        expect_files = [f"{self.data_dir}/expect/{f}" for f in expect_files]
+
+        config.set_target_version("2.90")
+        config.set_jobs(2)
+        analyzer = BaseAnalyzer()
+        documents = analyzer.analyze(rst_files)
+
+        self.assertEqual(len(documents), len(rst_files))
+        for doc, expect in zip(documents, expect_files):
+            self.compare_with_file_contents(doc.pformat(), expect)
+
+    def test_deepcopy(self):
+        rst_files = [f"{self.data_dir}/input/multiple_classes.rst"]
+
+        analyzer = BaseAnalyzer()
+        documents = analyzer.analyze(rst_files)
+
+        for child in documents[0].children:
+            copied = child.deepcopy()
+            self.assertEqual(copied.pformat(), child.pformat())
+            self.assertIsNone(copied.parent)
+
+            originals = list(child.findall())
+            copies = list(copied.findall())
+            self.assertEqual(len(originals), len(copies))
+            for original, copy in zip(originals, copies):
+                self.assertIsNot(original, copy)
+                self.assertIs(type(original), type(copy))
+                if copy is not copied:
+                    self.assertIn(copy, copy.parent.children)
+                if isinstance(copy, UniqueElementNode):
+                    for element_type, element in copy.elements.items():
+                        self.assertIs(type(element), element_type)
+                        self.assertIs(element.parent, copy)
+                if isinstance(copy, docutils.nodes.Element):
+                    self.assertIsNot(original.attributes, copy.attributes)
+                    self.assertIsNot(original["ids"], copy["ids"])
+
+    def test_build_function_node_from_signature(self):
+        signatures = [
+            "function_1()",
+            "function_1(arg_1, *args, arg_2, **kwargs)",
+            "function_2(arg_1, *args, arg_2, **kwargs)",
+            "method_1(self, arg_1[, arg_2=(1, 2)][, arg_3={'A': [1, 2]}])",
+            "function_1(arg_1, arg_2=<class 'int'>, arg_3=3, arg_4)",
+            "function_1(*, async=False, arg_1=-1.5)",
+        ]
+
+        for signature in signatures:
+            expect = build_function_node_from_def(parse_function_def(signature))
+            actual = build_function_node_from_signature(signature)
+            self.assertEqual(actual.pformat(), expect.pformat())
+
+        # The functions which have same parameters don't share the nodes.
+        func_node_1 = build_function_node_from_signature("function_1(arg_1)")
+        func_node_2 = build_function_node_from_signature("function_2(arg_1)")
+        arg_node_1 = func_node_1.element(ArgumentListNode).children[0]
+        arg_node_2 = func_node_2.element(ArgumentListNode).children[0]
+        self.assertIsNot(arg_node_1, arg_node_2)
+        arg_node_1.element(DescriptionNode).add_text("description")
+        self.assertEqual(arg_node_2.element(DescriptionNode).astext(), "")
+
+        with self.assertRaises(SyntaxError):
+            build_function_node_from_signature("async(arg_1)")
+
+    def test_cache(self):
+        rst_files = ["single_constant.rst", "multiple_classes.rst"]
+        expect_files = ["single_constant.xml", "multiple_classes.xml"]
+        rst_files = [f"{self.data_dir}/input/{f}" for f in rst_files]
+        expect_files = [f"{self.data_dir}/expect/{f}" for f in expect_files]
+
+        cache_dir = "fake_bpy_module_test_tmp"
+        os.makedirs(cache_dir, exist_ok=False)
+        self.addCleanup(shutil.rmtree, cache_dir)
+        config.set_cache_dir(cache_dir)
+
+        analyzer = BaseAnalyzer()
+        documents = analyzer.analyze(rst_files)
+
+        self.assertEqual(len(documents), len(rst_files))
+        for doc, expect in zip(documents, expect_files):
+            self.compare_with_file_contents(doc.pformat(), expect)
+
+        # Cached documents must be used without parsing the files.
+        with mock.patch("fake_bpy_module.analyzer.parsing_session.ParsingSession.parse",
+                        side_effect=AssertionError("Cache is not used")):
+            analyzer = BaseAnalyzer()
+            documents = analyzer.analyze(rst_files)
+
+        self.assertEqual(len(documents), len(rst_files))
+        for doc, expect in zip(documents, expect_files):
+            self.compare_with_file_contents(doc.pformat(), expect)
+
+        # Cache must not be used when the target is changed.
+        config.set_target_version("2.90")
+        with mock.patch("fake_bpy_module.analyzer.parsing_session.ParsingSession.parse",
+                        side_effect=AssertionError("Cache is used")):
+            analyzer = BaseAnalyzer()
+            with self.assertRaises(AssertionError):
+                _ = analyzer.analyze(rst_files)
+
+        # Cache must not be used when the parser is changed.
+        config.set_target_version("2.80")
+        config.set_fast_parser(True)
+        self.addCleanup(config.set_fast_parser, False)
+        with mock.patch("fake_bpy_module.analyzer.parsing_session.ParsingSession.parse",
+                        side_effect=AssertionError("Cache is used")):
+            analyzer = BaseAnalyzer()
+            with self.assertRaises(AssertionError):
+                _ = analyzer.analyze(rst_files)
+
+
+class ParsingSessionTest(common.FakeBpyModuleTestBase):
+
+    name = "ParsingSessionTest"
+    module_name = __module__
+    data_dir = os.path.abspath(
+        f"{os.path.dirname(__file__)}/analyzer_test_data/base_analyzer_test")
+
+    def setUp(self):
+        super().setUp()
+
+        config.set_target("blender")
+        config.set_target_version("2.80")
+
+    def test_parse(self):
+        rst_files = [
+            "single_constant.rst",
+            "multiple_classes.rst",
+            "invalid_rst_format_1.rst",
+            "noisy_1.rst",
+        ]
+        rst_files = [f"{self.data_dir}/input/{f}" for f in rst_files]
+        settings_overrides = {
+            "exit_status_level": 2,
+            "halt_level": 2,
+            "line_length_limit": 20000,
+        }
+
+        # Register directives and roles.
+        _ = BaseAnalyzer()
+        session = ParsingSession(BpyRstDocsReader())
+
+        # The session can be used after the error is raised.
+        for file in rst_files:
+            with open(file, "r", encoding="utf-8") as f:
+                contents = f.read()
+            try:
+                expect = docutils.core.publish_doctree(
+                    contents, settings_overrides=settings_overrides,
+                    reader=BpyRstDocsReader())
+            except docutils.utils.SystemMessage:
+                with self.assertRaises(docutils.utils.SystemMessage):
+                    session.parse(contents)
+                continue
+            actual = session.parse(contents)
+            self.assertEqual(actual.pformat(), expect.pformat())
+
+    def test_parse_fast(self):
+        # The files which FastParser must parse without falling back.
+        fast_rst_files = [
+            "single_constant.rst",
+            "single_function.rst",
+            "single_class.rst",
+            "multiple_constants.rst",
+            "multiple_functions.rst",
+            "multiple_classes.rst",
+            "noisy_1.rst",
+        ]
+        rst_files = sorted(os.listdir(f"{self.data_dir}/input"))
+
+        # Register directives and roles.
+        _ = BaseAnalyzer()
+        session = ParsingSession(BpyRstDocsReader())
+        fast_session = ParsingSession(BpyRstDocsReader(), fast_parser=True)
+
+        for file in rst_files:
+            with open(f"{self.data_dir}/input/{file}", "r", encoding="utf-8") as f:
+                contents = f.read()
+            try:
+                expect = session.parse(contents)
+            except docutils.utils.SystemMessage:
+                self.assertIsNone(fast_session.parse_fast(contents))
+                with self.assertRaises(docutils.utils.SystemMessage):
+                    fast_session.parse(contents)
+                continue
+
+            actual = fast_session.parse_fast(contents)
+            if file in fast_rst_files:
+                self.assertIsNotNone(actual, file)
+            if actual is not None:
+                self.assertEqual(actual.pformat(), expect.pformat(), file)
+            actual = fast_session.parse(contents)
+            self.assertEqual(actual.pformat(), expect.pformat(), file)
+
+    def test_parse_release(self):
+        # Register directives and roles.
+        _ = BaseAnalyzer()
+        session = ParsingSession(BpyRstDocsReader())
+
+        # The class directive parses the contents by the nested state machine.
+        with open(f"{self.data_dir}/input/multiple_classes.rst", "r", encoding="utf-8") as f:
+            contents = f.read()
+        document = weakref.ref(session.parse(contents))
+        gc.collect()
+        self.assertIsNone(document())
@@ -581,6 +581,11 @@ class WriterTestBase(common.FakeBpyModuleTestBase):
             self.log(actual_contents)
             self.assertEqual(expect_contents, actual_contents)
 
+        # Writer must not modify the document since the same document may be
+        # written in the other output formats.
+        for doc, expect in zip(documents, expect_analyzed_files):
+            self.compare_with_file_contents(doc.pformat(), expect)
+
 
 class PyCodeWriterTest(WriterTestBase):
 
@@ -1,10 +1,27 @@
+import json
 import shutil
 import os
+import tracemalloc
+from types import SimpleNamespace
+from unittest import mock
 
-from fake_bpy_module.analyzer.analyzer import analyze   # pylint: disable=E0401
-from fake_bpy_module.transformer.transformer import transform   # pylint: disable=E0401
-from fake_bpy_module.generator.generator import generate    # pylint: disable=E0401
+from fake_bpy_module.analyzer.analyzer import (   # pylint: disable=E0401
+    analyze,
+    prescan,
+)
+from fake_bpy_module.transformer.transformer import (   # pylint: disable=E0401
+    build_global_info,
+    select_module_files,
+    transform,
+    transform_streaming,
+)
+from fake_bpy_module.generator.generator import (   # pylint: disable=E0401
+    generate,
+    generate_streaming,
+)
+from fake_bpy_module.manifest import GenerationManifest  # pylint: disable=E0401
 from fake_bpy_module import config  # pylint: disable=E0401
+from fake_bpy_module import profiler  # pylint: disable=E0401
 from . import common
 
 
@@ -28,6 +45,10 @@ class IntegrationTest(common.FakeBpyModuleTestBase):
         super().tearDown()
 
         shutil.rmtree(self.output_dir)
+        config.set_jobs(1)
+        config.set_profile(False)
+        config.set_modules(None)
+        profiler.reset()
 
     def __setup_config(self):
         config.set_output_dir(self.output_dir)
@@ -83,12 +104,11 @@ class IntegrationTest(common.FakeBpyModuleTestBase):
         ]
 
         ext_patterns = ["py", "pyi"]
-        for ext in ext_patterns:
-            config.set_output_format(ext)
-            documents = analyze(rst_files)
-            documents = transform(documents, [])
-            generate(documents)
+        documents = analyze(rst_files)
+        documents = transform(documents, [])
+        generate(documents, ext_patterns)
 
+        for ext in ext_patterns:
             expect_files_dir = f"{self.data_dir}/expect/multiple"
             actual_files_dir = self.output_dir
 
@@ -112,6 +132,171 @@ class IntegrationTest(common.FakeBpyModuleTestBase):
 
             self.assertFalse(self.__is_py_typed_exist(f"{self.output_dir}/py.typed"))
 
+    def test_multiple_parallel(self):
+        rst_files = [
+            f"{self.data_dir}/input/multiple/module_1.rst",
+            f"{self.data_dir}/input/multiple/module_1.submodule_1.rst",
+            f"{self.data_dir}/input/multiple/module_2.rst",
+        ]
+
+        config.set_jobs(2)
+        config.set_output_format("pyi")
+        documents = analyze(rst_files)
+        documents = transform(documents, [])
+        generate(documents)
+
+        expect_files_dir = f"{self.data_dir}/expect/multiple"
+        py_files = [
+            "module_1/__init__.pyi",
+            "module_1/submodule_1/__init__.pyi",
+            "module_2/__init__.pyi",
+        ]
+        for file_ in py_files:
+            with open(f"{expect_files_dir}/{file_}", "r", encoding="utf-8") as f:
+                expect_contents = f.read()
+            with open(f"{self.output_dir}/{file_}", "r", encoding="utf-8") as f:
+                actual_contents = f.read()
+            self.assertEqual(expect_contents, actual_contents)
+
+    def test_multiple_ruff_batch(self):
+        rst_files = [
+            f"{self.data_dir}/input/multiple/module_1.rst",
+            f"{self.data_dir}/input/multiple/module_1.submodule_1.rst",
+            f"{self.data_dir}/input/multiple/module_2.rst",
+        ]
+
+        config.set_style_format("ruff-batch")
+        ext_patterns = ["py", "pyi"]
+        documents = analyze(rst_files)
+        documents = transform(documents, [])
+        generate(documents, ext_patterns)
+
+        for ext in ext_patterns:
+            expect_files_dir = f"{self.data_dir}/expect/multiple"
+            py_files = [
+                f"module_1/__init__.{ext}",
+                f"module_1/submodule_1/__init__.{ext}",
+                f"module_2/__init__.{ext}",
+            ]
+            for file_ in py_files:
+                with open(f"{expect_files_dir}/{file_}", "r", encoding="utf-8") as f:
+                    expect_contents = f.read()
+                with open(f"{self.output_dir}/{file_}", "r", encoding="utf-8") as f:
+                    actual_contents = f.read()
+                self.assertEqual(expect_contents, actual_contents)
+
+    def test_multiple_streaming(self):
+        rst_files = [
+            f"{self.data_dir}/input/multiple/module_1.rst",
+            f"{self.data_dir}/input/multiple/module_1.submodule_1.rst",
+            f"{self.data_dir}/input/multiple/module_2.rst",
+        ]
+
+        ext_patterns = ["py", "pyi"]
+        documents = analyze(rst_files)
+        generate_streaming(transform_streaming(documents, []), ext_patterns)
+
+        # Documents are released after they are written.
+        self.assertEqual(len(documents), 0)
+
+        for ext in ext_patterns:
+            expect_files_dir = f"{self.data_dir}/expect/multiple"
+            py_files = [
+                f"module_1/__init__.{ext}",
+                f"module_1/submodule_1/__init__.{ext}",
+                f"module_2/__init__.{ext}",
+            ]
+            for file_ in py_files:
+                with open(f"{expect_files_dir}/{file_}", "r", encoding="utf-8") as f:
+                    expect_contents = f.read()
+                with open(f"{self.output_dir}/{file_}", "r", encoding="utf-8") as f:
+                    actual_contents = f.read()
+                self.assertEqual(expect_contents, actual_contents)
+
+    def test_multiple_modules(self):
+        rst_files = [
+            f"{self.data_dir}/input/multiple/module_1.rst",
+            f"{self.data_dir}/input/multiple/module_1.submodule_1.rst",
+            f"{self.data_dir}/input/multiple/module_2.rst",
+        ]
+        expect_files_dir = f"{self.data_dir}/expect/multiple"
+
+        # module_2 refers to the classes in module_1.
+        config.set_modules(["module_2"])
+        config.set_output_format("pyi")
+        prescanned_documents = prescan(rst_files)
+        selected_files = select_module_files(
+            rst_files, prescanned_documents, ["module_2"])
+        global_info = build_global_info(prescanned_documents, [])
+        documents = analyze(selected_files)
+        documents = transform(documents, [], global_info=global_info)
+        generate(documents)
+
+        with open(f"{expect_files_dir}/module_2/__init__.pyi", "r",
+                  encoding="utf-8") as f:
+            expect_contents = f.read()
+        with open(f"{self.output_dir}/module_2/__init__.pyi", "r",
+                  encoding="utf-8") as f:
+            actual_contents = f.read()
+        self.assertEqual(expect_contents, actual_contents)
+        self.assertFalse(
+            os.path.exists(f"{self.output_dir}/module_1/__init__.pyi"))
+
+        # The global information can not be built from the selected files.
+        with self.assertRaises(RuntimeError):
+            transform(analyze(selected_files), [])
+
+        # The submodules of the selected module are also generated.
+        shutil.rmtree(self.output_dir)
+        config.set_modules(["module_1"])
+        prescanned_documents = prescan(rst_files)
+        selected_files = select_module_files(
+            rst_files, prescanned_documents, ["module_1"])
+        global_info = build_global_info(prescanned_documents, [])
+        documents = analyze(selected_files)
+        documents = transform(documents, [], global_info=global_info)
+        generate(documents)
+
+        for file_ in ["module_1/__init__.pyi",
+                      "module_1/submodule_1/__init__.pyi"]:
+            with open(f"{expect_files_dir}/{file_}", "r", encoding="utf-8") as f:
+                expect_contents = f.read()
+            with open(f"{self.output_dir}/{file_}", "r", encoding="utf-8") as f:
+                actual_contents = f.read()
+            self.assertEqual(expect_contents, actual_contents)
+        self.assertFalse(
+            os.path.exists(f"{self.output_dir}/module_2/__init__.pyi"))
+
+    def test_global_info(self):
+        rst_files = [
+            f"{self.data_dir}/input/single/module_abc.rst",
+            f"{self.data_dir}/input/multiple/module_1.rst",
+            f"{self.data_dir}/input/multiple/module_1.submodule_1.rst",
+            f"{self.data_dir}/input/multiple/module_2.rst",
+        ]
+        mod_dir = os.path.abspath(
+            f"{os.path.dirname(__file__)}/transformer_test_data/mod_applier_test/input")
+        mod_files = [
+            f"{mod_dir}/append_class.mod.rst",
+            f"{mod_dir}/append_function.mod.rst",
+            f"{mod_dir}/new_class.mod.rst",
+            f"{mod_dir}/new_data.mod.rst",
+            f"{mod_dir}/new_function.mod.rst",
+        ]
+
+        # The global information built from the prescanned documents must be
+        # same as the one built from the fully analyzed documents.
+        expect_entry_points, expect_structure = build_global_info(
+            analyze(rst_files), mod_files)
+        actual_entry_points, actual_structure = build_global_info(
+            prescan(rst_files), mod_files)
+
+        self.assertGreater(len(expect_entry_points), 0)
+        self.assertEqual(
+            [(e.module, e.name, e.type) for e in actual_entry_points],
+            [(e.module, e.name, e.type) for e in expect_entry_points])
+        self.assertEqual(actual_structure.to_dict(), expect_structure.to_dict())
+
     def test_eceptional(self):
         rst_files = [
             f"{self.data_dir}/input/exceptional/module_exceptional.rst",
@@ -144,3 +329,102 @@ class IntegrationTest(common.FakeBpyModuleTestBase):
                 self.assertEqual(expect_contents, actual_contents)
 
             self.assertFalse(self.__is_py_typed_exist(f"{self.output_dir}/py.typed"))
+
+    def test_incremental(self):
+        input_dir = f"{self.output_dir}/input"
+        cache_dir = f"{self.output_dir}/cache"
+        shutil.copytree(f"{self.data_dir}/input/multiple", input_dir)
+        rst_files = [
+            f"{input_dir}/module_1.rst",
+            f"{input_dir}/module_1.submodule_1.rst",
+            f"{input_dir}/module_2.rst",
+        ]
+        config.set_output_format("pyi")
+
+        def generate_incrementally():
+            manifest = GenerationManifest.load(cache_dir, self.output_dir, ["pyi"])
+            documents = analyze(rst_files)
+            documents = transform(documents, [], manifest)
+            generate(documents)
+            manifest.save()
+            return documents
+
+        # All files are generated at the first time.
+        documents = generate_incrementally()
+        self.assertEqual(len(documents), 3)
+
+        expect_files_dir = f"{self.data_dir}/expect/multiple"
+        py_files = [
+            "module_1/__init__.pyi",
+            "module_1/submodule_1/__init__.pyi",
+            "module_2/__init__.pyi",
+        ]
+        for file_ in py_files:
+            with open(f"{expect_files_dir}/{file_}", "r", encoding="utf-8") as f:
+                expect_contents = f.read()
+            with open(f"{self.output_dir}/{file_}", "r", encoding="utf-8") as f:
+                actual_contents = f.read()
+            self.assertEqual(expect_contents, actual_contents)
+
+        # No files are generated when there is no change.
+        documents = generate_incrementally()
+        self.assertEqual(len(documents), 0)
+
+        # Only the file whose input is changed is generated.
+        with open(rst_files[2], "r", encoding="utf-8") as f:
+            contents = f.read()
+        with open(rst_files[2], "w", encoding="utf-8") as f:
+            f.write(contents.replace("function_1 description", "function_1 new description"))
+        documents = generate_incrementally()
+        self.assertEqual(len(documents), 1)
+        with open(f"{self.output_dir}/module_2/__init__.pyi", "r", encoding="utf-8") as f:
+            self.assertIn("function_1 new description", f.read())
+
+        # Removed output file is generated again.
+        os.remove(f"{self.output_dir}/module_1/__init__.pyi")
+        documents = generate_incrementally()
+        self.assertEqual(len(documents), 1)
+        self.assertTrue(os.path.isfile(f"{self.output_dir}/module_1/__init__.pyi"))
+
+    def test_profile(self):
+        rst_files = [
+            f"{self.data_dir}/input/multiple/module_1.rst",
+            f"{self.data_dir}/input/multiple/module_1.submodule_1.rst",
+            f"{self.data_dir}/input/multiple/module_2.rst",
+        ]
+
+        config.set_profile(True)
+        documents = analyze(rst_files)
+        documents = transform(documents, [])
+        generate(documents, ["py", "pyi"])
+
+        report_file = f"{self.output_dir}/profile.json"
+        profiler.write_report(report_file)
+        with open(report_file, "r", encoding="utf-8") as f:
+            report = json.load(f)
+
+        stages = {(s["category"], s["name"]): s for s in report["stages"]}
+        self.assertIn(("analyzer", "analyze"), stages)
+        self.assertIn(("transformer", "data_type_refiner"), stages)
+        self.assertIn(("generator", "py"), stages)
+        self.assertIn(("generator", "pyi"), stages)
+
+        analyze_stage = stages[("analyzer", "analyze")]
+        self.assertEqual(analyze_stage["documents_before"], 0)
+        self.assertEqual(analyze_stage["documents_after"], 3)
+        self.assertGreater(analyze_stage["nodes_after"], 0)
+        for stage in report["stages"]:
+            self.assertGreaterEqual(stage["wall_time"], 0.0)
+            self.assertGreaterEqual(stage["cpu_time"], 0.0)
+            self.assertIn("memory_peak", stage)
+
+        # tracemalloc.reset_peak() is not available on Python 3.8.
+        tracemalloc_38 = SimpleNamespace(
+            start=tracemalloc.start, stop=tracemalloc.stop,
+            is_tracing=tracemalloc.is_tracing,
+            get_traced_memory=tracemalloc.get_traced_memory)
+        profiler.reset()
+        with mock.patch("fake_bpy_module.profiler.tracemalloc", tracemalloc_38):
+            documents = analyze(rst_files)
+        self.assertEqual(len(profiler.get_records()), 1)
+        self.assertGreater(profiler.get_records()[0]["memory_peak"], 0)
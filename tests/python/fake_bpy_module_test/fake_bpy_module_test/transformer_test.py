@@ -1,18 +1,40 @@
 import os
+import shutil
 from typing import List
+from unittest import mock
 from docutils import nodes
 from docutils.core import publish_doctree
 
 # pylint: disable=E0401
 from fake_bpy_module.analyzer.analyzer import BaseAnalyzer
+from fake_bpy_module.analyzer.nodes import (
+    ClassNode,
+    DataNode,
+    DataTypeListNode,
+    FunctionListNode,
+    FunctionNode,
+    NameNode,
+    make_data_type_node,
+)
+from fake_bpy_module.analyzer.parsing_session import ParsingSession
+from fake_bpy_module.analyzer.roles import ClassRef
 from fake_bpy_module.transformer.transformer import Transformer
+from fake_bpy_module.transformer.document_index import (
+    get_document_index,
+    share_document_indexes,
+)
 from fake_bpy_module.transformer.utils import (
     ModuleStructure,
     build_module_structure,
     get_base_name,
     get_module_name,
 )
-from fake_bpy_module.transformer.data_type_refiner import EntryPoint
+from fake_bpy_module.transformer.data_type_refiner import (
+    EntryPoint,
+    build_full_names_by_relative_name,
+    get_first_token,
+)
+from fake_bpy_module.utils import append_child, replace_child
 from fake_bpy_module import config
 from . import common
 
@@ -655,6 +677,27 @@ class DataTypeRefinerTest(TransformerTestBase):
         for trans, expect in zip(transformed, expect_transformed_files):
             self.compare_with_file_contents(trans.pformat(), expect)
 
+    def test_build_full_names_by_relative_name(self):
+        entry_points = [
+            EntryPoint("module_b", "ClassA", "class"),
+            EntryPoint("module_a", "ClassA", "class"),
+            EntryPoint("module_a.submodule_1", "ClassB", "class"),
+        ]
+        full_names = build_full_names_by_relative_name(entry_points)
+
+        self.assertEqual(full_names["ClassA"], "module_a.ClassA")
+        self.assertEqual(full_names["ClassB"], "module_a.submodule_1.ClassB")
+        self.assertEqual(full_names["submodule_1.ClassB"], "module_a.submodule_1.ClassB")
+        self.assertNotIn("ClassC", full_names)
+
+    def test_get_first_token(self):
+        self.assertEqual(get_first_token("float in [-inf, inf], default 0.0"), "float")
+        self.assertEqual(get_first_token("List of `FEdge` objects"), "list")
+        self.assertEqual(get_first_token("int."), "int")
+        self.assertEqual(get_first_token("`mathutils.Vector`"), "`")
+        self.assertEqual(get_first_token("4x4 mathutils.Matrix"), "4")
+        self.assertEqual(get_first_token(""), "")
+
 
 class DefaultValueFillerTest(TransformerTestBase):
 
@@ -937,6 +980,28 @@ class ModApplierTest(TransformerTestBase):
         for doc, expect_file in zip(transformed, expect_files):
             self.compare_with_file_contents(doc.pformat(), expect_file)
 
+    def test_append_new_class(self):
+        rst_files = ["base.rst"]
+        mod_files = ["new_class.mod.rst", "append_new_class.mod.rst"]
+        rst_files = [f"{self.data_dir}/input/{f}" for f in rst_files]
+        mod_files = [f"{self.data_dir}/input/{f}" for f in mod_files]
+
+        analyzer = BaseAnalyzer()
+        documents = analyzer.analyze(rst_files)
+
+        # Class added by the former mod file can be appended by the latter one.
+        transformer = Transformer(["mod_applier"], {"mod_applier": {"mod_files": mod_files}})
+        transformed = transformer.transform(documents)
+
+        self.assertEqual(len(transformed), len(rst_files))
+        class_nodes = [n for n in transformed[0].findall(ClassNode)
+                       if n.element(NameNode).astext() == "ClassB"]
+        self.assertEqual(len(class_nodes), 1)
+        func_names = [n.element(NameNode).astext()
+                      for n in class_nodes[0].element(FunctionListNode).findall(FunctionNode)]
+        self.assertEqual(func_names,
+                         ["method_1", "classmethod_1", "staticmethod_1", "method_2"])
+
     def test_mod_option(self):
         mod_files = ["mod_option.mod.rst"]
         expect_mod_files = ["mod_option.mod.xml"]
@@ -952,6 +1017,78 @@ class ModApplierTest(TransformerTestBase):
         for mod_doc, expect_file in zip(mod_documents, expect_mod_files):
             self.compare_with_file_contents(mod_doc.pformat(), expect_file)
 
+    def test_no_mod_documents(self):
+        rst_files = ["base.rst"]
+        mod_files = ["new_class.mod.rst"]
+        expect_files = ["new_class.xml"]
+        rst_files = [f"{self.data_dir}/input/{f}" for f in rst_files]
+        mod_files = [f"{self.data_dir}/input/{f}" for f in mod_files]
+        expect_files = [f"{self.data_dir}/expect/{f}" for f in expect_files]
+
+        analyzer = BaseAnalyzer()
+        documents = analyzer.analyze(rst_files)
+
+        transformer = Transformer(["mod_applier"], {
+            "mod_applier": {"mod_files": mod_files, "keep_mod_documents": False}})
+        transformed = transformer.transform(documents)
+        self.assertEqual(len(transformer.get_transformers()[0].get_mod_documents()), 0)
+
+        self.assertEqual(len(transformed), len(rst_files))
+        for doc, expect_file in zip(transformed, expect_files):
+            self.compare_with_file_contents(doc.pformat(), expect_file)
+
+    def test_cache(self):
+        rst_files = ["base.rst"]
+        mod_files = ["new_class.mod.rst", "append_class.mod.rst"]
+        expect_mod_files = ["new_class.mod.xml", "append_class.mod.xml"]
+        rst_files = [f"{self.data_dir}/input/{f}" for f in rst_files]
+        mod_files = [f"{self.data_dir}/input/{f}" for f in mod_files]
+        expect_mod_files = [f"{self.data_dir}/expect/{f}" for f in expect_mod_files]
+
+        cache_dir = "fake_bpy_module_test_tmp"
+        os.makedirs(cache_dir, exist_ok=False)
+        self.addCleanup(shutil.rmtree, cache_dir)
+        self.addCleanup(config.set_cache_dir, None)
+        config.set_cache_dir(cache_dir)
+
+        analyzer = BaseAnalyzer()
+        transformer = Transformer(["mod_applier"], {"mod_applier": {"mod_files": mod_files}})
+        expect_transformed = transformer.transform(analyzer.analyze(rst_files))
+
+        # Cached mod documents must be used without parsing the mod files.
+        with mock.patch("fake_bpy_module.analyzer.parsing_session.ParsingSession.parse",
+                        side_effect=AssertionError("Cache is not used")):
+            transformer = Transformer(
+                ["mod_applier"], {"mod_applier": {"mod_files": mod_files}})
+            transformed = transformer.transform(analyzer.analyze(rst_files))
+        mod_documents = transformer.get_transformers()[0].get_mod_documents()
+
+        self.assertEqual(len(mod_documents), len(expect_mod_files))
+        for mod_doc, expect_file in zip(mod_documents, expect_mod_files):
+            self.compare_with_file_contents(mod_doc.pformat(), expect_file)
+
+        self.assertEqual(len(transformed), len(expect_transformed))
+        for doc, expect_doc in zip(transformed, expect_transformed):
+            self.assertEqual(doc.pformat(), expect_doc.pformat())
+
+        # Mod documents cached for the other target version must not be used.
+        config.set_target_version("2.90")
+        parse = ParsingSession.parse
+        parsed_contents = []
+
+        def parse_and_record(session, contents):
+            parsed_contents.append(contents)
+            return parse(session, contents)
+
+        with mock.patch.object(ParsingSession, "parse", autospec=True,
+                               side_effect=parse_and_record):
+            transformer = Transformer(
+                ["mod_applier"], {"mod_applier": {"mod_files": mod_files}})
+            transformer.transform(analyzer.analyze(rst_files))
+        for file in mod_files:
+            with open(file, "r", encoding="utf-8") as f:
+                self.assertIn(f.read(), parsed_contents)
+
 
 class SameModuleMergerTest(TransformerTestBase):
 
@@ -1148,6 +1285,74 @@ class ModuleStructureTest(common.FakeBpyModuleTestBase):
         self.assertDictEqual(root.to_dict(), expect_dict)
 
 
+class DocumentIndexTest(TransformerTestBase):
+
+    name = "DocumentIndexTest"
+    module_name = __module__
+    data_dir = os.path.abspath(
+        f"{os.path.dirname(__file__)}/transformer_test_data/dependency_builder_test")
+
+    def _assert_index(self, document: nodes.document):
+        index = get_document_index(document)
+        self.assertEqual(index.find(FunctionNode), list(document.findall(FunctionNode)))
+        for child in document.children:
+            self.assertEqual(index.find(ClassRef, child), list(child.findall(ClassRef)))
+
+    def _find_entry(self, document: nodes.document, node_type: type, name: str):
+        for child in document.children:
+            if isinstance(child, node_type) and child.element(NameNode).astext() == name:
+                return child
+        return None
+
+    def test_find(self):
+        rst_files = [f"{self.data_dir}/input/basic.rst"]
+        analyzer = BaseAnalyzer()
+        documents = analyzer.analyze(rst_files)
+        document = documents[0]
+
+        index = get_document_index(document)
+        class_node = self._find_entry(document, ClassNode, "ClassA")
+        self.assertEqual(class_node.element(NameNode).astext(), "ClassA")
+        self.assertEqual([r.to_string() for r in index.find(ClassRef, class_node)], [
+            "module_1.submodule_2.RefinedClassD",
+            "module_2.RefinedClassE",
+            "module_2.submodule_3.RefinedClassF",
+            "module_2.submodule_3.RefinedClassG",
+        ])
+        self._assert_index(document)
+
+    def test_update(self):
+        rst_files = [f"{self.data_dir}/input/basic.rst"]
+        analyzer = BaseAnalyzer()
+        documents = analyzer.analyze(rst_files)
+        document = documents[0]
+
+        with share_document_indexes(documents):
+            index = get_document_index(document)
+            self.assertIs(get_document_index(document), index)
+            self._assert_index(document)
+
+            data_node = self._find_entry(document, DataNode, "data_1")
+            class_ref = index.find(ClassRef, data_node)[0]
+            replace_child(class_ref, ClassRef(text="module_2.RefinedClassH"))
+            self._assert_index(document)
+
+            dtype_list_node = data_node.element(DataTypeListNode)
+            dtype_node = make_data_type_node("`module_2.RefinedClassI`")
+            dtype_list_node.append_child(dtype_node)
+            self._assert_index(document)
+            dtype_list_node.remove(dtype_node)
+            self._assert_index(document)
+
+            class_node = ClassNode.create_template()
+            class_node.element(NameNode).add_text("ClassB")
+            append_child(document, class_node)
+            self._assert_index(document)
+
+        # The index is not shared outside of share_document_indexes().
+        self.assertIsNot(get_document_index(document), index)
+
+
 class UtilsTest(TransformerTestBase):
 
     name = "UtilsTest"
@@ -1217,3 +1422,28 @@ class UtilsTest(TransformerTestBase):
             "module_1.submodule_1")
         self.assertIsNone(get_module_name("module_1.submodule_2.ClassA", package))
         self.assertEqual(get_module_name("module_1.ClassB", package), "module_1")
+
+        # Result must be updated after the structure is changed.
+        submodule_2 = ModuleStructure()
+        submodule_2.name = "submodule_2"
+        module.add_child(submodule_2)
+        self.assertEqual(
+            get_module_name("module_1.submodule_2.ClassA", package),
+            "module_1.submodule_2")
+
+    def test_resolution_cache(self):
+        package = ModuleStructure()
+        module = ModuleStructure()
+        module.name = "module_1"
+        package.add_child(module)
+
+        cache = package.resolution_cache("generation_data_type")
+        self.assertIs(package.resolution_cache("generation_data_type"), cache)
+        self.assertIsNot(package.resolution_cache("import_module_path"), cache)
+        cache[("module_1.ClassA", "module_1")] = "ClassA"
+
+        # Cache must be cleared after the structure is changed.
+        submodule = ModuleStructure()
+        submodule.name = "submodule_1"
+        module.add_child(submodule)
+        self.assertEqual(package.resolution_cache("generation_data_type"), {})
@@ -19,6 +19,7 @@ from fake_bpy_module.utils import (     # pylint: disable=E0401
     find_children,
     get_first_child,
     append_child,
+    new_document,
     split_string_by_comma,
 )
 from . import common
@@ -116,6 +117,17 @@ class UtilsTest(common.FakeBpyModuleTestBase):
             <data-type-list>
 """)
 
+    def test_new_document(self):
+        document_1 = new_document()
+        document_2 = new_document()
+
+        self.assertIsNot(document_1, document_2)
+        self.assertEqual(document_1.pformat(), publish_doctree("").pformat())
+
+        append_child(document_1, FunctionNode.create_template())
+        self.assertEqual(len(document_1.children), 1)
+        self.assertEqual(len(document_2.children), 0)
+
     def test_split_string_by_comma(self):
         sp = split_string_by_comma("a, b")
         self.assertListEqual(sp, ["a", "b"])
@@ -32,6 +32,7 @@ def main():
 
     test_cases = [
         fake_bpy_module_test.analyzer_test.BaseAnalyzerTest,
+        fake_bpy_module_test.analyzer_test.ParsingSessionTest,
 
         fake_bpy_module_test.generator_test.CodeWriterIndentTest,
         fake_bpy_module_test.generator_test.CodeWriterTest,
@@ -59,6 +60,7 @@ def main():
         fake_bpy_module_test.transformer_test.TargetFileCombinerTest,
         fake_bpy_module_test.transformer_test.FirstTitleRemoverTest,
         fake_bpy_module_test.transformer_test.FormatValidatorTest,
+        fake_bpy_module_test.transformer_test.DocumentIndexTest,
         fake_bpy_module_test.transformer_test.UtilsTest,
 
         fake_bpy_module_test.integration_test.IntegrationTest,